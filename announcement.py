@@ -16,10 +16,16 @@ class Announcement(Base):
     
     # Add indexes for common queries
     __table_args__ = (
-        Index('ix_announcements_classroom_id', 'classroom_id'),
+        # Serves the class stream: filter on classroom, newest first
+        Index('ix_announcements_classroom_timestamp', classroom_id, timestamp.desc(), id.desc()),
         Index('ix_announcements_timestamp', 'timestamp'),
         Index('ix_announcements_author_id', 'author_id'),
         CheckConstraint('length(content) <= 2000', name='ck_announcements_content_len'),
     )
 
-    author = relationship("User", back_populates="announcements_made")
\ No newline at end of file
+    author = relationship("User", back_populates="announcements_made")
+
+    @property
+    def author_email(self):
+        """What the stream shows as the byline; AnnouncementPosted events carry the same field."""
+        return self.author.email
\ No newline at end of file
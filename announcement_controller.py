@@ -1,33 +1,69 @@
+from datetime import datetime, timezone
+
 from PySide6.QtCore import QObject, Signal, Slot
-from sqlalchemy.orm import joinedload
+from sqlalchemy import or_, select
+from sqlalchemy.orm import aliased, joinedload
 
-from base import SessionLocal
+from base import db_executor
 from announcement import Announcement
+from events import AnnouncementPosted, stage_event
 from user import User
 
+# Announcements loaded per request; the stream asks for more as it is scrolled.
+ANNOUNCEMENT_PAGE_SIZE = 20
+
+
+def announcement_page(db, classroom_id: int, before_id=None, limit: int = ANNOUNCEMENT_PAGE_SIZE):
+    """Returns (page, has_more) for a class stream, newest first.
+
+    Pages are keyed on (timestamp, id): ``before_id`` is the oldest
+    announcement already shown, and the next page starts strictly after it in
+    that order. The cursor's timestamp is read back from the row itself so the
+    comparison always uses the stored value.
+    """
+    query = (
+        db.query(Announcement)
+        .options(joinedload(Announcement.author))
+        .filter(Announcement.classroom_id == classroom_id)
+    )
+    if before_id is not None:
+        cursor = aliased(Announcement)
+        cursor_timestamp = select(cursor.timestamp).where(cursor.id == before_id).scalar_subquery()
+        query = query.filter(
+            Announcement.timestamp <= cursor_timestamp,
+            or_(Announcement.timestamp < cursor_timestamp, Announcement.id < before_id),
+        )
+    rows = (
+        query.order_by(Announcement.timestamp.desc(), Announcement.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    return rows[:limit], len(rows) > limit
+
 
 class AnnouncementController(QObject):
     """Handles business logic for announcements."""
 
-    announcements_fetched = Signal(list)
+    announcements_fetched = Signal(list, bool)  # first page, has_more
+    more_announcements_fetched = Signal(int, list, bool)  # classroom_id, older page, has_more
     announcement_created = Signal(Announcement)
     announcement_creation_failed = Signal(str)
 
     @Slot(int)
     def get_announcements_for_class(self, classroom_id: int):
-        """Fetches all announcements for a given class, ordered by time."""
-        db = SessionLocal()
-        try:
-            announcements = (
-                db.query(Announcement)
-                .options(joinedload(Announcement.author))
-                .filter(Announcement.classroom_id == classroom_id)
-                .order_by(Announcement.timestamp.desc())
-                .all()
-            )
-            self.announcements_fetched.emit(announcements)
-        finally:
-            db.close()
+        """Fetches the newest page of announcements for a given class."""
+        def work(db):
+            return announcement_page(db, classroom_id)
+
+        db_executor.submit(work, lambda result: self.announcements_fetched.emit(*result))
+
+    @Slot(int, int)
+    def get_more_announcements(self, classroom_id: int, before_id: int):
+        """Fetches the page of announcements that follows ``before_id``."""
+        def work(db):
+            return announcement_page(db, classroom_id, before_id)
+
+        db_executor.submit(work, lambda result: self.more_announcements_fetched.emit(classroom_id, *result))
 
     @Slot(str, int, User)
     def create_announcement(self, content: str, classroom_id: int, author: User):
@@ -36,12 +72,19 @@ class AnnouncementController(QObject):
             self.announcement_creation_failed.emit("Announcement cannot be empty.")
             return
 
-        db = SessionLocal()
-        try:
-            new_announcement = Announcement(content=content, classroom_id=classroom_id, author_id=author.id)
+        author_id, author_email = author.id, author.email
+
+        def work(db):
+            # Stamped here rather than by the server default so the event can carry it
+            posted_at = datetime.now(timezone.utc)
+            new_announcement = Announcement(
+                content=content, classroom_id=classroom_id, author_id=author_id, timestamp=posted_at)
             db.add(new_announcement)
+            db.flush()
+            stage_event(db, AnnouncementPosted(new_announcement.id, classroom_id, content, posted_at, author_email))
             db.commit()
+            db.refresh(new_announcement)
             db.refresh(new_announcement, ["author"]) # Eagerly load author
-            self.announcement_created.emit(new_announcement)
-        finally:
-            db.close()
\ No newline at end of file
+            return new_announcement
+
+        db_executor.submit(work, self.announcement_created.emit)
@@ -16,7 +16,8 @@ class Assignment(Base):
     
     # Add constraints and indexes
     __table_args__ = (
-        Index('ix_assignments_classroom_id', 'classroom_id'),
+        # Serves per-class classwork ordered by due date
+        Index('ix_assignments_classroom_due_date', 'classroom_id', 'due_date', 'id'),
         Index('ix_assignments_due_date', 'due_date'),
         CheckConstraint('points >= 0', name='ck_assignments_points_positive'),
         CheckConstraint('points <= 10000', name='ck_assignments_points_max'),
@@ -1,16 +1,81 @@
 from PySide6.QtCore import QObject, Signal, Slot
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import joinedload
 
-from base import SessionLocal
+from base import db_executor
 from assignment import Assignment
+from classroom import student_classroom_association
+from events import AssignmentCreated, stage_event
 from user import User
 
+# Assignments loaded per "Show earlier" page of the global assignments view.
+EARLIER_ASSIGNMENTS_PAGE_SIZE = 25
+# Assignments in the upcoming window of that view, and per "Show later" page.
+UPCOMING_ASSIGNMENTS_PAGE_SIZE = 25
+
+
+def _assignments_for_student(db, student_id: int, due_after=None, due_before=None, limit=None, newest_first=False,
+                             before_id=None, after_id=None):
+    """Assignments from every class the student has joined, in one joined query.
+
+    ``due_after`` is inclusive and keeps undated assignments, which never fall
+    due; ``due_before`` is exclusive and skips them. With ``before_id`` the
+    assignments due exactly at ``due_before`` with a lower id are kept too, so
+    (``due_before``, ``before_id``) is a keyset cursor for ``newest_first`` pages.
+    Likewise (``due_after``, ``after_id``) is an exclusive cursor for soonest
+    first pages, where undated assignments sort last; ``due_after`` None with
+    ``after_id`` continues through the undated ones.
+    """
+    membership = student_classroom_association
+    query = (
+        db.query(Assignment)
+        .join(membership, membership.c.classroom_id == Assignment.classroom_id)
+        .filter(membership.c.user_id == student_id)
+        .options(joinedload(Assignment.classroom))
+    )
+    if after_id is not None and due_after is None:
+        query = query.filter(Assignment.due_date.is_(None), Assignment.id > after_id)
+    elif after_id is not None:
+        query = query.filter(or_(
+            Assignment.due_date > due_after,
+            and_(Assignment.due_date == due_after, Assignment.id > after_id),
+            Assignment.due_date.is_(None),
+        ))
+    elif due_after is not None:
+        query = query.filter(or_(Assignment.due_date >= due_after, Assignment.due_date.is_(None)))
+    if due_before is not None and before_id is not None:
+        query = query.filter(or_(
+            Assignment.due_date < due_before,
+            and_(Assignment.due_date == due_before, Assignment.id < before_id),
+        ))
+    elif due_before is not None:
+        query = query.filter(Assignment.due_date < due_before)
+    if newest_first:
+        query = query.order_by(Assignment.due_date.desc().nulls_last(), Assignment.id.desc())
+    else:
+        query = query.order_by(Assignment.due_date.asc().nulls_last(), Assignment.id.asc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def class_assignments(db, classroom_id: int) -> list:
+    """Every assignment of a class, latest due date first and undated ones last."""
+    return (
+        db.query(Assignment)
+        .filter(Assignment.classroom_id == classroom_id)
+        .order_by(Assignment.due_date.desc().nulls_last(), Assignment.id.desc())
+        .all()
+    )
+
 
 class AssignmentController(QObject):
     """Handles business logic for assignments."""
 
     class_assignments_fetched = Signal(list)
     global_assignments_fetched = Signal(list)
+    earlier_assignments_fetched = Signal(list, bool)  # due newest first, has_more
+    later_assignments_fetched = Signal(list, bool)  # due soonest first, has_more
     assignment_created = Signal(Assignment)
     assignment_fetched = Signal(Assignment)
     assignment_creation_failed = Signal(str)
@@ -18,37 +83,68 @@ class AssignmentController(QObject):
     @Slot(int)
     def get_assignments_for_class(self, classroom_id: int):
         """Fetches all assignments for a given class."""
-        db = SessionLocal()
-        try:
-            assignments = (
-                db.query(Assignment)
-                .filter(Assignment.classroom_id == classroom_id)
-                .order_by(Assignment.due_date.desc().nulls_last(), Assignment.id.desc())
-                .all()
-            )
-            self.class_assignments_fetched.emit(assignments)
-        finally:
-            db.close()
+        def work(db):
+            return class_assignments(db, classroom_id)
+
+        db_executor.submit(work, self.class_assignments_fetched.emit)
 
     @Slot(User)
-    def get_all_assignments_for_user(self, user: User):
-        """Fetches all assignments for a student across all their classes."""
+    def get_all_assignments_for_user(self, user: User, due_after=None, due_before=None, limit=None):
+        """Fetches a student's assignments across all their classes, soonest due first.
+
+        Optionally restricted to the ``due_after``/``due_before`` window and
+        capped at ``limit`` rows.
+        """
         if user.role.value != 'student':
             self.global_assignments_fetched.emit([]) # Only students have this view
             return
 
-        db = SessionLocal()
-        try:
-            # Get all class IDs the student is in
-            user_in_session = db.merge(user)
-            class_ids = [c.id for c in user_in_session.classes_joined]
+        student_id = user.id
+
+        def work(db):
+            return _assignments_for_student(db, student_id, due_after, due_before, limit)
+
+        db_executor.submit(work, self.global_assignments_fetched.emit)
+
+    @Slot(User, object, object)
+    def get_earlier_assignments_for_user(self, user: User, due_before, before_id=None,
+                                         limit: int = EARLIER_ASSIGNMENTS_PAGE_SIZE):
+        """Fetches the page of a student's assignments that sorts just before the cursor.
+
+        The cursor is the window start (``before_id`` None) for the first page,
+        then the due date and id of the last assignment of the previous page.
+        """
+        if user.role.value != 'student':
+            self.earlier_assignments_fetched.emit([], False)
+            return
+
+        student_id = user.id
+
+        def work(db):
+            rows = _assignments_for_student(db, student_id, due_before=due_before, before_id=before_id,
+                                            limit=limit + 1, newest_first=True)
+            return rows[:limit], len(rows) > limit
 
-            assignments = db.query(Assignment).options(joinedload(Assignment.classroom)).filter(
-                Assignment.classroom_id.in_(class_ids)
-            ).order_by(Assignment.due_date.asc().nulls_last()).all()
-            self.global_assignments_fetched.emit(assignments)
-        finally:
-            db.close()
+        db_executor.submit(work, lambda result: self.earlier_assignments_fetched.emit(*result))
+
+    @Slot(User, object, object)
+    def get_later_assignments_for_user(self, user: User, due_after, after_id,
+                                       limit: int = UPCOMING_ASSIGNMENTS_PAGE_SIZE):
+        """Fetches the page of a student's assignments that sorts just after the cursor.
+
+        The cursor is the due date and id of the last assignment shown.
+        """
+        if user.role.value != 'student':
+            self.later_assignments_fetched.emit([], False)
+            return
+
+        student_id = user.id
+
+        def work(db):
+            rows = _assignments_for_student(db, student_id, due_after=due_after, after_id=after_id, limit=limit + 1)
+            return rows[:limit], len(rows) > limit
+
+        db_executor.submit(work, lambda result: self.later_assignments_fetched.emit(*result))
 
     @Slot(str, str, object, int, int)
     def create_assignment(self, title: str, instructions: str, due_date, points: int, classroom_id: int):
@@ -57,23 +153,23 @@ class AssignmentController(QObject):
             self.assignment_creation_failed.emit("Assignment title cannot be empty.")
             return
 
-        db = SessionLocal()
-        try:
+        def work(db):
             new_assignment = Assignment(
                 title=title, instructions=instructions, due_date=due_date, points=points, classroom_id=classroom_id
             )
             db.add(new_assignment)
+            db.flush()
+            stage_event(db, AssignmentCreated(new_assignment.id, classroom_id, title, due_date, points))
             db.commit()
-            self.assignment_created.emit(new_assignment)
-        finally:
-            db.close()
+            db.refresh(new_assignment)
+            return new_assignment
+
+        db_executor.submit(work, self.assignment_created.emit)
 
     @Slot(int)
     def get_assignment_by_id(self, assignment_id: int):
         """Fetches a single assignment by its ID."""
-        db = SessionLocal()
-        try:
-            assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
-            self.assignment_fetched.emit(assignment)
-        finally:
-            db.close()
\ No newline at end of file
+        def work(db):
+            return db.query(Assignment).filter(Assignment.id == assignment_id).first()
+
+        db_executor.submit(work, self.assignment_fetched.emit)
@@ -11,6 +11,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 from submission_panel import SubmissionPanel
 from grading_panel import GradingPanel
+from grade_stats_panel import GradeStatsPanel
 from view_header import ViewHeader
 
 
@@ -18,6 +19,7 @@ class AssignmentWindow(QWidget):
     """The main view for a single assignment, with instructions and submission panel."""
 
     grade_assignment_requested = Signal(int, float)
+    grade_batch_requested = Signal(list)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -49,13 +51,16 @@ class AssignmentWindow(QWidget):
 
         # --- Right Side: Submission Panel ---
         self.grading_panel = GradingPanel()
+        self.stats_panel = GradeStatsPanel()
         self.submission_panel = SubmissionPanel()
         self.grading_panel.grade_submission_requested.connect(self.grade_assignment_requested.emit)
+        self.grading_panel.grade_batch_requested.connect(self.grade_batch_requested.emit)
         self.header.back_requested.connect(self.go_back) # Placeholder connection
 
         main_layout.addWidget(instructions_panel, stretch=2)
         main_layout.addWidget(self.submission_panel, stretch=1)
         main_layout.addWidget(self.grading_panel, stretch=1)
+        main_layout.addWidget(self.stats_panel)
 
     def load_assignment(self, assignment, user):
         """Loads the data for a specific assignment into the view."""
@@ -69,6 +74,8 @@ class AssignmentWindow(QWidget):
         is_student = user.role.value == 'student'
         self.submission_panel.setVisible(is_student)
         self.grading_panel.setVisible(not is_student)
+        self.stats_panel.setVisible(not is_student)
+        self.stats_panel.clear(assignment.id)
         if is_student:
             self.submission_panel.update_submission_status(None) # Reset panel
 
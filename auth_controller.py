@@ -1,16 +1,23 @@
 from PySide6.QtCore import QObject, Signal, Slot
-from base import SessionLocal
-from user import User, UserRole
+from sqlalchemy import update
+from base import db_executor, hash_executor
+from user import User, UserRole, hash_password, verify_password
 
 
 class AuthController(QObject):
-    """Handles authentication logic."""
+    """Handles authentication logic.
+
+    bcrypt runs on ``hash_executor`` and only the short reads and writes go
+    through ``db_executor``, so neither the GUI nor a database worker waits
+    on a hash.
+    """
 
     # Signals to communicate results back to the main application
     login_successful = Signal(User)
     login_failed = Signal(str)
     signup_successful = Signal()
     signup_failed = Signal(str)
+    password_rehashed = Signal(int)
 
     @Slot(str, str)
     def login(self, email: str, password: str):
@@ -19,17 +26,60 @@ class AuthController(QObject):
             self.login_failed.emit("Email and password cannot be empty.")
             return
 
-        db_session = SessionLocal()
-        try:
-            user = db_session.query(User).filter(User.email == email).first()
-            if user and user.check_password(password):
-                self.login_successful.emit(user)
-            else:
-                self.login_failed.emit("Invalid email or password.")
-        except Exception as e:
-            self.login_failed.emit(f"An error occurred: {e}")
-        finally:
-            db_session.close()
+        def work(db_session):
+            return db_session.query(User).filter(User.email_matches(email)).first()
+
+        db_executor.submit(
+            work,
+            lambda user: self._verify(user, password),
+            lambda e: self.login_failed.emit(f"An error occurred: {e}"),
+        )
+
+    def _verify(self, user, password: str):
+        if user is None:
+            self.login_failed.emit("Invalid email or password.")
+            return
+        password_hash = user.password_hash
+        hash_executor.submit(
+            lambda: verify_password(password, password_hash),
+            lambda valid: self._on_login_checked(user if valid else None, password),
+            lambda e: self.login_failed.emit(f"An error occurred: {e}"),
+        )
+
+    def _on_login_checked(self, user, password: str):
+        if not user:
+            self.login_failed.emit("Invalid email or password.")
+            return
+        self.login_successful.emit(user)
+        if user.password_needs_rehash():
+            self._rehash(user, password)
+
+    def _rehash(self, user: User, password: str):
+        """Re-hashes a verified password at the configured cost, after login has gone through."""
+        user_id, old_hash = user.id, user.password_hash
+
+        def on_error(e):
+            print(f"Warning: could not rehash password for user {user_id}: {e}")
+
+        def store(new_hash):
+            def work(db_session):
+                # Only replace the hash the password was checked against
+                changed = db_session.execute(
+                    update(User)
+                    .where(User.id == user_id, User.password_hash == old_hash)
+                    .values(password_hash=new_hash)
+                ).rowcount
+                db_session.commit()
+                return changed
+
+            def on_stored(changed):
+                if changed:
+                    user.password_hash = new_hash
+                    self.password_rehashed.emit(user_id)
+
+            db_executor.submit(work, on_stored, on_error)
+
+        hash_executor.submit(lambda: hash_password(password), store, on_error)
 
     @Slot(str, str, str, str)
     def signup(self, email: str, password: str, confirm_password: str, role: str):
@@ -40,23 +90,31 @@ class AuthController(QObject):
         if password != confirm_password:
             self.signup_failed.emit("Passwords do not match.")
             return
-        
-        db_session = SessionLocal()
-        try:
-            # Check if user already exists
-            if db_session.query(User).filter(User.email == email).first():
-                self.signup_failed.emit("An account with this email already exists.")
-                return
-            
-            new_user = User(
-                email=email,
-                role=UserRole(role)
-            )
-            new_user.set_password(password)
-            db_session.add(new_user)
-            db_session.commit()
-            self.signup_successful.emit()
-        except Exception as e:
+
+        def on_error(e):
             self.signup_failed.emit(f"An error occurred during signup: {e}")
-        finally:
-            db_session.close()
\ No newline at end of file
+
+        def store(password_hash):
+            def work(db_session):
+                # Check if user already exists
+                if db_session.query(User).filter(User.email_matches(email)).first():
+                    return "An account with this email already exists."
+
+                new_user = User(
+                    email=email,
+                    role=UserRole(role),
+                    password_hash=password_hash,
+                )
+                db_session.add(new_user)
+                db_session.commit()
+                return None
+
+            db_executor.submit(work, self._on_signup_done, on_error)
+
+        hash_executor.submit(lambda: hash_password(password), store, on_error)
+
+    def _on_signup_done(self, error):
+        if error:
+            self.signup_failed.emit(error)
+        else:
+            self.signup_successful.emit()
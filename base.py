@@ -1,5 +1,11 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import os
+from abc import ABC, abstractmethod
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session
+
+from query_stats import slot_name, track_slot
 
 # For this example, we use a local SQLite database.
 # The file will be created in the project's root directory.
@@ -10,4 +16,268 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+# Named PRAGMA profiles applied to every new SQLite connection. "safe" keeps
+# SQLite's rollback journal; the WAL profiles let readers proceed while a
+# writer commits. Negative cache_size values are in KiB.
+SQLITE_PROFILES = {
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "bulk_load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+}
+FALLBACK_DB_PROFILE = "balanced"
+
+
+def profile_from_env() -> str:
+    """The profile named by ``PYCLASS_DB_PROFILE``; a typo warns and falls back to "balanced"."""
+    name = os.environ.get("PYCLASS_DB_PROFILE", FALLBACK_DB_PROFILE)
+    if name not in SQLITE_PROFILES:
+        print(f"Warning: unknown PYCLASS_DB_PROFILE '{name}', using '{FALLBACK_DB_PROFILE}'. "
+              f"Choose from: {', '.join(SQLITE_PROFILES)}.")
+        return FALLBACK_DB_PROFILE
+    return name
+
+
+# Checked once here, so a mistyped value cannot break importing this module
+DEFAULT_DB_PROFILE = profile_from_env()
+
+_profile_listeners = {}
+
+
+def use_sqlite_profile(name: str, target_engine=None):
+    """Applies a named PRAGMA profile to every new connection of an engine.
+
+    Pooled connections are discarded so the profile takes effect immediately.
+    """
+    if name not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown database profile '{name}'. Choose from: {', '.join(SQLITE_PROFILES)}.")
+    target_engine = target_engine or engine
+    pragmas = SQLITE_PROFILES[name]
+
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+    previous = _profile_listeners.pop(target_engine, None)
+    if previous is not None:
+        event.remove(target_engine, "connect", previous[1])
+    event.listen(target_engine, "connect", apply_pragmas)
+    _profile_listeners[target_engine] = (name, apply_pragmas)
+    target_engine.dispose()
+
+
+def active_sqlite_profile(target_engine=None):
+    """Returns the name of the profile installed on an engine, if any."""
+    entry = _profile_listeners.get(target_engine or engine)
+    return entry[0] if entry else None
+
+
+def active_pragmas(target_engine=None) -> dict:
+    """Reads back the profile PRAGMAs from a live connection."""
+    target_engine = target_engine or engine
+    with target_engine.connect() as connection:
+        return {
+            pragma: connection.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+            for pragma in SQLITE_PROFILES["safe"]
+        }
+
+
+use_sqlite_profile(DEFAULT_DB_PROFILE)
+
+# Number of background threads used for database work. 0 runs every query
+# inline on the calling thread, which is what the test suite uses.
+DEFAULT_DB_WORKERS = int(os.environ.get("PYCLASS_DB_WORKERS", "4"))
+# Threads for password hashing; kept apart so bcrypt never holds a database worker.
+DEFAULT_HASH_WORKERS = int(os.environ.get("PYCLASS_HASH_WORKERS", "2"))
+
+
+class _QueryRelay(QObject):
+    """Carries a task's outcome from a worker thread back to the GUI thread."""
+
+    finished = Signal(object)
+    failed = Signal(object)
+
+    def __init__(self, executor, on_result, on_error):
+        super().__init__()
+        self._executor = executor
+        self._on_result = on_result
+        self._on_error = on_error
+        # The relay lives in the submitting (GUI) thread, so emitting these
+        # signals from a worker queues the slots onto the GUI event loop.
+        self.finished.connect(self._deliver_result)
+        self.failed.connect(self._deliver_error)
+
+    @Slot(object)
+    def _deliver_result(self, result):
+        self._executor._release(self)
+        if self._on_result is not None:
+            self._on_result(result)
+
+    @Slot(object)
+    def _deliver_error(self, error):
+        self._executor._release(self)
+        if self._on_error is not None:
+            self._on_error(error)
+        else:
+            print(f"Error: background query failed: {error!r}")
+
+
+class _QueryTask(QRunnable):
+    """A unit of database work executed on the executor's thread pool."""
+
+    def __init__(self, executor, work, relay):
+        super().__init__()
+        self._executor = executor
+        self._work = work
+        self._relay = relay
+
+    def run(self):
+        try:
+            result = self._executor.run_task(self._work)
+        except Exception as e:
+            self._relay.failed.emit(e)
+        else:
+            self._relay.finished.emit(result)
+
+
+class _PoolExecutor(ABC):
+    """A QThreadPool whose task results are handed back to the GUI thread.
+
+    Subclasses define ``run_task``, which runs one submitted task on a worker.
+    """
+
+    def __init__(self, max_workers: int):
+        self._pool = QThreadPool()
+        self._relays = set()
+        self.set_max_workers(max_workers)
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def set_max_workers(self, max_workers: int):
+        """Sets the worker count. 0 makes every submission run inline."""
+        if max_workers < 0:
+            raise ValueError("max_workers cannot be negative.")
+        self._max_workers = max_workers
+        if max_workers:
+            self._pool.setMaxThreadCount(max_workers)
+
+    @abstractmethod
+    def run_task(self, work):
+        """Runs one submitted task on the calling thread and returns its result."""
+
+    def submit(self, work, on_result=None, on_error=None):
+        """Schedules ``work`` and delivers its return value to ``on_result``.
+
+        Exceptions raised by ``work`` are passed to ``on_error``. In inline mode
+        an exception without an ``on_error`` handler propagates to the caller.
+        """
+        if not self._max_workers:
+            try:
+                result = self.run_task(work)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+                return
+            if on_result is not None:
+                on_result(result)
+            return
+
+        relay = _QueryRelay(self, on_result, on_error)
+        self._relays.add(relay)
+        self._pool.start(_QueryTask(self, work, relay))
+
+    def _release(self, relay):
+        self._relays.discard(relay)
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """Blocks until all queued work has run. Results are still delivered
+        through the event loop."""
+        return self._pool.waitForDone(msecs)
+
+    def shutdown(self):
+        """Waits for running and queued tasks to finish, so writes submitted just before quitting still commit.
+
+        Callbacks of tasks that finish after the event loop has stopped are
+        not delivered.
+        """
+        self._pool.waitForDone()
+
+
+class QueryExecutor(_PoolExecutor):
+    """Runs controller database work on a QThreadPool.
+
+    Each task receives a session bound to the worker thread it runs on; the
+    session is closed as soon as the task returns. Results are handed back to
+    the GUI thread, where the ``on_result`` callback (typically a controller
+    signal's ``emit``) is invoked.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_DB_WORKERS):
+        self.session = scoped_session(SessionLocal)
+        super().__init__(max_workers)
+
+    def run_in_session(self, work):
+        """Calls ``work(db)`` with the current thread's session, then closes it.
+
+        Statements issued by ``work`` are attributed to the controller slot
+        that defined it (see ``query_stats``).
+        """
+        with track_slot(slot_name(work)) as slot:
+            db = self.session()
+            try:
+                result = work(db)
+            finally:
+                self.session.remove()
+            slot.record_result(result)
+            return result
+
+    def run_task(self, work):
+        """Runs one submitted ``work(db)`` task in a session of its own."""
+        return self.run_in_session(work)
+
+
+class CpuExecutor(_PoolExecutor):
+    """Runs session-free CPU work, such as bcrypt, on a pool of its own.
+
+    Tasks are plain ``work()`` callables; results are delivered exactly as
+    for ``QueryExecutor``.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_HASH_WORKERS):
+        super().__init__(max_workers)
+
+    def run_task(self, work):
+        return work()
+
+
+db_executor = QueryExecutor()
+hash_executor = CpuExecutor()
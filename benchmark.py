@@ -0,0 +1,416 @@
+"""
+Scale benchmark for the controller slots.
+
+Seeds a school-sized SQLite database and times every controller slot against
+it, writing p50/p95/p99 latencies to JSON so runs can be compared over time.
+
+    python benchmark.py seed --db bench.db            # ~20k users, 1M submissions
+    python benchmark.py seed --db small.db --scale 0.05
+    python benchmark.py run --db bench.db --output results/2026-10-18.json
+    python benchmark.py compare results/old.json results/new.json
+    python benchmark.py submit --db bench.db --submitters 8   # concurrent turn-ins
+
+Writes performed by the benchmarked slots (new classes, joins, grades, ...)
+are committed to the database, so keep a pristine copy if runs must be
+repeatable bit for bit.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+import query_stats
+from base import SessionLocal, db_executor, hash_executor, use_sqlite_profile
+from data_generator import DEFAULT_PASSWORD, GeneratorConfig, generate
+from user import User, UserRole
+from classroom import Classroom, student_classroom_association
+from assignment import Assignment
+from announcement import Announcement
+from submission import Submission
+
+BENCHMARK_PASSWORD = DEFAULT_PASSWORD
+
+
+def _open_engine(db_path: str):
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    use_sqlite_profile("bulk_load", engine)
+    return engine
+
+
+def seed_database(db_path: str, scale: float = 1.0, seed: int = 1234) -> dict:
+    """Creates ``db_path`` and fills it with synthetic users, classes and work."""
+    engine = _open_engine(db_path)
+    try:
+        generate(engine, GeneratorConfig.scaled(scale, seed, BENCHMARK_PASSWORD))
+        with Session(engine) as db:
+            return table_counts(db)
+    finally:
+        engine.dispose()
+
+
+def table_counts(db) -> dict:
+    """Returns the row count of every table the benchmark seeds."""
+    return {
+        "users": db.query(func.count(User.id)).scalar(),
+        "classrooms": db.query(func.count(Classroom.id)).scalar(),
+        "memberships": db.query(func.count()).select_from(student_classroom_association).scalar(),
+        "assignments": db.query(func.count(Assignment.id)).scalar(),
+        "submissions": db.query(func.count(Submission.id)).scalar(),
+        "announcements": db.query(func.count(Announcement.id)).scalar(),
+    }
+
+
+def percentile(sorted_samples: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return float("nan")
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+class _Fixtures:
+    """Detached sample rows the benchmarked slots are called with."""
+
+    def __init__(self, db, rng):
+        self.rng = rng
+        self.teachers = db.query(User).filter(User.role == UserRole.teacher).limit(200).all()
+        self.students = db.query(User).filter(User.role == UserRole.student).limit(2000).all()
+        self.classes = db.query(Classroom.id, Classroom.class_code).limit(1000).all()
+        self.assignment_ids = [row[0] for row in db.query(Assignment.id).limit(5000).all()]
+        self.submissions = db.query(Submission.id, Submission.assignment_id, Submission.student_id).limit(5000).all()
+        db.expunge_all()
+
+    def teacher(self):
+        return self.rng.choice(self.teachers)
+
+    def student(self):
+        return self.rng.choice(self.students)
+
+    def class_id(self):
+        return self.rng.choice(self.classes)[0]
+
+    def class_code(self):
+        return self.rng.choice(self.classes)[1]
+
+    def assignment_id(self):
+        return self.rng.choice(self.assignment_ids)
+
+    def submission(self):
+        return self.rng.choice(self.submissions)
+
+
+def _benchmark_cases(controllers, f):
+    """Maps slot name -> zero-argument callable exercising it with fresh arguments."""
+    auth, classroom, assignment, announcement, submission, settings, people, bundle = controllers
+    return {
+        "AuthController.login": lambda: auth.login(f.student().email, BENCHMARK_PASSWORD),
+        "ClassroomController.get_classes_for_user[teacher]": lambda: classroom.get_classes_for_user(f.teacher()),
+        "ClassroomController.get_classes_for_user[student]": lambda: classroom.get_classes_for_user(f.student()),
+        "ClassroomController.get_class_by_id": lambda: classroom.get_class_by_id(f.class_id()),
+        "ClassBundleController.load_class": lambda: bundle.load_class(f.class_id()),
+        "ClassroomController.create_class": lambda: classroom.create_class("Benchmark class", "B", f.teacher()),
+        "PeopleController.get_roster_page": lambda: people.get_roster_page(f.class_id()),
+        "ClassroomController.join_class": lambda: classroom.join_class(f.class_code(), f.student()),
+        "AnnouncementController.get_announcements_for_class": lambda: announcement.get_announcements_for_class(f.class_id()),
+        "AnnouncementController.create_announcement": lambda: announcement.create_announcement("Benchmark post", f.class_id(), f.teacher()),
+        "AssignmentController.get_assignments_for_class": lambda: assignment.get_assignments_for_class(f.class_id()),
+        "AssignmentController.get_all_assignments_for_user": lambda: assignment.get_all_assignments_for_user(f.student()),
+        "AssignmentController.get_all_assignments_for_user[upcoming]": lambda: assignment.get_all_assignments_for_user(
+            f.student(), due_after=datetime.now()),
+        "AssignmentController.get_earlier_assignments_for_user": lambda: assignment.get_earlier_assignments_for_user(
+            f.student(), datetime.now()),
+        "AssignmentController.get_assignment_by_id": lambda: assignment.get_assignment_by_id(f.assignment_id()),
+        "AssignmentController.create_assignment": lambda: assignment.create_assignment(
+            "Benchmark assignment", "", None, 10, f.class_id()),
+        "SubmissionController.get_submission": lambda: submission.get_submission(*f.submission()[1:]),
+        "SubmissionController.get_all_submissions_for_assignment": lambda: submission.get_all_submissions_for_assignment(
+            f.assignment_id()),
+        "SubmissionController.create_or_update_submission": lambda: _resubmit(submission, f),
+        "SubmissionController.grade_submission": lambda: submission.grade_submission(
+            f.submission()[0], float(f.rng.randint(0, 100))),
+        "SubmissionController.grade_submissions": lambda: submission.grade_submissions(
+            [(f.submission()[0], float(f.rng.randint(0, 100))) for _ in range(50)]),
+        "SettingsController.update_user_settings": lambda: settings.update_user_settings(f.student(), "Renamed Student"),
+    }
+
+
+def _resubmit(controller, fixtures):
+    submission_id, assignment_id, student_id = fixtures.submission()
+    student = User(id=student_id, role=UserRole.student)
+    controller.create_or_update_submission(assignment_id, student, "/uploads/resubmitted.pdf")
+
+
+def run_benchmarks(db_path: str, iterations: int = 30, seed: int = 1234, only=None) -> dict:
+    """Times each controller slot ``iterations`` times and returns a result dict."""
+    from auth_controller import AuthController
+    from classroom_controller import ClassroomController
+    from assignment_controller import AssignmentController
+    from announcement_controller import AnnouncementController
+    from submission_controller import SubmissionController
+    from settings_controller import SettingsController
+    from people_controller import PeopleController
+    from class_bundle_controller import ClassBundleController
+
+    rng = random.Random(seed)
+    engine = _open_engine(db_path)
+    use_sqlite_profile("balanced", engine)
+    SessionLocal.configure(bind=engine)
+    db_executor.set_max_workers(0)  # time the query work itself, not thread hand-off
+    hash_executor.set_max_workers(0)
+    query_stats.reset()
+    query_stats.install(engine)
+
+    db = SessionLocal()
+    try:
+        counts = table_counts(db)
+        fixtures = _Fixtures(db, rng)
+    finally:
+        db.close()
+
+    controllers = (
+        AuthController(), ClassroomController(), AssignmentController(),
+        AnnouncementController(), SubmissionController(), SettingsController(), PeopleController(),
+        ClassBundleController(),
+    )
+    cases = _benchmark_cases(controllers, fixtures)
+    if only:
+        cases = {name: case for name, case in cases.items() if any(pattern in name for pattern in only)}
+
+    slots = {}
+    try:
+        for name, case in cases.items():
+            case()  # warm-up: imports, statement cache, page cache
+            query_stats.reset()
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                case()
+                samples.append((time.perf_counter() - start) * 1000)
+            samples.sort()
+            statements = sum(entry.statements for entry in query_stats.stats().values())
+            slots[name] = {
+                "samples": len(samples),
+                "mean_ms": round(sum(samples) / len(samples), 3),
+                "p50_ms": round(percentile(samples, 50), 3),
+                "p95_ms": round(percentile(samples, 95), 3),
+                "p99_ms": round(percentile(samples, 99), 3),
+                "statements_per_call": round(statements / len(samples), 2),
+            }
+            print(f"{name:<60} p50 {slots[name]['p50_ms']:>9.2f} ms   p95 {slots[name]['p95_ms']:>9.2f} ms   "
+                  f"p99 {slots[name]['p99_ms']:>9.2f} ms")
+    finally:
+        query_stats.uninstall(engine)
+        engine.dispose()
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "database": os.path.abspath(db_path),
+        "iterations": iterations,
+        "counts": counts,
+        "slots": slots,
+    }
+
+
+def _select_then_write(db, assignment_id, student_id, content):
+    """The turn-in as it was before the upsert: SELECT, then INSERT or UPDATE, then refresh."""
+    submission = db.query(Submission).filter_by(assignment_id=assignment_id, student_id=student_id).first()
+    if not submission:
+        submission = Submission(assignment_id=assignment_id, student_id=student_id)
+        db.add(submission)
+    submission.content = content
+    db.commit()
+    db.refresh(submission)
+    return submission
+
+
+def _upsert(db, assignment_id, student_id, content):
+    from submission_controller import upsert_submission
+    submission = upsert_submission(db, assignment_id, student_id, content)
+    db.commit()
+    return submission
+
+
+TURN_IN_STRATEGIES = {"upsert": _upsert, "select-then-write": _select_then_write}
+
+
+def _turn_in_pairs(engine, count: int, rng) -> list:
+    """(assignment_id, student_id) pairs of enrolled students, about half already submitted."""
+    membership = student_classroom_association
+    with engine.connect() as connection:
+        submitted = connection.execute(
+            select(Submission.assignment_id, Submission.student_id).limit(count)).all()
+        open_pairs = connection.execute(
+            select(Assignment.id, membership.c.user_id)
+            .join(membership, membership.c.classroom_id == Assignment.classroom_id)
+            .outerjoin(Submission, (Submission.assignment_id == Assignment.id)
+                       & (Submission.student_id == membership.c.user_id))
+            .where(Submission.id.is_(None))
+            .limit(count)
+        ).all()
+    pairs = [tuple(row) for row in submitted[:count // 2] + open_pairs[:count - count // 2]]
+    rng.shuffle(pairs)
+    return pairs
+
+
+def run_submission_throughput(db_path: str, submitters: int = 8, turn_ins: int = 200, pairs: int = 50,
+                              strategy: str = "upsert", seed: int = 1234) -> dict:
+    """Runs ``submitters`` threads that each turn in ``turn_ins`` times.
+
+    Every thread draws from the same small set of (assignment, student)
+    pairs, like double clicks near a deadline, so writes collide. Returns
+    turn-ins per second, latency percentiles and the number of failed turn-ins.
+    """
+    turn_in = TURN_IN_STRATEGIES[strategy]
+    engine = _open_engine(db_path)
+    use_sqlite_profile("balanced", engine)
+    rng = random.Random(seed)
+    hot_pairs = _turn_in_pairs(engine, pairs, rng)
+    if not hot_pairs:
+        engine.dispose()
+        raise ValueError(f"{db_path} has no enrolled students to submit for; seed it first.")
+
+    latencies, errors = [], {}
+    lock = threading.Lock()
+    start_gate = threading.Barrier(submitters)
+
+    def submitter(index):
+        local_rng = random.Random(seed + index)
+        samples, failures = [], {}
+        start_gate.wait()
+        for i in range(turn_ins):
+            assignment_id, student_id = local_rng.choice(hot_pairs)
+            began = time.perf_counter()
+            with Session(engine) as db:
+                try:
+                    turn_in(db, assignment_id, student_id, f"/uploads/bench-{index}-{i}.pdf")
+                except DBAPIError as e:
+                    name = type(e.orig).__name__ if e.orig is not None else type(e).__name__
+                    failures[name] = failures.get(name, 0) + 1
+                    continue
+            samples.append((time.perf_counter() - began) * 1000)
+        with lock:
+            latencies.extend(samples)
+            for name, count in failures.items():
+                errors[name] = errors.get(name, 0) + count
+
+    threads = [threading.Thread(target=submitter, args=(i,)) for i in range(submitters)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    engine.dispose()
+
+    latencies.sort()
+    return {
+        "strategy": strategy,
+        "submitters": submitters,
+        "attempted": submitters * turn_ins,
+        "succeeded": len(latencies),
+        "failed": errors,
+        "turn_ins_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(old: dict, new: dict) -> str:
+    """Formats the p50/p95 change per slot between two result files."""
+    lines = [f"{'Slot':<60} {'p50 old':>9} {'p50 new':>9} {'p95 old':>9} {'p95 new':>9} {'p95 Δ':>8}"]
+    for name in sorted(set(old["slots"]) | set(new["slots"])):
+        before, after = old["slots"].get(name), new["slots"].get(name)
+        if not before or not after:
+            lines.append(f"{name:<60} {'(only in ' + ('new' if after else 'old') + ')':>47}")
+            continue
+        change = (after["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+        lines.append(
+            f"{name:<60} {before['p50_ms']:>9.2f} {after['p50_ms']:>9.2f} "
+            f"{before['p95_ms']:>9.2f} {after['p95_ms']:>9.2f} {change:>+7.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_cmd = commands.add_parser("seed", help="create and fill a benchmark database")
+    seed_cmd.add_argument("--db", required=True, help="path of the SQLite file to create")
+    seed_cmd.add_argument("--scale", type=float, default=1.0, help="fraction of the full school size")
+    seed_cmd.add_argument("--seed", type=int, default=1234, help="random seed")
+
+    run_cmd = commands.add_parser("run", help="time every controller slot")
+    run_cmd.add_argument("--db", required=True, help="seeded SQLite file")
+    run_cmd.add_argument("--iterations", type=int, default=30)
+    run_cmd.add_argument("--seed", type=int, default=1234, help="random seed for slot arguments")
+    run_cmd.add_argument("--only", nargs="*", help="run only slots whose name contains one of these strings")
+    run_cmd.add_argument("--output", help="write results JSON to this path")
+
+    compare_cmd = commands.add_parser("compare", help="compare two result files")
+    compare_cmd.add_argument("old")
+    compare_cmd.add_argument("new")
+
+    submit_cmd = commands.add_parser("submit", help="time concurrent turn-ins")
+    submit_cmd.add_argument("--db", required=True, help="seeded SQLite file")
+    submit_cmd.add_argument("--submitters", type=int, default=8, help="concurrent submitter threads")
+    submit_cmd.add_argument("--turn-ins", type=int, default=200, help="turn-ins per submitter")
+    submit_cmd.add_argument("--pairs", type=int, default=50, help="distinct (assignment, student) pairs to contend on")
+    submit_cmd.add_argument("--strategy", choices=sorted(TURN_IN_STRATEGIES), nargs="*",
+                            default=sorted(TURN_IN_STRATEGIES), help="turn-in implementations to compare")
+    submit_cmd.add_argument("--seed", type=int, default=1234)
+
+    args = parser.parse_args(argv)
+    if args.command == "submit":
+        for strategy in args.strategy:
+            result = run_submission_throughput(
+                args.db, args.submitters, args.turn_ins, args.pairs, strategy, args.seed)
+            print(f"{strategy:<18} {result['turn_ins_per_second']:>8} turn-ins/s   p50 {result['p50_ms']:>7.2f} ms   "
+                  f"p95 {result['p95_ms']:>7.2f} ms   failed {sum(result['failed'].values())} {result['failed'] or ''}")
+        return 0
+    if args.command == "seed":
+        if os.path.exists(args.db):
+            parser.error(f"{args.db} already exists; remove it or choose another path.")
+        start = time.perf_counter()
+        counts = seed_database(args.db, args.scale, args.seed)
+        print(f"Seeded {args.db} in {time.perf_counter() - start:.1f}s: {counts}")
+    elif args.command == "run":
+        results = run_benchmarks(args.db, args.iterations, args.seed, args.only)
+        if args.output:
+            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"Results written to {args.output}")
+    else:
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        print(compare_results(old, new))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
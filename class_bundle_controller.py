@@ -0,0 +1,145 @@
+"""
+Opening a class in one request.
+
+``ClassBundleController.load_class`` submits every read the class view needs
+(the classroom header, the first announcement page, the assignments and the
+first roster page) to ``db_executor`` at once. Each part runs on its own
+worker thread with its own session and is delivered as soon as it is ready,
+so the header and stream can paint while the longer lists are still loading.
+"""
+import time
+from functools import wraps
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from base import db_executor
+from announcement_controller import announcement_page
+from assignment_controller import class_assignments
+from classroom_controller import classroom_summary
+from people_controller import roster_page
+
+# Submitted in this order, so with fewer workers than parts the header and stream go first.
+BUNDLE_PARTS = ("classroom", "announcements", "assignments", "roster")
+
+
+class ClassBundleTimings:
+    """When each part of one class bundle reached the GUI thread, in seconds after the request.
+
+    Also the handle to cancel the request: parts not yet run are skipped and
+    parts already running are not delivered.
+    """
+
+    __slots__ = ("classroom_id", "requested", "started", "parts", "cancelled")
+
+    def __init__(self, classroom_id, requested=BUNDLE_PARTS):
+        self.classroom_id = classroom_id
+        self.requested = tuple(requested)
+        self.started = time.perf_counter()
+        self.parts = {}
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def pending(self) -> tuple:
+        """Parts requested but not delivered yet."""
+        return tuple(part for part in self.requested if part not in self.parts)
+
+    def mark(self, part: str):
+        self.parts[part] = time.perf_counter() - self.started
+
+    @property
+    def complete(self) -> bool:
+        return len(self.parts) == len(self.requested)
+
+    @property
+    def total(self) -> float:
+        return max(self.parts.values(), default=0.0)
+
+    def summary(self) -> str:
+        parts = "  ".join(f"{part} {seconds * 1000:.1f} ms" for part, seconds in self.parts.items())
+        return f"Class {self.classroom_id} loaded in {self.total * 1000:.1f} ms: {parts}"
+
+
+class ClassBundleController(QObject):
+    """Loads the parts of a class view concurrently and reports each as it arrives."""
+
+    classroom_loaded = Signal(int, object)  # classroom_id, Classroom (None if it no longer exists)
+    announcements_loaded = Signal(int, list, bool)  # classroom_id, first page, has_more
+    assignments_loaded = Signal(int, list)  # classroom_id, assignments
+    roster_loaded = Signal(int, list, bool)  # classroom_id, first roster page, has_more
+    bundle_loaded = Signal(object)  # ClassBundleTimings, once every part has arrived
+    part_failed = Signal(int, str)  # classroom_id, reason
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.last_timings = None
+
+    @Slot(int)
+    def load_class(self, classroom_id: int, parts=BUNDLE_PARTS) -> ClassBundleTimings:
+        """Requests ``parts`` of ``classroom_id`` (by default all of them) at once; returns the request."""
+        parts = [part for part in BUNDLE_PARTS if part in parts]
+        timings = ClassBundleTimings(classroom_id, parts)
+        self.last_timings = timings
+        loaders = {
+            "classroom": self._load_classroom,
+            "announcements": self._load_announcements,
+            "assignments": self._load_assignments,
+            "roster": self._load_roster,
+        }
+        for part in parts:
+            loaders[part](classroom_id, timings)
+        return timings
+
+    # One method per part, so query_stats charges each part to its own slot
+    def _load_classroom(self, classroom_id: int, timings):
+        def work(db):
+            return classroom_summary(db, classroom_id)
+
+        self._submit(work, "classroom", timings, lambda classroom: self.classroom_loaded.emit(classroom_id, classroom))
+
+    def _load_announcements(self, classroom_id: int, timings):
+        def work(db):
+            return announcement_page(db, classroom_id)
+
+        self._submit(work, "announcements", timings,
+                     lambda result: self.announcements_loaded.emit(classroom_id, *result))
+
+    def _load_assignments(self, classroom_id: int, timings):
+        def work(db):
+            return class_assignments(db, classroom_id)
+
+        self._submit(work, "assignments", timings,
+                     lambda assignments: self.assignments_loaded.emit(classroom_id, assignments))
+
+    def _load_roster(self, classroom_id: int, timings):
+        def work(db):
+            return roster_page(db, classroom_id)
+
+        self._submit(work, "roster", timings, lambda result: self.roster_loaded.emit(classroom_id, *result))
+
+    def _submit(self, work, part: str, timings, deliver):
+        @wraps(work)  # keeps the part's query_stats slot
+        def run(db):
+            return None if timings.cancelled else work(db)
+
+        def on_result(result):
+            if timings.cancelled:
+                return
+            timings.mark(part)
+            deliver(result)
+            self._finish_part(timings)
+
+        def on_error(error):
+            if timings.cancelled:
+                return
+            timings.mark(part)
+            self.part_failed.emit(timings.classroom_id, f"Could not load the class {part}: {error}")
+            self._finish_part(timings)
+
+        db_executor.submit(run, on_result, on_error)
+
+    def _finish_part(self, timings):
+        if timings.complete:
+            self.bundle_loaded.emit(timings)
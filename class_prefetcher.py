@@ -0,0 +1,73 @@
+"""
+Hover-intent prefetch for dashboard class cards.
+
+When the pointer rests on a class card, ``ClassPrefetcher.prefetch`` loads
+the cached parts of that class (header, first announcement page and
+assignments) through the class bundle controller. The main window stores
+every loaded part in its ``ViewCache``, so a click that follows renders
+straight from the cache. A click that arrives while the prefetch is still
+running waits for it instead of requesting the same parts again.
+
+Only a few prefetches run at once. A new hover cancels the oldest one, and
+opening a class cancels every prefetch for other classes.
+"""
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, Slot
+
+# Bundle part -> the ViewCache view that keeps it. The roster is paged and not cached.
+PART_VIEWS = {"classroom": "class", "announcements": "stream", "assignments": "classwork"}
+PREFETCH_MAX_IN_FLIGHT = 2
+
+
+class ClassPrefetcher(QObject):
+    """Starts bounded, cancellable class bundle loads ahead of a click."""
+
+    def __init__(self, bundles, view_cache, max_in_flight: int = PREFETCH_MAX_IN_FLIGHT, parent=None):
+        super().__init__(parent)
+        self._bundles = bundles
+        self._view_cache = view_cache
+        self.max_in_flight = max_in_flight
+        self._in_flight = OrderedDict()  # classroom_id -> ClassBundleTimings, oldest first
+        bundles.bundle_loaded.connect(self._on_bundle_loaded)
+
+    @property
+    def in_flight(self) -> list:
+        return list(self._in_flight)
+
+    @Slot(int)
+    def prefetch(self, classroom_id: int):
+        """Loads whichever cached parts of ``classroom_id`` are missing or stale."""
+        if classroom_id in self._in_flight or self.max_in_flight <= 0:
+            return
+        parts = []
+        for part, view in PART_VIEWS.items():
+            entry = self._view_cache.get(view, classroom_id)
+            if entry is None or not self._view_cache.is_fresh(view, entry):
+                parts.append(part)
+        if not parts:
+            return
+        while len(self._in_flight) >= self.max_in_flight:
+            self._in_flight.popitem(last=False)[1].cancel()
+        request = self._bundles.load_class(classroom_id, parts)
+        if not request.complete:  # inline loads finish before returning
+            self._in_flight[classroom_id] = request
+
+    def pending_parts(self, classroom_id: int) -> tuple:
+        """Parts of ``classroom_id`` that a running prefetch will still deliver."""
+        request = self._in_flight.get(classroom_id)
+        return request.pending if request is not None else ()
+
+    def cancel(self, classroom_id: int):
+        request = self._in_flight.pop(classroom_id, None)
+        if request is not None:
+            request.cancel()
+
+    def cancel_all(self, keep=None):
+        """Cancels every prefetch except the one for ``keep``."""
+        for classroom_id in [cid for cid in self._in_flight if cid != keep]:
+            self.cancel(classroom_id)
+
+    def _on_bundle_loaded(self, timings):
+        if self._in_flight.get(timings.classroom_id) is timings:
+            del self._in_flight[timings.classroom_id]
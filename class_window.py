@@ -1,19 +1,47 @@
+from bisect import bisect_left
+from operator import attrgetter
+
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QTabWidget, QLabel
 from PySide6.QtCore import Signal
 from stream_view import StreamView
 from people_view import PeopleView
 from classwork_view import ClassworkView
+from gradebook_view import GradebookView
+from user import UserRole
 from view_header import ViewHeader
 
 
+class _KeyView:
+    """``key`` of each item of ``items``, computed on access, for bisect without a copy.
+
+    bisect's own ``key=`` argument needs Python 3.10.
+    """
+
+    def __init__(self, items, key):
+        self._items = items
+        self._key = key
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._key(self._items[index])
+
+
 class ClassWindow(QWidget):
     """The main view for a single class, with tabs for Stream, Classwork, etc."""
+    gradebook_requested = Signal(int)  # classroom_id; emitted when the Grades tab opens on a stale gradebook
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.header = ViewHeader()
         self.current_classroom = None
         self.current_class_id = None
+        # Students of the current class loaded so far, in roster (email) order
+        self.roster = []
+        # False while roster pages are still arriving
+        self.roster_complete = False
+        self._gradebook_stale = True
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(30, 20, 30, 20)
@@ -28,16 +56,66 @@ class ClassWindow(QWidget):
         self.tab_widget.addTab(self.stream_tab, "Stream")
         self.tab_widget.addTab(self.classwork_tab, "Classwork")
         self.tab_widget.addTab(self.people_tab, "People")
+        self.grades_tab = GradebookView()
+        self.tab_widget.addTab(self.grades_tab, "Grades")
+        self.tab_widget.setTabVisible(self.tab_widget.indexOf(self.grades_tab), False)
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
 
         main_layout.addWidget(self.tab_widget)
 
     def load_class(self, classroom):
         """Loads the data for a specific class into the view."""
+        self.begin_class(classroom.id)
+        self.show_classroom(classroom)
+
+    def begin_class(self, classroom_id: int):
+        """Empties every tab for ``classroom_id``; its parts are filled in as they arrive, in any order."""
+        self.current_classroom = None
+        self.current_class_id = classroom_id
+        self.roster = []
+        self.roster_complete = False
+        self._gradebook_stale = True
+        self.header.set_title("")
+        self.stream_tab.display_class_code("")
+        self.classwork_tab.display_assignments([])
+        self.people_tab.clear_view()
+        self.stream_tab.display_announcements([])
+        self.grades_tab.clear_view()
+        self._on_tab_changed(self.tab_widget.currentIndex())
+
+    def show_classroom(self, classroom):
+        """Fills in the header, class code and teacher, keeping anything already loaded."""
         self.current_classroom = classroom
-        self.current_class_id = classroom.id
         self.header.set_title(classroom.name)
         self.stream_tab.display_class_code(classroom.class_code)
-        # Clear any previous announcements
-        self.classwork_tab.display_assignments([])
-        self.people_tab.clear_view()
-        self.stream_tab.display_announcements([])
\ No newline at end of file
+        self.people_tab.set_teacher(classroom.teacher, classroom.roster_size)
+
+    def set_user_role(self, role: UserRole):
+        """Only teachers see the gradebook."""
+        is_teacher = role == UserRole.teacher
+        self.tab_widget.setTabVisible(self.tab_widget.indexOf(self.grades_tab), is_teacher)
+        if not is_teacher and self.tab_widget.currentWidget() is self.grades_tab:
+            self.tab_widget.setCurrentWidget(self.stream_tab)
+
+    def add_student(self, student):
+        """Places a student who just joined into the roster and People tab, in email order."""
+        index = bisect_left(_KeyView(self.roster, attrgetter("email")), student.email)
+        if index < len(self.roster) and self.roster[index].email == student.email:
+            return
+        if index == len(self.roster) and not self.roster_complete:
+            return  # Falls on a roster page that has not arrived yet; it will bring the student
+        self.roster.insert(index, student)
+        self.people_tab.insert_student(index, student)
+        self.invalidate_gradebook()
+
+    def invalidate_gradebook(self):
+        """Marks the gradebook for reloading: its rows or columns changed, not just a grade."""
+        self._gradebook_stale = True
+        self._on_tab_changed(self.tab_widget.currentIndex())
+
+    def _on_tab_changed(self, index: int):
+        # Grade edits are applied in place, so only a new student or assignment needs a reload
+        if (self._gradebook_stale and self.tab_widget.widget(index) is self.grades_tab
+                and self.tab_widget.isTabVisible(index) and self.current_class_id is not None):
+            self._gradebook_stale = False
+            self.gradebook_requested.emit(self.current_class_id)
\ No newline at end of file
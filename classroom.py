@@ -1,6 +1,6 @@
 import secrets
 from sqlalchemy import Column, Integer, String, ForeignKey, Table, Index, UniqueConstraint, CheckConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 
 from base import Base
 
@@ -15,6 +15,8 @@ student_classroom_association = Table(
     "student_classroom", Base.metadata,
     Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
     Column("classroom_id", Integer, ForeignKey("classrooms.id"), primary_key=True),
+    # The primary key leads with user_id; rosters are looked up by classroom
+    Index("ix_student_classroom_classroom_user", "classroom_id", "user_id"),
 )
 
 class Classroom(Base):
@@ -38,4 +40,7 @@ class Classroom(Base):
     teacher = relationship("User", back_populates="classes_taught")
     students = relationship("User", secondary=student_classroom_association, back_populates="classes_joined")
     announcements = relationship("Announcement", backref="classroom", cascade="all, delete-orphan")
-    assignments = relationship("Assignment", backref="classroom", cascade="all, delete-orphan")
\ No newline at end of file
+    assignments = relationship("Assignment", backref="classroom", cascade="all, delete-orphan")
+
+    # Number of enrolled students; only populated by queries that ask for it
+    roster_size = query_expression()
\ No newline at end of file
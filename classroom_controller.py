@@ -1,9 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+
 from PySide6.QtCore import QObject, Signal, Slot
-from sqlalchemy.orm import joinedload
-from base import SessionLocal
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import joinedload, with_expression
+from base import db_executor
 from classroom import Classroom
 from user import User, UserRole
 from classroom import student_classroom_association
+from events import StudentJoined, stage_event
+
+# Codes remembered by the join lookup; invalid codes get their own, smaller LRU
+# so a burst of typos cannot push valid codes out.
+CLASS_CODE_CACHE_SIZE = 512
+INVALID_CODE_CACHE_SIZE = 128
+# Seconds an invalid code is trusted: another client may create the class at any time.
+INVALID_CODE_TTL = 5.0
+
+
+class ClassCodeCache:
+    """Thread-safe LRU of class code -> classroom id, with a short-lived negative cache for invalid codes."""
+
+    MISSING = object()
+
+    def __init__(self, maxsize: int = CLASS_CODE_CACHE_SIZE, invalid_maxsize: int = INVALID_CODE_CACHE_SIZE,
+                 invalid_ttl: float = INVALID_CODE_TTL, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.invalid_maxsize = invalid_maxsize
+        self.invalid_ttl = invalid_ttl
+        self._clock = clock
+        self._valid = OrderedDict()
+        self._invalid = OrderedDict()  # code -> when it stops being trusted
+        self._lock = threading.Lock()
+
+    def get(self, class_code: str):
+        """Returns the classroom id, None for a recently invalid code, or MISSING."""
+        with self._lock:
+            if class_code in self._valid:
+                self._valid.move_to_end(class_code)
+                return self._valid[class_code]
+            expires_at = self._invalid.get(class_code)
+            if expires_at is not None:
+                if self._clock() < expires_at:
+                    self._invalid.move_to_end(class_code)
+                    return None
+                del self._invalid[class_code]
+        return self.MISSING
+
+    def put(self, class_code: str, classroom_id):
+        """Remembers a lookup result; ``classroom_id`` None marks the code invalid for ``invalid_ttl`` seconds."""
+        with self._lock:
+            if classroom_id is None:
+                entries, limit, value = self._invalid, self.invalid_maxsize, self._clock() + self.invalid_ttl
+            else:
+                entries, limit, value = self._valid, self.maxsize, classroom_id
+            entries[class_code] = value
+            entries.move_to_end(class_code)
+            if len(entries) > limit:
+                entries.popitem(last=False)
+
+    def discard(self, class_code: str):
+        with self._lock:
+            self._valid.pop(class_code, None)
+            self._invalid.pop(class_code, None)
+
+    def clear(self):
+        with self._lock:
+            self._valid.clear()
+            self._invalid.clear()
+
+
+class_codes = ClassCodeCache()
+
+
+def classroom_id_for_code(db, class_code: str):
+    """Resolves a class code through the cache; returns None for an invalid code."""
+    classroom_id = class_codes.get(class_code)
+    if classroom_id is ClassCodeCache.MISSING:
+        classroom_id = db.scalar(select(Classroom.id).where(Classroom.class_code == class_code))
+        class_codes.put(class_code, classroom_id)
+    return classroom_id
+
+
+def classroom_summary(db, classroom_id: int):
+    """A classroom with its teacher and roster size, or None; the students are paged separately."""
+    roster_size = (
+        select(func.count())
+        .select_from(student_classroom_association)
+        .where(student_classroom_association.c.classroom_id == Classroom.id)
+        .scalar_subquery()
+    )
+    return (
+        db.query(Classroom)
+        .options(joinedload(Classroom.teacher), with_expression(Classroom.roster_size, roster_size))
+        .filter(Classroom.id == classroom_id).first()
+    )
 
 
 class ClassroomController(QObject):
@@ -23,20 +115,24 @@ class ClassroomController(QObject):
             self.class_creation_failed.emit("Class name cannot be empty.")
             return
 
-        db_session = SessionLocal()
-        try:
+        teacher_id = teacher.id
+
+        def work(db_session):
             new_class = Classroom(
                 name=name,
                 section=section,
-                teacher_id=teacher.id
+                teacher_id=teacher_id
             )
             db_session.add(new_class)
             db_session.commit()
             # Refresh to get DB-generated values and eager load the teacher relationship
+            db_session.refresh(new_class)
             db_session.refresh(new_class, ["teacher"])
-            self.class_created.emit(new_class)
-        finally:
-            db_session.close()
+            # The code may have been tried (and cached as invalid) before it existed
+            class_codes.discard(new_class.class_code)
+            return new_class
+
+        db_executor.submit(work, self.class_created.emit)
 
     @Slot(str, User)
     def join_class(self, class_code: str, student: User):
@@ -45,30 +141,42 @@ class ClassroomController(QObject):
             self.join_class_failed.emit("Class code cannot be empty.")
             return
 
-        db_session = SessionLocal()
-        try:
-            classroom = db_session.query(Classroom).filter(Classroom.class_code == class_code).first()
-            if not classroom:
-                self.join_class_failed.emit("Invalid class code.")
-                return
+        student_id, student_email = student.id, student.email
 
-            # Re-attach student to this session to avoid DetachedInstanceError
-            student_in_session = db_session.merge(student)
-            if student_in_session in classroom.students:
-                self.join_class_failed.emit("You are already in this class.")
-                return
+        def work(db_session):
+            classroom_id = classroom_id_for_code(db_session, class_code)
+            if classroom_id is None:
+                return None, "Invalid class code."
 
-            classroom.students.append(student_in_session)
+            # The primary key conflict is the membership check: no roster is loaded
+            joined = db_session.execute(
+                insert(student_classroom_association).prefix_with("OR IGNORE"),
+                {"user_id": student_id, "classroom_id": classroom_id},
+            ).rowcount
+            if not joined:
+                return None, "You are already in this class."
+            stage_event(db_session, StudentJoined(classroom_id, student_id, student_email))
             db_session.commit()
+            # The dashboard card needs the class fields and teacher once the session is gone
+            classroom = (
+                db_session.query(Classroom).options(joinedload(Classroom.teacher))
+                .filter(Classroom.id == classroom_id).one()
+            )
+            return classroom, None
+
+        db_executor.submit(work, self._on_join_done)
+
+    def _on_join_done(self, outcome):
+        classroom, reason = outcome
+        if reason:
+            self.join_class_failed.emit(reason)
+        else:
             self.class_joined.emit(classroom)
-        finally:
-            db_session.close()
 
     @Slot(User)
     def get_classes_for_user(self, user: User):
         """Fetches all classrooms a user is associated with."""
-        db_session = SessionLocal()
-        try:
+        def work(db_session):
             # Re-attach user to this session to avoid DetachedInstanceError
             user_in_session = db_session.merge(user)
 
@@ -85,20 +193,17 @@ class ClassroomController(QObject):
                     .filter(student_classroom_association.c.user_id == user_in_session.id)
                 ).all()
 
-            self.classes_fetched.emit(list(classes))
-        finally:
-            db_session.close()
+            return list(classes)
+
+        db_executor.submit(work, self.classes_fetched.emit)
 
     @Slot(int)
     def get_class_by_id(self, classroom_id: int):
-        """Fetches a single classroom by its ID, eagerly loading teacher and students."""
-        db = SessionLocal()
-        try:
-            classroom = (
-                db.query(Classroom)
-                .options(joinedload(Classroom.teacher), joinedload(Classroom.students))
-                .filter(Classroom.id == classroom_id).first()
-            )
-            self.class_fetched.emit(classroom)
-        finally:
-            db.close()
\ No newline at end of file
+        """Fetches a single classroom by its ID with its teacher and roster size.
+
+        The students themselves are paged in by PeopleController.get_roster_page.
+        """
+        def work(db):
+            return classroom_summary(db, classroom_id)
+
+        db_executor.submit(work, self.class_fetched.emit)
@@ -12,6 +12,12 @@ from PySide6.QtGui import QCursor
 from user import UserRole
 
 
+def assignment_sort_key(assignment):
+    """Orders like get_assignments_for_class: latest due date first, undated last, newer first on ties."""
+    due_date = assignment.due_date.replace(tzinfo=None) if assignment.due_date else None
+    return (due_date is not None, due_date or 0, assignment.id)
+
+
 class AssignmentItem(QFrame):
     """A widget that displays a single assignment in a list."""
     clicked = Signal(int)
@@ -23,6 +29,7 @@ class AssignmentItem(QFrame):
         self.setCursor(QCursor(Qt.PointingHandCursor))
 
         self.assignment_id = assignment.id
+        self.sort_key = assignment_sort_key(assignment)
 
         layout = QHBoxLayout(self)
         layout.setContentsMargins(15, 10, 15, 10)
@@ -87,6 +94,23 @@ class ClassworkView(QWidget):
                 child.widget().deleteLater()
 
         for asn in assignments:
-            item = AssignmentItem(asn)
-            item.clicked.connect(self.assignment_selected.emit)
-            self.assignments_layout.addWidget(item)
\ No newline at end of file
+            self._add_item(AssignmentItem(asn))
+
+    @Slot(object)
+    def insert_assignment(self, assignment):
+        """Adds one new assignment at its place in the list, leaving the rest untouched."""
+        item = AssignmentItem(assignment)
+        index = 0
+        while index < self.assignments_layout.count():
+            existing = self.assignments_layout.itemAt(index).widget()
+            if existing.assignment_id == item.assignment_id:
+                item.deleteLater()
+                return
+            if existing.sort_key < item.sort_key:
+                break
+            index += 1
+        self._add_item(item, index)
+
+    def _add_item(self, item, index=-1):
+        item.clicked.connect(self.assignment_selected.emit)
+        self.assignments_layout.insertWidget(index, item)
\ No newline at end of file
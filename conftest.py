@@ -4,17 +4,21 @@ Pytest configuration and fixtures for the classroom clone application.
 import pytest
 import tempfile
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTimer
 
-from base import Base, SessionLocal
+from base import Base, SessionLocal, db_executor, hash_executor
+from classroom_controller import class_codes
 from user import User, UserRole
 from classroom import Classroom
 from assignment import Assignment
 from announcement import Announcement
 from submission import Submission
+from session_token import SessionToken  # noqa: F401  (registers the table for create_all)
+import session_controller
+from events import event_bus
 
 
 @pytest.fixture(scope="session")
@@ -28,6 +32,33 @@ def app():
         yield QApplication.instance()
 
 
+@pytest.fixture(autouse=True)
+def inline_db_executor():
+    """Run controller database and hashing work inline so slots emit synchronously."""
+    previous = db_executor.max_workers, hash_executor.max_workers
+    db_executor.set_max_workers(0)
+    hash_executor.set_max_workers(0)
+    yield db_executor
+    db_executor.set_max_workers(previous[0])
+    hash_executor.set_max_workers(previous[1])
+
+
+@pytest.fixture(autouse=True)
+def session_token_file(tmp_path, monkeypatch):
+    """Keep "remember me" tokens out of the real home directory."""
+    path = tmp_path / "session"
+    monkeypatch.setattr(session_controller, "TOKEN_FILE", path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def isolated_event_bus():
+    """Windows from earlier tests must not keep receiving events."""
+    event_bus.clear()
+    yield event_bus
+    event_bus.clear()
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """Create a temporary database session for each test."""
@@ -35,9 +66,13 @@ def db_session():
     db_fd, db_path = tempfile.mkstemp()
     
     # Create engine and session
-    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    engine = create_engine(
+        f"sqlite:///{db_path}", echo=False, connect_args={"check_same_thread": False}
+    )
     Base.metadata.create_all(engine)
     SessionLocal.configure(bind=engine)
+    # Cached class codes refer to another test's database
+    class_codes.clear()
     
     session = SessionLocal()
     yield session
@@ -136,6 +171,55 @@ def sample_submission(db_session, sample_assignment, sample_student):
     return submission
 
 
+class QueryBudget:
+    """Context manager that fails the test when more than ``budget`` statements
+    are issued through ``engine`` inside the block."""
+
+    def __init__(self, engine, budget: int):
+        self.engine = engine
+        self.budget = budget
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+        if exc_type is None and len(self.statements) > self.budget:
+            pytest.fail(self.report(), pytrace=False)
+        return False
+
+    def report(self) -> str:
+        lines = [f"Query budget exceeded: {len(self.statements)} statements issued, budget is {self.budget}."]
+        for index, (statement, parameters) in enumerate(self.statements, 1):
+            lines.append(f"  {index}. {' '.join(statement.split())}  {parameters!r}")
+        return "\n".join(lines)
+
+
+@pytest.fixture
+def query_budget(request, db_session):
+    """Returns a factory for QueryBudget guards bound to the test database.
+
+    The budget can be passed directly, ``with query_budget(2): ...``, or set
+    for the whole test with ``@pytest.mark.query_budget(2)``.
+    """
+    marker = request.node.get_closest_marker("query_budget")
+    default_budget = marker.args[0] if marker else None
+    engine = db_session.get_bind()
+
+    def guard(budget=None):
+        budget = default_budget if budget is None else budget
+        if budget is None:
+            raise ValueError("No query budget given; pass one or use @pytest.mark.query_budget(n).")
+        return QueryBudget(engine, budget)
+
+    return guard
+
+
 @pytest.fixture
 def qt_app(app):
     """Ensure we have a QApplication instance (used by pytest-qt's qtbot)."""
@@ -152,4 +236,7 @@ def pytest_configure(config):
     )
     config.addinivalue_line(
         "markers", "ui: mark test as a UI test"
+    )
+    config.addinivalue_line(
+        "markers", "query_budget(n): maximum statements allowed inside a query_budget guard"
     )
\ No newline at end of file
@@ -11,13 +11,18 @@ from PySide6.QtWidgets import (
 )
 from classroom import Classroom
 from user import UserRole
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QCursor
 
+# How long the pointer must rest on a class card before its data is prefetched.
+HOVER_INTENT_DELAY_MS = 150
+
 
 class ClassCard(QWidget):
     """A card representing a single class in the dashboard."""
     clicked = Signal(int)
+    hover_started = Signal(int)
+    hover_ended = Signal(int)
 
     def __init__(self, classroom: Classroom, parent=None):
         super().__init__(parent)
@@ -58,11 +63,27 @@ class ClassCard(QWidget):
             self.clicked.emit(self.classroom_id)
         super().mousePressEvent(event)
 
+    def enterEvent(self, event):
+        self.hover_started.emit(self.classroom_id)
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        self.hover_ended.emit(self.classroom_id)
+        super().leaveEvent(event)
+
 
 class DashboardWindow(QWidget):
     """The main dashboard view showing a grid of classes."""
+    # Emitted once the pointer has rested on a card for HOVER_INTENT_DELAY_MS
+    class_prefetch_requested = Signal(int)
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._hovered_class_id = None
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(HOVER_INTENT_DELAY_MS)
+        self._hover_timer.timeout.connect(self._on_hover_intent)
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(30, 20, 30, 20)
@@ -105,8 +126,33 @@ class DashboardWindow(QWidget):
         self.create_class_button.setVisible(role == UserRole.teacher)
         self.join_class_button.setVisible(role == UserRole.student)
 
+    def add_class_card(self, classroom: Classroom) -> ClassCard:
+        """Adds a card for ``classroom`` after the existing ones and returns it."""
+        card = ClassCard(classroom)
+        card.hover_started.connect(self._on_card_hover_started)
+        card.hover_ended.connect(self._on_card_hover_ended)
+        count = self.grid_layout.count()
+        self.grid_layout.addWidget(card, count // 3, count % 3)
+        return card
+
+    def _on_card_hover_started(self, classroom_id: int):
+        self._hovered_class_id = classroom_id
+        self._hover_timer.start()
+
+    def _on_card_hover_ended(self, classroom_id: int):
+        # A pointer passing over a card on its way elsewhere does not count
+        if classroom_id == self._hovered_class_id:
+            self._hovered_class_id = None
+            self._hover_timer.stop()
+
+    def _on_hover_intent(self):
+        if self._hovered_class_id is not None:
+            self.class_prefetch_requested.emit(self._hovered_class_id)
+
     def clear_classes(self):
         """Removes all class cards from the grid layout."""
+        self._hovered_class_id = None
+        self._hover_timer.stop()
         while self.grid_layout.count():
             child = self.grid_layout.takeAt(0)
             if child.widget():
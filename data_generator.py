@@ -0,0 +1,235 @@
+"""
+Bulk synthetic data generator.
+
+Fills a database with users, classrooms, memberships, assignments,
+submissions and announcements using chunked Core ``insert()`` executemany
+batches, which skip the ORM unit of work entirely. Output is deterministic for a given ``--seed``.
+
+    python data_generator.py --db training.db --students 500 --classrooms 20
+    python data_generator.py --db bench.db --scale 1.0
+
+Every generated account shares one precomputed bcrypt hash of ``--password``.
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert, select
+
+from base import use_sqlite_profile
+from migrate import upgrade_database
+from user import User, UserRole
+from classroom import Classroom, student_classroom_association
+from assignment import Assignment
+from announcement import Announcement
+from submission import Submission
+
+# Row counts at scale 1.0 (a large school).
+SCALE_TARGETS = {
+    "teachers": 500,
+    "students": 19500,
+    "classrooms": 1000,
+    "classes_per_student": 5,
+    "assignments": 50000,
+    "submissions": 1000000,
+    "announcements": 200000,
+}
+DEFAULT_PASSWORD = "password"
+# Rows per executemany call; also the unit of generator buffering.
+CHUNK_SIZE = 5000
+
+
+class GeneratorConfig:
+    """Row counts for one generated database."""
+
+    def __init__(self, teachers, students, classrooms, classes_per_student, assignments, submissions,
+                 announcements, seed=1234, password=DEFAULT_PASSWORD):
+        self.teachers = teachers
+        self.students = students
+        self.classrooms = classrooms
+        self.classes_per_student = classes_per_student
+        self.assignments = assignments
+        self.submissions = submissions
+        self.announcements = announcements
+        self.seed = seed
+        self.password = password
+
+    @classmethod
+    def scaled(cls, scale: float, seed: int = 1234, password: str = DEFAULT_PASSWORD):
+        """Builds a config at ``scale`` times SCALE_TARGETS."""
+        counts = {name: max(1, int(value * scale)) for name, value in SCALE_TARGETS.items()}
+        counts["classes_per_student"] = SCALE_TARGETS["classes_per_student"]
+        return cls(seed=seed, password=password, **counts)
+
+
+def _insert_chunks(connection, table, rows, chunk_size: int = CHUNK_SIZE) -> int:
+    """Inserts ``rows`` (an iterable of dicts) in executemany batches; returns the row count.
+
+    The statement is compiled once and reused for every chunk, so the per-row
+    cost is parameter binding inside the driver.
+    """
+    statement = insert(table)
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            connection.execute(statement, chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        connection.execute(statement, chunk)
+        total += len(chunk)
+    return total
+
+
+def _unique_class_codes(rng, count: int) -> list:
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+    codes = set()
+    while len(codes) < count:
+        codes.add(''.join(rng.choice(alphabet) for _ in range(10)))
+    return sorted(codes)
+
+
+def generate(target_engine, config: GeneratorConfig, log=print) -> dict:
+    """Creates the schema on ``target_engine`` and fills it according to ``config``.
+
+    Returns the number of rows inserted per table. Each table is written in its
+    own transaction.
+    """
+    rng = random.Random(config.seed)
+    upgrade_database(target_engine)
+
+    # Hash once and reuse: bcrypt per user would dominate generation time.
+    template = User(email="template@example.com", role=UserRole.student)
+    template.set_password(config.password)
+    password_hash = template.password_hash
+    now = datetime.now(timezone.utc)
+    # Due dates are naive local times, as CreateAssignmentDialog produces and the Assignments view compares
+    local_now = datetime.now()
+    counts = {}
+
+    def step(name, fn):
+        start = time.perf_counter()
+        with target_engine.begin() as connection:
+            counts[name] = fn(connection)
+        log(f"  {name:<14} {counts[name]:>9} rows in {time.perf_counter() - start:.2f}s")
+
+    step("users", lambda connection: _insert_chunks(connection, User.__table__, (
+        {
+            "full_name": f"{role.value.title()} {i}",
+            "email": f"{role.value}{i}@school.test",
+            "password_hash": password_hash,
+            "role": role.name,
+        }
+        for role, n in ((UserRole.teacher, config.teachers), (UserRole.student, config.students))
+        for i in range(n)
+    )))
+
+    with target_engine.connect() as connection:
+        users = User.__table__
+        teacher_ids = connection.execute(
+            select(users.c.id).where(users.c.role == UserRole.teacher.name).order_by(users.c.id)).scalars().all()
+        student_ids = connection.execute(
+            select(users.c.id).where(users.c.role == UserRole.student.name).order_by(users.c.id)).scalars().all()
+
+    codes = _unique_class_codes(rng, config.classrooms)
+    step("classrooms", lambda connection: _insert_chunks(connection, Classroom.__table__, (
+        {"name": f"Course {i}", "section": f"S{i % 7}", "class_code": codes[i], "teacher_id": rng.choice(teacher_ids)}
+        for i in range(config.classrooms)
+    )))
+
+    with target_engine.connect() as connection:
+        classrooms = Classroom.__table__
+        class_rows = connection.execute(
+            select(classrooms.c.id, classrooms.c.teacher_id).order_by(classrooms.c.id)).all()
+    class_ids = [row.id for row in class_rows]
+    teacher_of = {row.id: row.teacher_id for row in class_rows}
+
+    rosters = {class_id: [] for class_id in class_ids}
+    per_student = min(config.classes_per_student, len(class_ids))
+
+    def memberships():
+        for student_id in student_ids:
+            for class_id in rng.sample(class_ids, per_student):
+                rosters[class_id].append(student_id)
+                yield {"user_id": student_id, "classroom_id": class_id}
+
+    step("memberships", lambda connection: _insert_chunks(connection, student_classroom_association, memberships()))
+
+    step("assignments", lambda connection: _insert_chunks(connection, Assignment.__table__, (
+        {
+            "title": f"Assignment {i}",
+            "instructions": "Answer every question.",
+            "due_date": local_now + timedelta(days=rng.randint(-365, 120)),
+            "points": 100,
+            "classroom_id": class_ids[i % len(class_ids)],
+        }
+        for i in range(config.assignments)
+    )))
+
+    with target_engine.connect() as connection:
+        assignments = Assignment.__table__
+        assignment_rows = connection.execute(
+            select(assignments.c.id, assignments.c.classroom_id).order_by(assignments.c.id)).all()
+    per_assignment = max(1, config.submissions // max(1, len(assignment_rows)))
+
+    def submissions():
+        for assignment_id, class_id in assignment_rows:
+            roster = rosters[class_id]
+            for student_id in rng.sample(roster, min(per_assignment, len(roster))):
+                yield {
+                    "content": f"/uploads/{assignment_id}/{student_id}.pdf",
+                    "timestamp": now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+                    "grade": round(rng.uniform(40, 100), 1) if rng.random() < 0.5 else None,
+                    "assignment_id": assignment_id,
+                    "student_id": student_id,
+                }
+
+    step("submissions", lambda connection: _insert_chunks(connection, Submission.__table__, submissions()))
+
+    step("announcements", lambda connection: _insert_chunks(connection, Announcement.__table__, (
+        {
+            "content": f"Announcement {i}",
+            "timestamp": now - timedelta(minutes=rng.randint(0, 60 * 24 * 730)),
+            "classroom_id": class_ids[i % len(class_ids)],
+            "author_id": teacher_of[class_ids[i % len(class_ids)]],
+        }
+        for i in range(config.announcements)
+    )))
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic classroom database.")
+    parser.add_argument("--db", required=True, help="SQLite file to create")
+    parser.add_argument("--scale", type=float, default=0.05, help="fraction of a 20k-user school (default 0.05)")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed (default 1234)")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="password shared by every generated account")
+    for name in SCALE_TARGETS:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, help=f"override the {name.replace('_', ' ')} count")
+    args = parser.parse_args(argv)
+
+    config = GeneratorConfig.scaled(args.scale, args.seed, args.password)
+    for name in SCALE_TARGETS:
+        value = getattr(args, name)
+        if value is not None:
+            setattr(config, name, value)
+
+    target_engine = create_engine(f"sqlite:///{args.db}")
+    use_sqlite_profile("bulk_load", target_engine)
+    print(f"Generating {args.db} (seed {config.seed}):")
+    start = time.perf_counter()
+    try:
+        generate(target_engine, config)
+    finally:
+        target_engine.dispose()
+    print(f"Done in {time.perf_counter() - start:.1f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
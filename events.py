@@ -0,0 +1,116 @@
+"""
+In-process domain events.
+
+Controller work stages an event on its session with ``stage_event(db, ...)``
+next to the write it describes. An ``after_commit`` hook hands the staged
+events to ``event_bus`` once the transaction is durable; a transaction that
+ends any other way (rollback, or a session closed after an error) throws
+them away. The bus delivers on the GUI thread, so subscribers can update
+widgets in place instead of re-querying:
+
+    event_bus.subscribe(AssignmentCreated, classwork_view.insert_assignment)
+
+Payloads are small value objects, not ORM instances, so they are safe to
+pass between threads and to keep after the session is gone.
+"""
+from PySide6.QtCore import QObject, Signal, Slot
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING_KEY = "pending_events"
+
+
+class DomainEvent:
+    """Base for events; fields are listed in ``__slots__``."""
+
+    __slots__ = ()
+
+    def __init__(self, *values, **named):
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+        for field, value in named.items():
+            setattr(self, field, value)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class AssignmentCreated(DomainEvent):
+    """Named like the Assignment columns so item widgets can render it directly."""
+    __slots__ = ("id", "classroom_id", "title", "due_date", "points")
+
+
+class GradeChanged(DomainEvent):
+    __slots__ = ("submission_id", "assignment_id", "student_id", "old_grade", "new_grade")
+
+
+class StudentJoined(DomainEvent):
+    __slots__ = ("classroom_id", "id", "email")
+
+
+class AnnouncementPosted(DomainEvent):
+    """Named like the Announcement columns so the stream can render it directly."""
+    __slots__ = ("id", "classroom_id", "content", "timestamp", "author_email")
+
+
+class EventBus(QObject):
+    """Delivers committed events to subscribers, by event type, on the thread that owns the bus."""
+
+    _committed = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._subscribers = {}
+        # Emitted from worker threads after commit; queued onto the GUI thread
+        self._committed.connect(self._deliver)
+
+    def subscribe(self, event_type, callback):
+        self._subscribers.setdefault(event_type, []).append(callback)
+
+    def unsubscribe(self, event_type, callback):
+        callbacks = self._subscribers.get(event_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def clear(self):
+        """Drops every subscriber."""
+        self._subscribers.clear()
+
+    def publish(self, events: list):
+        """Queues ``events`` (from one commit) for delivery, in order."""
+        if events:
+            self._committed.emit(list(events))
+
+    @Slot(object)
+    def _deliver(self, events):
+        for domain_event in events:
+            for callback in list(self._subscribers.get(type(domain_event), ())):
+                try:
+                    callback(domain_event)
+                except Exception as e:
+                    print(f"Error: {type(domain_event).__name__} subscriber failed: {e!r}")
+
+
+event_bus = EventBus()
+
+
+def stage_event(session, domain_event: DomainEvent):
+    """Publishes ``domain_event`` when ``session`` next commits; drops it on rollback."""
+    session.info.setdefault(_PENDING_KEY, []).append(domain_event)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_staged(session):
+    event_bus.publish(session.info.pop(_PENDING_KEY, None))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_staged(session, transaction):
+    # Runs after after_commit, so anything still pending was rolled back or closed
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
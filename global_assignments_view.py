@@ -5,8 +5,9 @@ from PySide6.QtWidgets import (
     QScrollArea,
     QFrame,
     QHBoxLayout,
+    QPushButton,
 )
-from PySide6.QtCore import Qt, Slot
+from PySide6.QtCore import Qt, Signal, Slot
 
 
 class GlobalAssignmentItem(QFrame):
@@ -38,9 +39,21 @@ class GlobalAssignmentItem(QFrame):
 
 
 class GlobalAssignmentsView(QWidget):
-    """A view showing all assignments for a user across all classes."""
+    """A view showing a user's assignments across all classes.
+
+    It opens on the first page of the upcoming window (due now or later, plus
+    undated work) and loads earlier and later assignments a page at a time
+    from "Show earlier" and "Show later".
+    """
+    earlier_assignments_requested = Signal(object, object)  # due_before, before_id
+    later_assignments_requested = Signal(object, object)  # due_after, after_id
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.window_start = None
+        self._earlier_cursor = (None, None)  # (due date, id) the next earlier page ends before
+        self._later_cursor = (None, None)  # (due date, id) the next later page starts after
+
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(30, 20, 30, 20)
 
@@ -48,6 +61,12 @@ class GlobalAssignmentsView(QWidget):
         title.setStyleSheet("font-size: 28px; font-weight: 500;")
         main_layout.addWidget(title)
 
+        self.show_earlier_button = QPushButton("Show earlier")
+        self.show_earlier_button.setFixedWidth(140)
+        self.show_earlier_button.clicked.connect(self._on_show_earlier_clicked)
+        self.show_earlier_button.hide()
+        main_layout.addWidget(self.show_earlier_button, alignment=Qt.AlignLeft)
+
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setStyleSheet("QScrollArea { border: none; }")
@@ -60,9 +79,19 @@ class GlobalAssignmentsView(QWidget):
         scroll_area.setWidget(container)
         main_layout.addWidget(scroll_area)
 
+        self.show_later_button = QPushButton("Show later")
+        self.show_later_button.setFixedWidth(140)
+        self.show_later_button.clicked.connect(self._on_show_later_clicked)
+        self.show_later_button.hide()
+        main_layout.addWidget(self.show_later_button, alignment=Qt.AlignLeft)
+
+    def set_window_start(self, window_start):
+        """Records where the upcoming window begins; earlier pages end there."""
+        self.window_start = window_start
+
     @Slot(list)
-    def display_assignments(self, assignments: list):
-        """Clears and populates the view with assignment items."""
+    def display_assignments(self, assignments: list, has_more: bool = False):
+        """Clears and populates the view with assignment items; ``has_more`` offers "Show later"."""
         while self.assignments_layout.count():
             child = self.assignments_layout.takeAt(0)
             if child.widget():
@@ -70,4 +99,37 @@ class GlobalAssignmentsView(QWidget):
 
         for asn in assignments:
             item = GlobalAssignmentItem(asn)
-            self.assignments_layout.addWidget(item)
\ No newline at end of file
+            self.assignments_layout.addWidget(item)
+
+        self._earlier_cursor = (self.window_start, None)
+        self.show_earlier_button.setVisible(self.window_start is not None)
+        self._set_later_cursor(assignments, has_more)
+
+    @Slot(list, bool)
+    def prepend_assignments(self, assignments: list, has_more: bool):
+        """Adds a page of earlier assignments, given latest due first, above the list."""
+        for asn in assignments:
+            self.assignments_layout.insertWidget(0, GlobalAssignmentItem(asn))
+        if assignments:
+            self._earlier_cursor = (assignments[-1].due_date, assignments[-1].id)
+        self.show_earlier_button.setVisible(has_more)
+
+    @Slot(list, bool)
+    def append_assignments(self, assignments: list, has_more: bool):
+        """Adds a page of later assignments, given soonest due first, below the list."""
+        for asn in assignments:
+            self.assignments_layout.addWidget(GlobalAssignmentItem(asn))
+        self._set_later_cursor(assignments, has_more)
+
+    def _set_later_cursor(self, assignments: list, has_more: bool):
+        if assignments:
+            self._later_cursor = (assignments[-1].due_date, assignments[-1].id)
+        self.show_later_button.setVisible(has_more)
+
+    def _on_show_earlier_clicked(self):
+        self.show_earlier_button.hide()
+        self.earlier_assignments_requested.emit(*self._earlier_cursor)
+
+    def _on_show_later_clicked(self):
+        self.show_later_button.hide()
+        self.later_assignments_requested.emit(*self._later_cursor)
\ No newline at end of file
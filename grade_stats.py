@@ -0,0 +1,88 @@
+"""
+Per-assignment grade statistics that update in place.
+
+``GradeStats`` keeps a running mean and variance (Welford's method, which
+also supports removing a value), a sorted copy of the grades for the median
+and percentiles, and histogram bin counts. Replacing one grade costs a
+binary search and a list insert instead of re-reading the whole column.
+"""
+import math
+from bisect import bisect_left, insort
+
+HISTOGRAM_BINS = 10
+# Upper end of the histogram for assignments without a points value.
+DEFAULT_POINTS = 100
+
+
+class GradeStats:
+    """Running statistics over the graded submissions of one assignment."""
+
+    def __init__(self, assignment_id, points=None, grades=()):
+        self.assignment_id = assignment_id
+        self.points = points or DEFAULT_POINTS
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._sorted = []
+        self.histogram = [0] * HISTOGRAM_BINS
+        for grade in grades:
+            self.add(grade)
+
+    def _bin(self, grade: float) -> int:
+        # Grades above the assignment's points (extra credit) share the top bin
+        return min(int(grade / self.points * HISTOGRAM_BINS), HISTOGRAM_BINS - 1)
+
+    def add(self, grade: float):
+        self.count += 1
+        delta = grade - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (grade - self.mean)
+        insort(self._sorted, grade)
+        self.histogram[self._bin(grade)] += 1
+
+    def remove(self, grade: float):
+        """Removes one occurrence of ``grade``; raises ValueError if it is not present."""
+        index = bisect_left(self._sorted, grade)
+        if index == len(self._sorted) or self._sorted[index] != grade:
+            raise ValueError(f"grade {grade!r} is not in the statistics")
+        del self._sorted[index]
+        self.histogram[self._bin(grade)] -= 1
+        if self.count == 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        mean_without = (self.count * self.mean - grade) / (self.count - 1)
+        self._m2 -= (grade - self.mean) * (grade - mean_without)
+        self.count -= 1
+        self.mean = mean_without
+
+    def replace(self, old_grade, new_grade):
+        """Applies one grade change; either side may be None (ungraded)."""
+        if old_grade is not None:
+            self.remove(old_grade)
+        if new_grade is not None:
+            self.add(new_grade)
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation; NaN without grades."""
+        if not self.count:
+            return math.nan
+        return math.sqrt(max(self._m2, 0.0) / self.count)
+
+    @property
+    def median(self) -> float:
+        return self.percentile(50)
+
+    def percentile(self, pct: float) -> float:
+        """Linearly interpolated percentile; NaN without grades."""
+        if not self._sorted:
+            return math.nan
+        rank = pct / 100 * (len(self._sorted) - 1)
+        low = math.floor(rank)
+        high = min(low + 1, len(self._sorted) - 1)
+        return self._sorted[low] + (self._sorted[high] - self._sorted[low]) * (rank - low)
+
+    def bin_edges(self) -> list:
+        """The HISTOGRAM_BINS + 1 edges of the histogram, from 0 to the assignment's points."""
+        width = self.points / HISTOGRAM_BINS
+        return [i * width for i in range(HISTOGRAM_BINS + 1)]
@@ -0,0 +1,87 @@
+from PySide6.QtCore import QObject, Signal, Slot
+from sqlalchemy import select
+
+from base import db_executor
+from assignment import Assignment
+from events import GradeChanged
+from submission import Submission
+from grade_stats import GradeStats
+
+
+class GradeStatsController(QObject):
+    """Loads and caches per-assignment grade statistics.
+
+    A cached assignment is never re-queried: committed GradeChanged events
+    (see ``subscribe``) are applied to it in place.
+    """
+
+    stats_updated = Signal(object)  # GradeStats
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cache = {}
+        self._loading = set()
+        self._stale = set()
+
+    def cached(self, assignment_id: int):
+        return self._cache.get(assignment_id)
+
+    @Slot(int)
+    def get_stats(self, assignment_id: int):
+        """Emits the assignment's statistics, loading its grade column on first use."""
+        stats = self._cache.get(assignment_id)
+        if stats is not None:
+            self.stats_updated.emit(stats)
+            return
+        if assignment_id in self._loading:
+            return
+        self._loading.add(assignment_id)
+
+        def work(db):
+            points = db.execute(select(Assignment.points).where(Assignment.id == assignment_id)).scalar()
+            grades = db.execute(
+                select(Submission.grade)
+                .where(Submission.assignment_id == assignment_id, Submission.grade.is_not(None))
+            ).scalars()
+            return GradeStats(assignment_id, points, grades)
+
+        db_executor.submit(work, self._on_stats_loaded, lambda e: self._loading.discard(assignment_id))
+
+    def _on_stats_loaded(self, stats):
+        self._loading.discard(stats.assignment_id)
+        if stats.assignment_id in self._stale:
+            # A grade changed while the column was being read; it may or may not be included
+            self._stale.discard(stats.assignment_id)
+            self.get_stats(stats.assignment_id)
+            return
+        self._cache[stats.assignment_id] = stats
+        self.stats_updated.emit(stats)
+
+    def subscribe(self, bus):
+        """Follows committed grade changes published on ``bus``."""
+        bus.subscribe(GradeChanged, self.apply_grade_change)
+
+    def apply_grade_change(self, event: GradeChanged):
+        """Folds one committed grade change into the cached stats of its assignment."""
+        assignment_id = event.assignment_id
+        if assignment_id in self._loading:
+            self._stale.add(assignment_id)
+            return
+        stats = self._cache.get(assignment_id)
+        if stats is None or event.old_grade == event.new_grade:
+            return
+        try:
+            stats.replace(event.old_grade, event.new_grade)
+        except ValueError:
+            # Out of step with the database: drop it and read the column again
+            del self._cache[assignment_id]
+            self.get_stats(assignment_id)
+            return
+        self.stats_updated.emit(stats)
+
+    def invalidate(self, assignment_id=None):
+        """Forgets one assignment's statistics, or all of them."""
+        if assignment_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(assignment_id, None)
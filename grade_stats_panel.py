@@ -0,0 +1,93 @@
+import math
+
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QLabel, QWidget, QGridLayout
+from PySide6.QtCore import Qt, QRectF, Slot
+from PySide6.QtGui import QPainter, QColor
+
+
+class HistogramWidget(QWidget):
+    """Draws grade bin counts as bars."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.counts = []
+        self.setMinimumHeight(80)
+
+    def set_counts(self, counts: list):
+        self.counts = list(counts)
+        self.update()
+
+    def paintEvent(self, event):
+        if not self.counts:
+            return
+        painter = QPainter(self)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#8AB4F8"))
+        tallest = max(self.counts) or 1
+        width = self.width() / len(self.counts)
+        for i, count in enumerate(self.counts):
+            height = (self.height() - 2) * count / tallest
+            painter.drawRect(QRectF(i * width + 1, self.height() - height, width - 2, height))
+        painter.end()
+
+
+class GradeStatsPanel(QFrame):
+    """A panel summarising the grades given on one assignment."""
+
+    FIELDS = (("Graded", "count"), ("Mean", "mean"), ("Median", "median"), ("Std dev", "std"),
+              ("25th pct", "p25"), ("75th pct", "p75"), ("90th pct", "p90"))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("LoginCard") # Reuse card style
+        self.setFixedWidth(220)
+        self.assignment_id = None
+
+        layout = QVBoxLayout(self)
+        title_label = QLabel("Grade Statistics")
+        title_label.setStyleSheet("font-size: 16px; font-weight: 500;")
+        layout.addWidget(title_label)
+
+        grid = QGridLayout()
+        self.value_labels = {}
+        for row, (caption, key) in enumerate(self.FIELDS):
+            caption_label = QLabel(caption)
+            caption_label.setStyleSheet("font-size: 13px; color: #9AA0A6;")
+            value_label = QLabel("–")
+            value_label.setAlignment(Qt.AlignRight)
+            grid.addWidget(caption_label, row, 0)
+            grid.addWidget(value_label, row, 1)
+            self.value_labels[key] = value_label
+        layout.addLayout(grid)
+
+        self.histogram = HistogramWidget()
+        layout.addWidget(self.histogram)
+        self.range_label = QLabel("")
+        self.range_label.setStyleSheet("font-size: 12px; color: #9AA0A6;")
+        layout.addWidget(self.range_label)
+        layout.addStretch()
+
+    def clear(self, assignment_id=None):
+        """Resets the panel while statistics for ``assignment_id`` load."""
+        self.assignment_id = assignment_id
+        for label in self.value_labels.values():
+            label.setText("–")
+        self.histogram.set_counts([])
+        self.range_label.setText("")
+
+    @Slot(object)
+    def display_stats(self, stats):
+        """Shows a GradeStats snapshot."""
+        self.assignment_id = stats.assignment_id
+        values = {
+            "count": stats.count, "mean": stats.mean if stats.count else math.nan, "median": stats.median,
+            "std": stats.std, "p25": stats.percentile(25), "p75": stats.percentile(75), "p90": stats.percentile(90),
+        }
+        for key, value in values.items():
+            if key == "count":
+                text = str(value)
+            else:
+                text = "–" if math.isnan(value) else f"{value:.1f}"
+            self.value_labels[key].setText(text)
+        self.histogram.set_counts(stats.histogram)
+        self.range_label.setText(f"0 – {stats.points:g} points")
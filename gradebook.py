@@ -0,0 +1,97 @@
+"""
+Classroom gradebook: students × assignments grades in a flat ``array('d')``.
+
+Missing grades (no submission, or not graded yet) are NaN. The matrix is
+row-major, so ``grades[row * columns + column]`` is one student's grade for
+one assignment.
+"""
+import math
+from array import array
+
+from sqlalchemy import select
+
+from assignment import Assignment
+from classroom import student_classroom_association
+from submission import Submission
+from user import User
+
+MISSING = math.nan
+
+
+class Gradebook:
+    """Grades for every student and assignment of one classroom."""
+
+    __slots__ = ("classroom_id", "students", "assignments", "grades", "_rows", "_columns")
+
+    def __init__(self, classroom_id, students, assignments):
+        """``students`` are (id, email) pairs; ``assignments`` are (id, title, points) triples."""
+        self.classroom_id = classroom_id
+        self.students = students
+        self.assignments = assignments
+        self.grades = array('d', [MISSING]) * (len(students) * len(assignments))
+        self._rows = {student_id: row for row, (student_id, _) in enumerate(students)}
+        self._columns = {assignment_id: column for column, (assignment_id, _, _) in enumerate(assignments)}
+
+    @property
+    def row_count(self) -> int:
+        return len(self.students)
+
+    @property
+    def column_count(self) -> int:
+        return len(self.assignments)
+
+    def row_of(self, student_id):
+        return self._rows.get(student_id)
+
+    def column_of(self, assignment_id):
+        return self._columns.get(assignment_id)
+
+    def grade(self, row: int, column: int) -> float:
+        """Returns the grade at (row, column); NaN when missing."""
+        return self.grades[row * len(self.assignments) + column]
+
+    def set_grade(self, student_id, assignment_id, grade) -> bool:
+        """Stores a grade by ids; returns False if either is not in the gradebook."""
+        row, column = self._rows.get(student_id), self._columns.get(assignment_id)
+        if row is None or column is None:
+            return False
+        self.grades[row * len(self.assignments) + column] = MISSING if grade is None else grade
+        return True
+
+    def column(self, column: int) -> list:
+        """Returns one assignment's grades, NaN included, in row order."""
+        return list(self.grades[column::len(self.assignments)]) if self.assignments else []
+
+
+def load_gradebook(db, classroom_id: int) -> Gradebook:
+    """Builds the gradebook for ``classroom_id``.
+
+    The roster and assignment headers are two narrow selects; every grade in
+    the class then arrives from a single join of submissions to assignments.
+    """
+    membership = student_classroom_association
+    users = User.__table__
+    assignments = Assignment.__table__
+    submissions = Submission.__table__
+
+    students = db.execute(
+        select(users.c.id, users.c.email)
+        .join(membership, membership.c.user_id == users.c.id)
+        .where(membership.c.classroom_id == classroom_id)
+        .order_by(users.c.email)
+    ).all()
+    columns = db.execute(
+        select(assignments.c.id, assignments.c.title, assignments.c.points)
+        .where(assignments.c.classroom_id == classroom_id)
+        .order_by(assignments.c.due_date.asc().nulls_last(), assignments.c.id)
+    ).all()
+    gradebook = Gradebook(classroom_id, [tuple(row) for row in students], [tuple(row) for row in columns])
+
+    graded = db.execute(
+        select(submissions.c.student_id, submissions.c.assignment_id, submissions.c.grade)
+        .join(assignments, assignments.c.id == submissions.c.assignment_id)
+        .where(assignments.c.classroom_id == classroom_id, submissions.c.grade.is_not(None))
+    )
+    for student_id, assignment_id, grade in graded:
+        gradebook.set_grade(student_id, assignment_id, grade)
+    return gradebook
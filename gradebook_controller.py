@@ -0,0 +1,18 @@
+from PySide6.QtCore import QObject, Signal, Slot
+
+from base import db_executor
+from gradebook import load_gradebook
+
+
+class GradebookController(QObject):
+    """Handles loading classroom gradebooks."""
+
+    gradebook_fetched = Signal(object)  # Gradebook
+
+    @Slot(int)
+    def get_gradebook(self, classroom_id: int):
+        """Fetches the students × assignments grade matrix for a classroom."""
+        def work(db):
+            return load_gradebook(db, classroom_id)
+
+        db_executor.submit(work, self.gradebook_fetched.emit)
@@ -0,0 +1,92 @@
+import math
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableView, QHeaderView
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Slot
+
+
+class GradebookTableModel(QAbstractTableModel):
+    """Exposes a Gradebook to Qt views without copying its grades."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._gradebook = None
+
+    def set_gradebook(self, gradebook):
+        self.beginResetModel()
+        self._gradebook = gradebook
+        self.endResetModel()
+
+    def apply_grade(self, student_id, assignment_id, grade):
+        """Updates one cell in place; ignored when the gradebook does not have it."""
+        if self._gradebook is None or not self._gradebook.set_grade(student_id, assignment_id, grade):
+            return
+        index = self.index(self._gradebook.row_of(student_id), self._gradebook.column_of(assignment_id))
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self._gradebook is None:
+            return 0
+        return self._gradebook.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self._gradebook is None:
+            return 0
+        return self._gradebook.column_count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            grade = self._gradebook.grade(index.row(), index.column())
+            return "" if math.isnan(grade) else f"{grade:g}"
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or self._gradebook is None:
+            return None
+        if orientation == Qt.Horizontal:
+            _, title, points = self._gradebook.assignments[section]
+            return f"{title}\n/{points}" if points else title
+        return self._gradebook.students[section][1]
+
+
+class GradebookView(QWidget):
+    """The view for the 'Grades' tab: every student's grade on every assignment."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet("font-size: 13px; color: #9AA0A6;")
+        layout.addWidget(self.summary_label)
+
+        self.model = GradebookTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setAlternatingRowColors(True)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        # Fixed section sizes keep Qt from measuring every row and column of a large class
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setDefaultSectionSize(90)
+        layout.addWidget(self.table)
+
+    @Slot(object)
+    def display_gradebook(self, gradebook):
+        """Shows a freshly loaded gradebook."""
+        self.model.set_gradebook(gradebook)
+        self.summary_label.setText(
+            f"{gradebook.row_count} students × {gradebook.column_count} assignments" if gradebook else "")
+
+    def apply_grade(self, student_id, assignment_id, grade):
+        """Shows a grade saved while the gradebook is open."""
+        self.model.apply_grade(student_id, assignment_id, grade)
+
+    def clear_view(self):
+        """Removes the current gradebook."""
+        self.model.set_gradebook(None)
+        self.summary_label.setText("")
@@ -7,9 +7,12 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QLineEdit,
 )
-from PySide6.QtCore import Qt, Slot, Signal
+from PySide6.QtCore import Qt, Slot, Signal, QTimer
 from PySide6.QtGui import QDoubleValidator
 
+# Edits made within this window are saved together in one batch.
+GRADE_FLUSH_DELAY_MS = 800
+
 
 class StudentSubmissionItem(QFrame):
     """A widget showing a single student's submission status and grade input."""
@@ -39,11 +42,25 @@ class StudentSubmissionItem(QFrame):
         if submission and submission.grade is not None:
             self.grade_input.setText(str(submission.grade))
 
+        self.save_state_label = QLabel("")
+        self.save_state_label.setStyleSheet("font-size: 12px; color: #9AA0A6;")
+
         layout.addWidget(student_label)
         layout.addStretch()
         layout.addWidget(status_label)
+        layout.addWidget(self.save_state_label)
         layout.addWidget(self.grade_input)
 
+    def set_save_state(self, state: str):
+        """Shows whether the row's grade is "pending", "saved" or "failed"."""
+        text, style = {
+            "pending": ("Saving…", ""),
+            "saved": ("Saved", ""),
+            "failed": ("Not saved", "border: 1px solid #E53E3E;"),
+        }[state]
+        self.save_state_label.setText(text)
+        self.grade_input.setStyleSheet(style)
+
     def _on_grade_entered(self):
         """Emits a signal when the teacher finishes editing a grade."""
         if self.submission: # Only emit if there is a submission to grade
@@ -51,8 +68,14 @@ class StudentSubmissionItem(QFrame):
 
 
 class GradingPanel(QFrame):
-    """A panel for teachers to view and grade all submissions."""
+    """A panel for teachers to view and grade all submissions.
+
+    Each valid edit is announced on ``grade_submission_requested`` and queued;
+    the queue is flushed as one ``grade_batch_requested`` list of
+    (submission_id, grade) pairs once edits pause for GRADE_FLUSH_DELAY_MS.
+    """
     grade_submission_requested = Signal(int, float)
+    grade_batch_requested = Signal(list)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -76,22 +99,78 @@ class GradingPanel(QFrame):
         scroll_area.setWidget(self.submissions_container)
         layout.addWidget(scroll_area)
 
+        self._submissions_by_student_id = {}
+        self._items_by_submission_id = {}
+        self._pending_grades = {}
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(GRADE_FLUSH_DELAY_MS)
+        self._flush_timer.timeout.connect(self.flush_grades)
+
     @Slot(list, list)
     def display_submissions(self, all_students: list, submissions: list):
-        """Populates the panel with all students and their submission status."""
+        """Populates the panel with the students loaded so far and their submission status.
+
+        Students are expected in roster order (by email); later roster pages
+        are added with append_students.
+        """
+        self.flush_grades() # Don't lose edits made to the previous assignment
+        self._items_by_submission_id = {}
         # Clear existing items
         while self.submissions_layout.count():
             child = self.submissions_layout.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
 
-        submissions_by_student_id = {s.student_id: s for s in submissions}
+        self._submissions_by_student_id = {s.student_id: s for s in submissions}
+        self.append_students(all_students)
 
-        for student in sorted(all_students, key=lambda s: s.email):
-            submission = submissions_by_student_id.get(student.id)
+    @Slot(list)
+    def append_students(self, students: list):
+        """Adds a row for each student in the next roster page."""
+        for student in students:
+            submission = self._submissions_by_student_id.get(student.id)
             item = StudentSubmissionItem(student, submission)
             item.grade_entered.connect(self._handle_grade_entered)
             self.submissions_layout.addWidget(item)
+            if submission:
+                self._items_by_submission_id[submission.id] = item
+
+    def flush_grades(self):
+        """Sends every queued grade as one batch."""
+        self._flush_timer.stop()
+        if self._pending_grades:
+            batch = list(self._pending_grades.items())
+            self._pending_grades = {}
+            self.grade_batch_requested.emit(batch)
+
+    @Slot(list)
+    def mark_grades_saved(self, grades: list):
+        """Marks the rows of committed (submission_id, grade) pairs as saved."""
+        for submission_id, grade in grades:
+            item = self._items_by_submission_id.get(submission_id)
+            if item is not None and submission_id not in self._pending_grades:
+                item.set_save_state("saved")
+
+    @Slot(list, str)
+    def mark_grades_failed(self, submission_ids: list, reason: str = ""):
+        """Marks the rows of a batch that could not be saved."""
+        for submission_id in submission_ids:
+            item = self._items_by_submission_id.get(submission_id)
+            if item is not None and submission_id not in self._pending_grades:
+                item.set_save_state("failed")
+
+    def _queue_grade(self, submission_id: int, grade: float):
+        self._pending_grades[submission_id] = grade
+        item = self._items_by_submission_id.get(submission_id)
+        if item is not None:
+            item.set_save_state("pending")
+        self._flush_timer.start() # Restart the debounce window
+
+    def hideEvent(self, event):
+        self.flush_grades()
+        super().hideEvent(event)
 
     def _handle_grade_entered(self, submission_id: int, grade_text: str):
         """Converts grade text to float and emits the final signal."""
@@ -103,6 +182,7 @@ class GradingPanel(QFrame):
             # Clamp grade to valid range
             grade = max(0.0, min(10000.0, grade))
             self.grade_submission_requested.emit(submission_id, grade)
+            self._queue_grade(submission_id, grade)
         except ValueError:
             # Reset the input to show error state
             for i in range(self.submissions_layout.count()):
@@ -8,6 +8,8 @@ from PySide6.QtWidgets import (
     QSpacerItem,
     QSizePolicy,
     QGraphicsDropShadowEffect,
+    QProgressBar,
+    QCheckBox,
 )
 from PySide6.QtCore import Qt, Signal
 
@@ -54,8 +56,19 @@ class LoginWindow(QWidget):
         self.password_input.setPlaceholderText("Password")
         self.password_input.setEchoMode(QLineEdit.Password)
 
+        # Opt-in: keeps a session token on this device so the next launch skips the login
+        self.remember_me_checkbox = QCheckBox("Remember me")
+
         self.login_button = QPushButton("Log In")
         self.login_button.clicked.connect(self._on_login_clicked)
+        self.password_input.returnPressed.connect(self._on_login_clicked)
+
+        # Indeterminate bar shown while the password is being checked
+        self.spinner = QProgressBar()
+        self.spinner.setRange(0, 0)
+        self.spinner.setTextVisible(False)
+        self.spinner.setFixedHeight(4)
+        self.spinner.hide()
 
         self.go_to_signup_button = QPushButton("Don't have an account? Sign Up")
         self.go_to_signup_button.setObjectName("LinkButton")
@@ -67,15 +80,31 @@ class LoginWindow(QWidget):
         card_layout.addSpacing(20)
         card_layout.addWidget(self.email_input)
         card_layout.addWidget(self.password_input)
+        card_layout.addWidget(self.remember_me_checkbox)
         card_layout.addSpacing(10)
         card_layout.addWidget(self.login_button)
+        card_layout.addWidget(self.spinner)
         card_layout.addWidget(self.go_to_signup_button)
         card_layout.addStretch()
 
         main_layout.addWidget(card_widget)
         main_layout.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
 
+    def set_busy(self, busy: bool):
+        """Shows the spinner and locks the form while a login is in flight."""
+        self.spinner.setVisible(busy)
+        self.login_button.setText("Logging in..." if busy else "Log In")
+        for widget in (self.email_input, self.password_input, self.remember_me_checkbox,
+                       self.login_button, self.go_to_signup_button):
+            widget.setEnabled(not busy)
+
+    def is_busy(self) -> bool:
+        return not self.login_button.isEnabled()
+
     def _on_login_clicked(self):
+        if self.is_busy():
+            return
         email = self.email_input.text()
         password = self.password_input.text()
-        self.login_attempt.emit(email, password)
\ No newline at end of file
+        self.set_busy(True)
+        self.login_attempt.emit(email, password)
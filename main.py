@@ -1,4 +1,6 @@
+import os
 import sys
+from datetime import datetime
 
 from PySide6.QtWidgets import (
     QApplication,
@@ -17,9 +19,10 @@ from PySide6.QtCore import Slot
 
 from login_window import LoginWindow
 from signup_window import SignupWindow
-from dashboard_window import DashboardWindow, ClassCard
+from dashboard_window import DashboardWindow
 from class_window import ClassWindow
 from join_class_dialog import JoinClassDialog
+from roster_import_dialog import RosterImportDialog
 from assignment_window import AssignmentWindow
 from settings_view import SettingsView
 from global_assignments_view import GlobalAssignmentsView
@@ -31,11 +34,20 @@ from theme import ThemeManager
 from auth_controller import AuthController
 from classroom_controller import ClassroomController
 from announcement_controller import AnnouncementController
-from assignment_controller import AssignmentController
+from assignment_controller import AssignmentController, UPCOMING_ASSIGNMENTS_PAGE_SIZE
 from settings_controller import SettingsController
+from session_controller import SessionController
 from submission_controller import SubmissionController
 from people_controller import PeopleController
-from base import Base, engine, SessionLocal
+from gradebook_controller import GradebookController
+from grade_stats_controller import GradeStatsController
+from class_bundle_controller import ClassBundleController
+from view_cache import ViewCache, fingerprint
+from class_prefetcher import ClassPrefetcher, PART_VIEWS
+from events import event_bus, AssignmentCreated, AnnouncementPosted, StudentJoined, GradeChanged
+from base import engine, db_executor, hash_executor, active_sqlite_profile, active_pragmas
+import query_stats
+from migrate import upgrade_database
 from classroom import Classroom
 from user import User, UserRole
 from assignment import Assignment
@@ -73,7 +85,16 @@ class MainWindow(QMainWindow):
         self.announcement_controller = AnnouncementController()
         self.assignment_controller = AssignmentController()
         self.people_controller = PeopleController()
+        self.gradebook_controller = GradebookController()
+        self.class_bundle_controller = ClassBundleController()
+        # What the class and assignments views last showed, served while revalidating
+        self.view_cache = ViewCache()
+        self.class_prefetcher = ClassPrefetcher(self.class_bundle_controller, self.view_cache)
+        self._assignments_request = None  # (user id, window start) of the pending global assignments load
+        self._assignments_shown = None  # (user id, fingerprint) of the global assignments on screen
+        self.grade_stats_controller = GradeStatsController()
         self.settings_controller = SettingsController()
+        self.session_controller = SessionController()
         self.submission_controller = SubmissionController()
 
         # The main layout will contain the sidebar and the content stack
@@ -105,38 +126,76 @@ class MainWindow(QMainWindow):
         self.login_view.show_signup_requested.connect(lambda: self.pre_login_stack.setCurrentWidget(self.signup_view))
         self.signup_view.signup_attempt.connect(self.auth_controller.signup)
         self.signup_view.show_login_requested.connect(lambda: self.pre_login_stack.setCurrentWidget(self.login_view))
-        self.auth_controller.login_successful.connect(self.on_login_successful)
+        self.auth_controller.login_successful.connect(self.on_credentials_accepted)
         self.auth_controller.login_failed.connect(self.on_login_failed)
         self.auth_controller.signup_successful.connect(self.on_signup_successful)
         self.auth_controller.signup_failed.connect(self.on_signup_failed)
         self.classroom_controller.class_created.connect(self.on_class_created)
         self.classroom_controller.class_joined.connect(self.on_class_joined)
         self.classroom_controller.join_class_failed.connect(self.on_join_class_failed)        
-        self.assignment_controller.class_assignments_fetched.connect(self.class_view.classwork_tab.display_assignments)
-        self.assignment_controller.assignment_created.connect(lambda: self.assignment_controller.get_assignments_for_class(self.class_view.current_class_id))
         self.submission_controller.submission_fetched.connect(self.assignment_view.submission_panel.update_submission_status)
         self.submission_controller.submission_updated.connect(self.assignment_view.submission_panel.update_submission_status)
         self.submission_controller.all_submissions_fetched.connect(self.on_all_submissions_fetched)
-        self.announcement_controller.announcements_fetched.connect(self.class_view.stream_tab.display_announcements)
-        self.announcement_controller.announcement_created.connect(self.class_view.stream_tab.add_announcement_card)
+        self.people_controller.roster_page_fetched.connect(self.on_roster_page_fetched)
+        self.people_controller.roster_synced.connect(self.on_roster_synced)
+        self.people_controller.roster_sync_failed.connect(
+            lambda reason: QMessageBox.warning(self, "Import Failed", reason))
+        self.class_view.people_tab.import_roster_requested.connect(self.open_roster_import_dialog)
+        self.class_view.gradebook_requested.connect(self.gradebook_controller.get_gradebook)
+        self.gradebook_controller.gradebook_fetched.connect(self.on_gradebook_fetched)
+        self.announcement_controller.more_announcements_fetched.connect(self.on_more_announcements_fetched)
         self.dashboard_view.create_class_button.clicked.connect(self.open_create_class_dialog)
         self.settings_view.save_requested.connect(self.save_settings)
         self.settings_controller.settings_updated.connect(self.on_settings_updated)
+        self.settings_view.revoke_sessions_requested.connect(
+            lambda: self.session_controller.revoke_all_sessions(self.current_user))
+        self.session_controller.session_count_fetched.connect(self.settings_view.set_session_count)
+        self.session_controller.sessions_revoked.connect(self.on_sessions_revoked)
+        self.session_controller.sessions_revoke_failed.connect(
+            lambda reason: QMessageBox.warning(self, "Sign Out Failed", reason))
+        self.session_controller.session_restored.connect(self.on_login_successful)
         self.dashboard_view.join_class_button.clicked.connect(self.open_join_class_dialog)
+        # Committed changes are applied to the open class in place rather than refetched
+        event_bus.subscribe(AssignmentCreated, self.on_assignment_created)
+        event_bus.subscribe(AnnouncementPosted, self.on_announcement_posted)
+        event_bus.subscribe(StudentJoined, self.on_student_joined)
+        event_bus.subscribe(GradeChanged, self.on_grade_changed)
+        self.view_cache.subscribe(event_bus)
+        self.grade_stats_controller.subscribe(event_bus)
         self.main_layout.sidebar.navigation_requested.connect(self.navigate)
         self.assignment_view.submission_panel.submit_requested.connect(self.submit_work)
-        self.assignment_view.grade_assignment_requested.connect(self.submission_controller.grade_submission)
+        # Grades are saved in debounced batches rather than one commit per edit
+        self.assignment_view.grade_batch_requested.connect(self.submission_controller.grade_submissions)
+        self.submission_controller.grades_committed.connect(self.assignment_view.grading_panel.mark_grades_saved)
+        self.submission_controller.grade_batch_failed.connect(self.on_grade_batch_failed)
+        self.grade_stats_controller.stats_updated.connect(self.on_grade_stats_updated)
         self.assignment_view.header.back_requested.connect(lambda: self.main_layout.content_stack.setCurrentWidget(self.class_view))
         self.class_view.header.back_requested.connect(lambda: self.main_layout.content_stack.setCurrentWidget(self.dashboard_view))
         self.class_view.stream_tab.post_announcement_requested.connect(self.post_announcement)
+        self.class_view.stream_tab.more_announcements_requested.connect(self.load_more_announcements)
         self.class_view.classwork_tab.assignment_selected.connect(self.navigate_to_assignment)
         self.class_view.classwork_tab.create_assignment_requested.connect(self.open_create_assignment_dialog)
 
         self.classroom_controller.classes_fetched.connect(self.on_classes_fetched)
-        self.assignment_controller.global_assignments_fetched.connect(self.global_assignments_view.display_assignments)
+        self.assignment_controller.global_assignments_fetched.connect(self.on_global_assignments_fetched)
+        self.assignment_controller.earlier_assignments_fetched.connect(self.global_assignments_view.prepend_assignments)
+        self.global_assignments_view.earlier_assignments_requested.connect(
+            lambda due_before, before_id: self.assignment_controller.get_earlier_assignments_for_user(
+                self.current_user, due_before, before_id))
+        self.assignment_controller.later_assignments_fetched.connect(self.global_assignments_view.append_assignments)
+        self.global_assignments_view.later_assignments_requested.connect(
+            lambda due_after, after_id: self.assignment_controller.get_later_assignments_for_user(
+                self.current_user, due_after, after_id))
         
+        # Parts of an opened class, delivered as each one is ready
+        self.class_bundle_controller.classroom_loaded.connect(self.on_class_fetched)
+        self.class_bundle_controller.announcements_loaded.connect(self.on_announcements_fetched)
+        self.class_bundle_controller.assignments_loaded.connect(self.on_class_assignments_fetched)
+        self.class_bundle_controller.roster_loaded.connect(self.on_roster_page_fetched)
+        self.class_bundle_controller.part_failed.connect(self.on_class_part_failed)
+        self.dashboard_view.class_prefetch_requested.connect(self.class_prefetcher.prefetch)
+
         # Controller signals for single-item fetches
-        self.classroom_controller.class_fetched.connect(self.on_class_fetched)
         self.assignment_controller.assignment_fetched.connect(self.on_assignment_fetched)
         self._create_top_bar()
 
@@ -158,6 +217,7 @@ class MainWindow(QMainWindow):
     @Slot(str)
     def on_login_failed(self, reason: str):
         """Shows an error message box on login failure."""
+        self.login_view.set_busy(False)
         QMessageBox.warning(self, "Login Failed", reason)
 
     @Slot()
@@ -198,6 +258,39 @@ class MainWindow(QMainWindow):
         )
         dialog.exec()
 
+    def open_roster_import_dialog(self):
+        """Opens the dialog to import the current class roster from a CSV file."""
+        classroom_id = self.class_view.current_class_id
+        if classroom_id is None:
+            return
+        dialog = RosterImportDialog(self)
+        dialog.import_requested.connect(
+            lambda emails, remove_missing: self.people_controller.sync_roster(classroom_id, emails, remove_missing)
+        )
+        dialog.exec()
+
+    @Slot(object)
+    def on_roster_synced(self, report):
+        """Summarises a roster import; reloads the people tab only if students were removed.
+
+        Added students arrive as StudentJoined events and are inserted in place.
+        """
+        lines = [f"Added {len(report.added)}, removed {len(report.removed)} students."]
+        if report.unknown:
+            shown = ", ".join(report.unknown[:10])
+            more = f" and {len(report.unknown) - 10} more" if len(report.unknown) > 10 else ""
+            lines.append(f"No student account for {len(report.unknown)} emails: {shown}{more}")
+        if report.removed:
+            self.view_cache.invalidate("class", report.classroom_id)  # roster size
+        if report.removed and report.classroom_id == self.class_view.current_class_id:
+            classroom = self.class_view.current_classroom
+            self.class_view.roster = []
+            self.class_view.roster_complete = False
+            self.class_view.people_tab.display_teacher(classroom and classroom.teacher, report.roster_size)
+            self.class_view.invalidate_gradebook()
+            self.people_controller.get_roster_page(report.classroom_id)
+        QMessageBox.information(self, "Roster Imported", "\n".join(lines))
+
     def on_join_class_failed(self, reason: str):
         """Shows an error message box on join class failure."""
         QMessageBox.warning(self, "Join Failed", reason)
@@ -209,6 +302,18 @@ class MainWindow(QMainWindow):
             self.announcement_controller.create_announcement(
                 content, self.class_view.current_classroom.id, self.current_user)
 
+    @Slot(int)
+    def load_more_announcements(self, before_id: int):
+        """Requests the page of announcements older than the ones in the stream."""
+        if self.class_view.current_class_id is not None:
+            self.announcement_controller.get_more_announcements(self.class_view.current_class_id, before_id)
+
+    @Slot(int, list, bool)
+    def on_more_announcements_fetched(self, classroom_id: int, announcements: list, has_more: bool):
+        """Appends an older page, unless the user has since opened another class."""
+        if classroom_id == self.class_view.current_class_id:
+            self.class_view.stream_tab.append_announcements(announcements, has_more)
+
     @Slot(str)
     def submit_work(self, content: str):
         """Handles the request to submit work for an assignment."""
@@ -227,10 +332,34 @@ class MainWindow(QMainWindow):
         self.current_user = updated_user
         QMessageBox.information(self, "Success", "Your settings have been updated.")
 
+    def restore_session(self):
+        """Logs in from a "Remember me" token saved on this device, if there is a valid one."""
+        self.session_controller.restore_session()
+
+    @Slot(int)
+    def on_sessions_revoked(self, count: int):
+        self.settings_view.set_session_count(0)
+        QMessageBox.information(self, "Signed Out", f"Signed out of {count} device{'s' if count != 1 else ''}.")
+
+    @Slot(User)
+    def on_credentials_accepted(self, user: User):
+        """Remembers or forgets this device as "Remember me" says, then logs in.
+
+        Forgetting matters on a shared machine: a token left behind by the
+        previous user would sign the next launch into their account.
+        """
+        if self.login_view.remember_me_checkbox.isChecked():
+            self.session_controller.remember(user)
+        else:
+            self.session_controller.forget()
+        self.on_login_successful(user)
+
     @Slot(User)
     def on_login_successful(self, user: User):
         """Switches to the dashboard view on successful login."""
         self.current_user = user
+        self.login_view.set_busy(False)
+        self.login_view.password_input.clear()
         print(f"Login successful for {user.email} ({user.role.value})")
 
         # Update UI elements
@@ -278,30 +407,146 @@ class MainWindow(QMainWindow):
         if view_name in self.content_views:
             # If navigating to global assignments, fetch the data
             if view_name == "Assignments":
-                self.assignment_controller.get_all_assignments_for_user(self.current_user)
+                self.show_global_assignments()
             # If navigating to settings, load the user's data
             if view_name == "Settings":
                 self.settings_view.load_user_data(self.current_user)
+                self.session_controller.count_sessions(self.current_user)
             self.main_layout.content_stack.setCurrentWidget(self.content_views[view_name])
 
+    def show_global_assignments(self):
+        """Shows the cached upcoming assignments at once and reloads them when the cache is stale."""
+        user_id = self.current_user.id
+        entry = self.view_cache.get("assignments", user_id)
+        if entry is not None:
+            if self._assignments_shown != (user_id, entry.fingerprint):
+                self._display_global_assignments(user_id, entry)
+            if self.view_cache.is_fresh("assignments", entry):
+                return
+        now = datetime.now()
+        self._assignments_request = (user_id, now)
+        # One row past the page tells whether there is a later page
+        self.assignment_controller.get_all_assignments_for_user(
+            self.current_user, due_after=now, limit=UPCOMING_ASSIGNMENTS_PAGE_SIZE + 1)
+
+    @Slot(list)
+    def on_global_assignments_fetched(self, assignments: list):
+        """Re-renders the assignments view only if the reloaded list differs from the one shown."""
+        if self._assignments_request is None:
+            return
+        user_id, window_start = self._assignments_request
+        self._assignments_request = None
+        has_more = len(assignments) > UPCOMING_ASSIGNMENTS_PAGE_SIZE
+        page = assignments[:UPCOMING_ASSIGNMENTS_PAGE_SIZE]
+        changed = self.view_cache.put("assignments", user_id, (window_start, page, has_more),
+                                      (fingerprint(page), has_more))
+        entry = self.view_cache.get("assignments", user_id)
+        if entry is None:  # Too large to cache
+            self._assignments_shown = None
+            self.global_assignments_view.set_window_start(window_start)
+            self.global_assignments_view.display_assignments(page, has_more)
+        elif changed or self._assignments_shown != (user_id, entry.fingerprint):
+            self._display_global_assignments(user_id, entry)
+
+    def _display_global_assignments(self, user_id: int, entry):
+        window_start, assignments, has_more = entry.value
+        self.global_assignments_view.set_window_start(window_start)
+        self.global_assignments_view.display_assignments(assignments, has_more)
+        self._assignments_shown = (user_id, entry.fingerprint)
+
     @Slot(int)
     def navigate_to_class(self, classroom_id: int):
-        """Requests the controller to fetch a specific class and then navigates."""
-        self.classroom_controller.get_class_by_id(classroom_id)
-
-    @Slot(Classroom)
-    def on_class_fetched(self, classroom: Classroom):
-        """Callback for when a single class is fetched, to populate the class view."""
-        if classroom:
-            self.class_view.load_class(classroom)
-            self.class_view.stream_tab.set_user_role(self.current_user.role)
-            self.class_view.classwork_tab.set_user_role(self.current_user.role)
-            self.main_layout.content_stack.setCurrentWidget(self.class_view)
-            # Fetch related data
-            self.announcement_controller.get_announcements_for_class(classroom.id)
-            self.assignment_controller.get_assignments_for_class(classroom.id)
-            # The classroom object already has teacher and students loaded.
-            self.class_view.people_tab.display_people(classroom.teacher, classroom.students)
+        """Opens the class view at once, showing cached or prefetched parts, and requests the rest together.
+
+        Parts a hover prefetch is still loading are not requested again. The
+        roster is paged and always loaded fresh.
+        """
+        self.class_prefetcher.cancel_all(keep=classroom_id)
+        prefetching = self.class_prefetcher.pending_parts(classroom_id)
+        # Roles first: begin_class may request the gradebook if the Grades tab is open
+        self.class_view.stream_tab.set_user_role(self.current_user.role)
+        self.class_view.classwork_tab.set_user_role(self.current_user.role)
+        self.class_view.people_tab.set_user_role(self.current_user.role)
+        self.class_view.set_user_role(self.current_user.role)
+        self.class_view.begin_class(classroom_id)
+        self.main_layout.content_stack.setCurrentWidget(self.class_view)
+
+        renderers = {
+            "classroom": self.class_view.show_classroom,
+            "announcements": lambda page: self.class_view.stream_tab.display_announcements(*page),
+            "assignments": self.class_view.classwork_tab.display_assignments,
+        }
+        parts = ["roster"]
+        for part, view in PART_VIEWS.items():
+            entry = self.view_cache.get(view, classroom_id)
+            if entry is not None:
+                renderers[part](entry.value)
+            if (entry is None or not self.view_cache.is_fresh(view, entry)) and part not in prefetching:
+                parts.append(part)
+        self.class_bundle_controller.load_class(classroom_id, parts)
+
+    # Parts of any class are cached as they arrive, prefetched ones included;
+    # only those of the open class are rendered, and only when they changed.
+    @Slot(int, object)
+    def on_class_fetched(self, classroom_id: int, classroom: Classroom):
+        """Fills in the class header once it arrives; a class that no longer exists goes back to the dashboard."""
+        is_open = classroom_id == self.class_view.current_class_id
+        if classroom is None:
+            for view in PART_VIEWS.values():
+                self.view_cache.invalidate(view, classroom_id)
+            if is_open:
+                self.main_layout.content_stack.setCurrentWidget(self.dashboard_view)
+            return
+        if self.view_cache.put("class", classroom_id, classroom) and is_open:
+            self.class_view.show_classroom(classroom)
+
+    @Slot(int, list, bool)
+    def on_announcements_fetched(self, classroom_id: int, announcements: list, has_more: bool):
+        changed = self.view_cache.put("stream", classroom_id, (announcements, has_more))
+        if changed and classroom_id == self.class_view.current_class_id:
+            self.class_view.stream_tab.display_announcements(announcements, has_more)
+
+    @Slot(int, list)
+    def on_class_assignments_fetched(self, classroom_id: int, assignments: list):
+        changed = self.view_cache.put("classwork", classroom_id, assignments)
+        if changed and classroom_id == self.class_view.current_class_id:
+            self.class_view.classwork_tab.display_assignments(assignments)
+
+    @Slot(int, str)
+    def on_class_part_failed(self, classroom_id: int, reason: str):
+        if classroom_id == self.class_view.current_class_id:
+            QMessageBox.warning(self, "Load Failed", reason)
+
+    def on_assignment_created(self, event: AssignmentCreated):
+        if event.classroom_id == self.class_view.current_class_id:
+            self.class_view.classwork_tab.insert_assignment(event)
+            self.class_view.invalidate_gradebook()
+
+    def on_announcement_posted(self, event: AnnouncementPosted):
+        if event.classroom_id == self.class_view.current_class_id:
+            self.class_view.stream_tab.add_announcement_card(event)
+
+    def on_student_joined(self, event: StudentJoined):
+        if event.classroom_id == self.class_view.current_class_id:
+            self.class_view.add_student(event)
+
+    def on_grade_changed(self, event: GradeChanged):
+        self.class_view.grades_tab.apply_grade(event.student_id, event.assignment_id, event.new_grade)
+
+    @Slot(int, list, bool)
+    def on_roster_page_fetched(self, classroom_id: int, students: list, has_more: bool):
+        """Feeds a roster page to the people tab and grading panel, then requests the next."""
+        if classroom_id != self.class_view.current_class_id:
+            return  # The user has moved on to another class
+        self.class_view.roster.extend(students)
+        self.class_view.people_tab.append_students(students)
+        assignment = self.assignment_view.current_assignment
+        if assignment is not None and assignment.classroom_id == classroom_id:
+            self.assignment_view.grading_panel.append_students(students)
+        if has_more:
+            self.people_controller.get_roster_page(classroom_id, students[-1].email)
+        else:
+            self.class_view.roster_complete = True
 
     @Slot(int)
     def navigate_to_assignment(self, assignment_id: int):
@@ -318,21 +563,37 @@ class MainWindow(QMainWindow):
                 self.submission_controller.get_submission(assignment.id, self.current_user.id)
             else: # Teacher
                 self.submission_controller.get_all_submissions_for_assignment(assignment.id)
+                self.grade_stats_controller.get_stats(assignment.id)
 
     @Slot(list)
     def on_all_submissions_fetched(self, submissions: list):
         """Provides the grading panel with the data it needs."""
-        current_classroom = self.class_view.current_classroom
-        if current_classroom:
-            # The classroom object already has students loaded from when we navigated to it.
-            self.assignment_view.grading_panel.display_submissions(current_classroom.students, submissions)
+        if self.class_view.current_classroom:
+            # Roster pages still in flight are appended by on_roster_page_fetched.
+            self.assignment_view.grading_panel.display_submissions(self.class_view.roster, submissions)
+
+    @Slot(object)
+    def on_gradebook_fetched(self, gradebook):
+        """Shows the gradebook if its class is still the one open."""
+        if gradebook.classroom_id == self.class_view.current_class_id:
+            self.class_view.grades_tab.display_gradebook(gradebook)
+
+    @Slot(object)
+    def on_grade_stats_updated(self, stats):
+        """Refreshes the statistics panel when they belong to the open assignment."""
+        if stats.assignment_id == self.assignment_view.stats_panel.assignment_id:
+            self.assignment_view.stats_panel.display_stats(stats)
+
+    @Slot(list, str)
+    def on_grade_batch_failed(self, submission_ids: list, reason: str):
+        """Flags the unsaved rows and tells the teacher why."""
+        self.assignment_view.grading_panel.mark_grades_failed(submission_ids, reason)
+        QMessageBox.warning(self, "Grading Failed", reason)
 
     def _add_class_card_to_dashboard(self, classroom: Classroom):
         """Adds a new class card to the dashboard when a class is created."""
-        card = ClassCard(classroom)
+        card = self.dashboard_view.add_class_card(classroom)
         card.clicked.connect(self.navigate_to_class)
-        count = self.dashboard_view.grid_layout.count()
-        self.dashboard_view.grid_layout.addWidget(card, count // 3, count % 3)
 
     @Slot(Classroom)
     def on_class_created(self, new_class):
@@ -361,18 +622,21 @@ def setup_database():
     from assignment import Assignment
     from announcement import Announcement
 
-    Base.metadata.create_all(bind=engine)
+    if upgrade_database(engine) != "current":
+        print("Database schema brought up to date.")
+    pragmas = ", ".join(f"{name}={value}" for name, value in active_pragmas().items())
+    print(f"Database profile '{active_sqlite_profile()}': {pragmas}")
     
     # Optional: Create a dummy user for easy testing
     from base import SessionLocal
     db = SessionLocal()
-    if not db.query(User).filter(User.email == "teacher@example.com").first():
+    if not db.query(User).filter(User.email_matches("teacher@example.com")).first():
         print("Creating dummy teacher user...")
         teacher = User(email="teacher@example.com", role="teacher")
         teacher.set_password("password")
         db.add(teacher)
         db.commit()
-    if not db.query(User).filter(User.email == "student@example.com").first():
+    if not db.query(User).filter(User.email_matches("student@example.com")).first():
         print("Creating dummy student user...")
         student = User(email="student@example.com", role=UserRole.student)
         student.set_password("password")
@@ -383,9 +647,18 @@ def setup_database():
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(db_executor.shutdown)
+    app.aboutToQuit.connect(hash_executor.shutdown)
+    if os.environ.get("PYCLASS_QUERY_STATS"):
+        # Record per-slot query counts and print them when the app closes
+        query_stats.install(engine)
+        app.aboutToQuit.connect(lambda: print(query_stats.summary_table()))
     
     setup_database()
 
     window = MainWindow()
+    if os.environ.get("PYCLASS_QUERY_STATS"):
+        window.class_bundle_controller.bundle_loaded.connect(lambda timings: print(timings.summary()))
+    window.restore_session()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
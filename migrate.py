@@ -0,0 +1,95 @@
+"""
+Schema migrations.
+
+``upgrade_database()`` is called at startup. It compares the database's
+``alembic_version`` with the newest revision in ``migrations/versions`` and
+only runs Alembic when they differ, so an up-to-date database costs one
+small SELECT. A brand-new database is created from the models and stamped at
+head instead of replaying every revision.
+
+    python migrate.py                 # upgrade classroom_clone.db
+    python migrate.py --db other.db   # upgrade another SQLite file
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect
+
+from base import Base
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+# Revision that matches the schema create_all produced before migrations existed.
+BASELINE_REVISION = "0001"
+
+_head_revision = None
+
+
+def alembic_config(connection=None) -> Config:
+    """Builds the Alembic config; ``connection`` is reused by migrations/env.py."""
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "migrations"))
+    config.attributes["configure_logging"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def head_revision() -> str:
+    """Returns the newest revision id; parsed once per process."""
+    global _head_revision
+    if _head_revision is None:
+        _head_revision = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    return _head_revision
+
+
+def current_revision(connection):
+    """Returns the revision recorded in the database, or None if unversioned."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def upgrade_database(target_engine=None) -> str:
+    """Brings the schema to head.
+
+    Returns "current" when nothing had to be done, "created" for a new
+    database and "upgraded" when migrations were applied.
+    """
+    if target_engine is None:
+        from base import engine as target_engine
+    # Import all models here so Base knows about them
+    import user, classroom, assignment, announcement, submission, session_token  # noqa: F401,E401
+
+    with target_engine.begin() as connection:
+        revision = current_revision(connection)
+        if revision == head_revision():
+            return "current"
+
+        config = alembic_config(connection)
+        if revision is None:
+            if not inspect(connection).get_table_names():
+                Base.metadata.create_all(connection)
+                command.stamp(config, "head")
+                return "created"
+            # Tables without a version: a database from before migrations existed
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+        return "upgraded"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations.")
+    parser.add_argument("--db", help="SQLite file to upgrade (default: the app database)")
+    args = parser.parse_args(argv)
+
+    target_engine = create_engine(f"sqlite:///{args.db}") if args.db else None
+    outcome = upgrade_database(target_engine)
+    print(f"Schema {outcome}; at revision {head_revision()}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
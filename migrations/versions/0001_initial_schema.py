@@ -0,0 +1,124 @@
+"""Initial schema, as created by Base.metadata.create_all before migrations existed.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("full_name", sa.String(100), nullable=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("role", sa.Enum("student", "teacher", name="userrole"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.CheckConstraint("length(full_name) <= 100", name="ck_users_full_name_len"),
+        sa.CheckConstraint("length(email) <= 255", name="ck_users_email_len"),
+        sa.CheckConstraint("length(password_hash) <= 255", name="ck_users_password_hash_len"),
+    )
+    op.create_index("ix_users_email_lower", "users", ["email"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "classrooms",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("section", sa.String(50), nullable=True),
+        sa.Column("class_code", sa.String(10), nullable=False),
+        sa.Column("teacher_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("class_code"),
+        sa.ForeignKeyConstraint(["teacher_id"], ["users.id"]),
+        sa.CheckConstraint("length(name) <= 100", name="ck_classrooms_name_len"),
+        sa.CheckConstraint("length(section) <= 50", name="ck_classrooms_section_len"),
+        sa.CheckConstraint("length(class_code) = 10", name="ck_classrooms_class_code_len"),
+    )
+    op.create_index("ix_classrooms_teacher_id", "classrooms", ["teacher_id"])
+    op.create_index("ix_classrooms_class_code", "classrooms", ["class_code"])
+    op.create_index("ix_classrooms_id", "classrooms", ["id"])
+
+    op.create_table(
+        "student_classroom",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("classroom_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "classroom_id"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["classroom_id"], ["classrooms.id"]),
+    )
+
+    op.create_table(
+        "assignments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("instructions", sa.String(2000), nullable=True),
+        sa.Column("due_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("points", sa.Integer(), nullable=True),
+        sa.Column("classroom_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["classroom_id"], ["classrooms.id"]),
+        sa.CheckConstraint("points >= 0", name="ck_assignments_points_positive"),
+        sa.CheckConstraint("points <= 10000", name="ck_assignments_points_max"),
+        sa.CheckConstraint("length(title) <= 200", name="ck_assignments_title_len"),
+        sa.CheckConstraint("instructions IS NULL OR length(instructions) <= 2000", name="ck_assignments_instructions_len"),
+    )
+    op.create_index("ix_assignments_id", "assignments", ["id"])
+    op.create_index("ix_assignments_classroom_id", "assignments", ["classroom_id"])
+    op.create_index("ix_assignments_due_date", "assignments", ["due_date"])
+
+    op.create_table(
+        "announcements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.String(2000), nullable=False),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("classroom_id", sa.Integer(), nullable=False),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["classroom_id"], ["classrooms.id"]),
+        sa.ForeignKeyConstraint(["author_id"], ["users.id"]),
+        sa.CheckConstraint("length(content) <= 2000", name="ck_announcements_content_len"),
+    )
+    op.create_index("ix_announcements_id", "announcements", ["id"])
+    op.create_index("ix_announcements_classroom_id", "announcements", ["classroom_id"])
+    op.create_index("ix_announcements_timestamp", "announcements", ["timestamp"])
+    op.create_index("ix_announcements_author_id", "announcements", ["author_id"])
+
+    op.create_table(
+        "submissions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.String(5000), nullable=True),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("grade", sa.Float(), nullable=True),
+        sa.Column("assignment_id", sa.Integer(), nullable=False),
+        sa.Column("student_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["assignment_id"], ["assignments.id"]),
+        sa.ForeignKeyConstraint(["student_id"], ["users.id"]),
+        sa.UniqueConstraint("assignment_id", "student_id", name="uq_submission_student_assignment"),
+        sa.CheckConstraint("grade >= 0", name="ck_submissions_grade_positive"),
+        sa.CheckConstraint("grade <= 10000", name="ck_submissions_grade_max"),
+        sa.CheckConstraint("content IS NULL OR length(content) <= 5000", name="ck_submissions_content_len"),
+    )
+    op.create_index("ix_submissions_id", "submissions", ["id"])
+    op.create_index("ix_submissions_assignment_id", "submissions", ["assignment_id"])
+    op.create_index("ix_submissions_student_id", "submissions", ["student_id"])
+    op.create_index("ix_submissions_timestamp", "submissions", ["timestamp"])
+
+
+def downgrade():
+    op.drop_table("submissions")
+    op.drop_table("announcements")
+    op.drop_table("assignments")
+    op.drop_table("student_classroom")
+    op.drop_table("classrooms")
+    op.drop_table("users")
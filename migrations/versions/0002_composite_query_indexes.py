@@ -0,0 +1,46 @@
+"""Composite indexes matched to the controllers' filter-and-sort queries.
+
+- get_announcements_for_class filters on classroom_id and orders by timestamp
+  DESC: (classroom_id, timestamp DESC, id DESC) serves both without a sort.
+- get_assignments_for_class orders by due_date within a classroom:
+  (classroom_id, due_date, id).
+- Rosters are read by classroom, but the student_classroom primary key leads
+  with user_id: (classroom_id, user_id).
+
+The single-column classroom_id indexes are prefixes of the new ones and are
+dropped so writes maintain one index instead of two.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_announcements_classroom_timestamp",
+        "announcements",
+        ["classroom_id", sa.text("timestamp DESC"), sa.text("id DESC")],
+    )
+    op.drop_index("ix_announcements_classroom_id", table_name="announcements")
+
+    op.create_index("ix_assignments_classroom_due_date", "assignments", ["classroom_id", "due_date", "id"])
+    op.drop_index("ix_assignments_classroom_id", table_name="assignments")
+
+    op.create_index("ix_student_classroom_classroom_user", "student_classroom", ["classroom_id", "user_id"])
+    op.execute("ANALYZE")
+
+
+def downgrade():
+    op.drop_index("ix_student_classroom_classroom_user", table_name="student_classroom")
+    op.create_index("ix_assignments_classroom_id", "assignments", ["classroom_id"])
+    op.drop_index("ix_assignments_classroom_due_date", table_name="assignments")
+    op.create_index("ix_announcements_classroom_id", "announcements", ["classroom_id"])
+    op.drop_index("ix_announcements_classroom_timestamp", table_name="announcements")
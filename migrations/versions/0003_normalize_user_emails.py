@@ -0,0 +1,51 @@
+"""Case-insensitive user emails.
+
+Emails are stored trimmed and lower-cased, and the old
+``ix_users_email_lower`` (a plain index on ``email``) becomes a unique
+expression index on ``lower(email)`` that the login and signup lookups use.
+
+Addresses that only differ by case or surrounding spaces would collide once
+normalized. They are all found with one grouped query before anything is
+changed, and the upgrade stops with the full list so the accounts can be
+merged by hand.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def email_collisions(connection) -> list:
+    """Returns (normalized email, [user ids]) for every address shared after normalizing."""
+    rows = connection.execute(sa.text(
+        "SELECT lower(trim(email)) AS normalized, group_concat(id) AS ids FROM users "
+        "GROUP BY normalized HAVING count(*) > 1 ORDER BY normalized"
+    )).all()
+    return [(row.normalized, sorted(int(user_id) for user_id in row.ids.split(","))) for row in rows]
+
+
+def upgrade():
+    connection = op.get_bind()
+    collisions = email_collisions(connection)
+    if collisions:
+        listing = "\n".join(f"  {email}: users {', '.join(map(str, ids))}" for email, ids in collisions)
+        raise RuntimeError(
+            f"{len(collisions)} email address(es) are shared by several accounts once case is ignored; "
+            f"merge or rename them, then upgrade again:\n{listing}"
+        )
+
+    op.execute("UPDATE users SET email = lower(trim(email)) WHERE email != lower(trim(email))")
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.create_index("ix_users_email_lower", "users", [sa.text("lower(email)")], unique=True)
+
+
+def downgrade():
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.create_index("ix_users_email_lower", "users", ["email"])
@@ -0,0 +1,38 @@
+"""Session tokens for "remember me" logins.
+
+A restore is one lookup on the unique token_hash index; revoking a user's
+devices deletes by user_id.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "session_tokens",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("token_hash", sa.String(64), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+    )
+    op.create_index("ix_session_tokens_token_hash", "session_tokens", ["token_hash"], unique=True)
+    op.create_index("ix_session_tokens_user_id", "session_tokens", ["user_id"])
+
+
+def downgrade():
+    op.drop_index("ix_session_tokens_user_id", table_name="session_tokens")
+    op.drop_index("ix_session_tokens_token_hash", table_name="session_tokens")
+    op.drop_table("session_tokens")
@@ -1,9 +1,134 @@
+import csv
+
 from PySide6.QtCore import QObject, Signal, Slot
+from sqlalchemy import bindparam, delete, func, insert, select
+
+from base import db_executor
+from classroom import student_classroom_association
+from events import StudentJoined, stage_event
+from user import User, UserRole, normalize_email
+
+# Students loaded per roster request.
+ROSTER_PAGE_SIZE = 100
+# Emails per IN (...) lookup; stays under SQLite's bound-parameter limit on old builds.
+EMAIL_LOOKUP_CHUNK = 900
+
+
+def read_roster_emails(lines) -> list:
+    """Reads the email addresses from roster CSV lines, in file order without duplicates.
+
+    A header row with an "email" column selects that column; otherwise the
+    first column is used. Blank cells are skipped.
+    """
+    rows = csv.reader(lines)
+    column = 0
+    emails = {}
+    for index, row in enumerate(rows):
+        cells = [cell.strip() for cell in row]
+        if index == 0:
+            headers = [cell.lower() for cell in cells]
+            if "email" in headers:
+                column = headers.index("email")
+                continue
+        if column < len(cells) and cells[column]:
+            emails.setdefault(cells[column], None)
+    return list(emails)
+
+
+class RosterSyncReport:
+    """Outcome of a roster import: emails added, removed and not matched to a student."""
+
+    def __init__(self, classroom_id, added, removed, unknown, roster_size):
+        self.classroom_id = classroom_id
+        self.added = added
+        self.removed = removed
+        self.unknown = unknown
+        self.roster_size = roster_size
+
+
+def roster_page(db, classroom_id: int, after_email=None, limit: int = ROSTER_PAGE_SIZE):
+    """One page of a class roster in email order; returns (students, has_more)."""
+    membership = student_classroom_association
+    query = (
+        db.query(User)
+        .join(membership, membership.c.user_id == User.id)
+        .filter(membership.c.classroom_id == classroom_id)
+    )
+    if after_email is not None:
+        query = query.filter(User.email > after_email)
+    rows = query.order_by(User.email).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
 
 
 class PeopleController(QObject):
     """Handles business logic for fetching class members."""
 
-    # This controller is now empty after optimizations. It can be kept for future
-    # people-related logic or removed if no future logic is planned.
-    pass
\ No newline at end of file
+    roster_page_fetched = Signal(int, list, bool)  # classroom_id, students, has_more
+    roster_synced = Signal(object)  # RosterSyncReport
+    roster_sync_failed = Signal(str)
+
+    @Slot(int)
+    def get_roster_page(self, classroom_id: int, after_email=None, limit: int = ROSTER_PAGE_SIZE):
+        """Fetches the next page of a class roster, sorted by email.
+
+        Pages are keyed on the unique email: pass the last email of the
+        previous page as ``after_email`` to continue.
+        """
+        def work(db):
+            return roster_page(db, classroom_id, after_email, limit)
+
+        db_executor.submit(work, lambda result: self.roster_page_fetched.emit(classroom_id, *result))
+
+    @Slot(int, list, bool)
+    def sync_roster(self, classroom_id: int, emails: list, remove_missing: bool = True):
+        """Enrols the students listed in ``emails`` and, optionally, drops everyone else.
+
+        The difference against the current roster is worked out with set
+        operations and applied in one transaction as two executemany batches.
+        Emails without a student account are reported, not created.
+        """
+        wanted_emails = list(dict.fromkeys(normalize_email(email) for email in emails))
+
+        def work(db):
+            membership = student_classroom_association
+            users = User.__table__
+            wanted = {}
+            for start in range(0, len(wanted_emails), EMAIL_LOOKUP_CHUNK):
+                chunk = wanted_emails[start:start + EMAIL_LOOKUP_CHUNK]
+                wanted.update(db.execute(
+                    select(users.c.id, users.c.email)
+                    .where(func.lower(users.c.email).in_(chunk), users.c.role == UserRole.student.name)
+                ).all())
+            current = dict(db.execute(
+                select(users.c.id, users.c.email)
+                .join(membership, membership.c.user_id == users.c.id)
+                .where(membership.c.classroom_id == classroom_id)
+            ).all())
+
+            to_add = wanted.keys() - current.keys()
+            to_remove = current.keys() - wanted.keys() if remove_missing else set()
+            if to_add:
+                db.execute(insert(membership), [
+                    {"user_id": user_id, "classroom_id": classroom_id} for user_id in to_add
+                ])
+                for user_id in sorted(to_add, key=wanted.get):
+                    stage_event(db, StudentJoined(classroom_id, user_id, wanted[user_id]))
+            if to_remove:
+                db.execute(
+                    delete(membership).where(
+                        membership.c.classroom_id == classroom_id, membership.c.user_id == bindparam("member_id")),
+                    [{"member_id": user_id} for user_id in to_remove],
+                )
+            db.commit()
+
+            found = set(wanted.values())
+            return RosterSyncReport(
+                classroom_id,
+                added=sorted(wanted[user_id] for user_id in to_add),
+                removed=sorted(current[user_id] for user_id in to_remove),
+                unknown=[email for email in wanted_emails if email not in found],
+                roster_size=len(current) + len(to_add) - len(to_remove),
+            )
+
+        db_executor.submit(work, self.roster_synced.emit,
+                           lambda e: self.roster_sync_failed.emit(f"Failed to import roster: {e}"))
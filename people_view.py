@@ -1,5 +1,6 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QHBoxLayout
-from PySide6.QtCore import Slot, Qt
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QHBoxLayout, QPushButton
+from PySide6.QtCore import Signal, Slot, Qt
+from user import UserRole
 
 
 class UserItem(QFrame):
@@ -18,9 +19,11 @@ class UserItem(QFrame):
 
 class PeopleView(QWidget):
     """The view for the 'People' tab, showing teacher and students."""
+    import_roster_requested = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.student_count = None  # unknown until the class header arrives
         main_layout = QVBoxLayout(self)
         main_layout.setSpacing(25)
         main_layout.setContentsMargins(10, 10, 10, 10)
@@ -36,14 +39,24 @@ class PeopleView(QWidget):
         main_layout.addLayout(self.teacher_layout)
 
         # --- Students Section ---
-        students_title = QLabel("Classmates")
-        students_title.setStyleSheet("font-size: 20px; color: #AAAAAA; padding-bottom: 8px; border-bottom: 1px solid #444444;")
-        main_layout.addWidget(students_title)
+        self.students_title = QLabel("Classmates")
+        self.students_title.setStyleSheet("font-size: 20px; color: #AAAAAA; padding-bottom: 8px; border-bottom: 1px solid #444444;")
+        main_layout.addWidget(self.students_title)
+
+        self.import_roster_button = QPushButton("Import roster")
+        self.import_roster_button.setFixedWidth(140)
+        self.import_roster_button.clicked.connect(self.import_roster_requested.emit)
+        self.import_roster_button.hide() # Teachers only
+        main_layout.addWidget(self.import_roster_button, alignment=Qt.AlignLeft)
 
         self.students_layout = QVBoxLayout()
         self.students_layout.setSpacing(10)
         main_layout.addLayout(self.students_layout)
 
+    def set_user_role(self, role: UserRole):
+        """Show the roster import button to teachers only."""
+        self.import_roster_button.setVisible(role == UserRole.teacher)
+
     def _clear_layout(self, layout):
         """Removes all widgets from a given layout."""
         while layout.count():
@@ -53,17 +66,40 @@ class PeopleView(QWidget):
 
     @Slot(object, list)
     def display_people(self, teacher, students: list):
-        """Clears and populates the view with the teacher and students."""
-        self._clear_layout(self.teacher_layout)
-        self._clear_layout(self.students_layout)
+        """Clears and populates the view with the teacher and students, already sorted by email."""
+        self.display_teacher(teacher, len(students))
+        self.append_students(students)
 
+    def display_teacher(self, teacher, student_count=None):
+        """Clears the view and shows the teacher; students arrive via append_students."""
+        self.clear_view()
+        self.set_teacher(teacher, student_count)
+
+    def set_teacher(self, teacher, student_count=None):
+        """Shows the teacher and class size without touching the students already listed."""
+        self._clear_layout(self.teacher_layout)
         if teacher:
             self.teacher_layout.addWidget(UserItem(teacher))
+        self.student_count = student_count
+        if student_count is not None:
+            self.students_title.setText(f"Classmates ({student_count})")
 
-        for student in sorted(students, key=lambda s: s.email):
+    @Slot(list)
+    def append_students(self, students: list):
+        """Adds the next page of the roster below the students already shown."""
+        for student in students:
             self.students_layout.addWidget(UserItem(student))
 
+    def insert_student(self, index: int, student):
+        """Shows a student who joined while the class is open at ``index`` in the list."""
+        self.students_layout.insertWidget(index, UserItem(student))
+        if self.student_count is not None:
+            self.student_count += 1
+            self.students_title.setText(f"Classmates ({self.student_count})")
+
     def clear_view(self):
         """Clears all content from the view."""
         self._clear_layout(self.teacher_layout)
-        self._clear_layout(self.students_layout)
\ No newline at end of file
+        self._clear_layout(self.students_layout)
+        self.students_title.setText("Classmates")
+        self.student_count = None
\ No newline at end of file
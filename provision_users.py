@@ -0,0 +1,189 @@
+"""
+Bulk account provisioning.
+
+Creates accounts for a whole cohort from a CSV of email, full name, role and
+initial password:
+
+    python provision_users.py cohort.csv                    # into classroom_clone.db
+    python provision_users.py cohort.csv --db other.db --workers 8
+    python provision_users.py cohort.csv --dry-run
+
+Existing accounts are found with one set-based query, passwords are hashed
+with bcrypt in a process pool across all cores, and the new users are
+written with chunked Core executemany inserts, one transaction per chunk.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from sqlalchemy import create_engine, insert, text
+
+from migrate import upgrade_database
+from user import User, UserRole, hash_password, normalize_email
+import user as user_module
+
+CSV_COLUMNS = ("email", "full_name", "role", "password")
+# Rows per executemany insert and transaction.
+CHUNK_SIZE = 1000
+# Below this many passwords the pool start-up costs more than it saves.
+MIN_POOL_BATCH = 8
+
+
+class NewAccount:
+    """One account to create, as read from the CSV."""
+
+    def __init__(self, email, full_name, role, password, line):
+        self.email = email
+        self.full_name = full_name
+        self.role = role
+        self.password = password
+        self.line = line
+
+
+class ProvisioningReport:
+    """Outcome of a provisioning run: the emails created and those that already had an account."""
+
+    def __init__(self, created, existing):
+        self.created = created
+        self.existing = existing
+
+
+def read_accounts(lines) -> tuple:
+    """Parses CSV lines into (accounts, invalid).
+
+    A header row naming the columns may list them in any order; without one
+    the order is email, full_name, role, password. ``invalid`` holds
+    (line number, reason) pairs; a repeated email is invalid after its first row.
+    """
+    rows = csv.reader(lines)
+    columns = {name: index for index, name in enumerate(CSV_COLUMNS)}
+    accounts, invalid, seen = [], [], set()
+    for line, row in enumerate(rows, start=1):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        if line == 1 and "email" in (cell.lower() for cell in cells):
+            headers = [cell.lower().replace(" ", "_") for cell in cells]
+            missing = [name for name in CSV_COLUMNS if name not in headers]
+            if missing:
+                raise ValueError(f"CSV header is missing column(s): {', '.join(missing)}.")
+            columns = {name: headers.index(name) for name in CSV_COLUMNS}
+            continue
+
+        value = {name: cells[index] if index < len(cells) else "" for name, index in columns.items()}
+        email = normalize_email(value["email"])
+        if not email or "@" not in email:
+            invalid.append((line, f"invalid email '{value['email']}'"))
+        elif value["role"].lower() not in UserRole.__members__:
+            invalid.append((line, f"unknown role '{value['role']}'"))
+        elif not value["password"]:
+            invalid.append((line, "missing password"))
+        elif email in seen:
+            invalid.append((line, f"duplicate of an earlier row for {email}"))
+        else:
+            seen.add(email)
+            accounts.append(NewAccount(email, value["full_name"] or None, UserRole[value["role"].lower()],
+                                       value["password"], line))
+    return accounts, invalid
+
+
+def existing_emails(connection, emails) -> set:
+    """Returns which of ``emails`` already have an account, in one query.
+
+    The list is bound as a single JSON array and joined against
+    ix_users_email_lower, so the statement stays within SQLite's parameter
+    limit however large the cohort.
+    """
+    rows = connection.execute(text(
+        "SELECT candidate.value FROM json_each(:emails) AS candidate "
+        "JOIN users ON lower(users.email) = candidate.value"
+    ), {"emails": json.dumps(list(emails))})
+    return {row[0] for row in rows}
+
+
+def hash_passwords(passwords, workers: int = None, rounds: int = None) -> list:
+    """bcrypt-hashes ``passwords`` in order, spread over ``workers`` processes (default: all cores)."""
+    workers = workers or os.cpu_count() or 1
+    rounds = rounds or user_module.BCRYPT_ROUNDS
+    if workers == 1 or len(passwords) < MIN_POOL_BATCH:
+        return [hash_password(password, rounds) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(hash_password, passwords, repeat(rounds), chunksize=chunksize))
+
+
+def provision_users(target_engine, accounts, workers: int = None, rounds: int = None,
+                    chunk_size: int = CHUNK_SIZE, log=print) -> ProvisioningReport:
+    """Creates every account in ``accounts`` that does not exist yet.
+
+    ``accounts`` come from read_accounts, so emails are normalized and unique.
+    """
+    start = time.perf_counter()
+    with target_engine.connect() as connection:
+        existing = existing_emails(connection, (account.email for account in accounts))
+    new_accounts = [account for account in accounts if account.email not in existing]
+    log(f"  lookup       {len(existing):>7} existing in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    hashes = hash_passwords([account.password for account in new_accounts], workers, rounds)
+    log(f"  hashing      {len(hashes):>7} passwords in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    statement = insert(User.__table__)
+    for offset in range(0, len(new_accounts), chunk_size):
+        chunk = zip(new_accounts[offset:offset + chunk_size], hashes[offset:offset + chunk_size])
+        with target_engine.begin() as connection:
+            connection.execute(statement, [
+                {"email": account.email, "full_name": account.full_name,
+                 "role": account.role.name, "password_hash": password_hash}
+                for account, password_hash in chunk
+            ])
+    log(f"  insert       {len(new_accounts):>7} users in {time.perf_counter() - start:.2f}s")
+
+    return ProvisioningReport(
+        created=[account.email for account in new_accounts],
+        existing=[account.email for account in accounts if account.email in existing],
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create accounts in bulk from a CSV file.")
+    parser.add_argument("csv", help="CSV with email, full_name, role and password columns")
+    parser.add_argument("--db", help="SQLite file to provision (default: the app database)")
+    parser.add_argument("--workers", type=int, help="hashing processes (default: all cores)")
+    parser.add_argument("--rounds", type=int, help=f"bcrypt cost (default: {user_module.BCRYPT_ROUNDS})")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be created")
+    args = parser.parse_args(argv)
+
+    with open(args.csv, newline="", encoding="utf-8-sig") as csv_file:
+        accounts, invalid = read_accounts(csv_file)
+    for line, reason in invalid:
+        print(f"  line {line}: {reason}")
+
+    if args.db:
+        target_engine = create_engine(f"sqlite:///{args.db}")
+    else:
+        from base import engine as target_engine
+    upgrade_database(target_engine)
+    try:
+        if args.dry_run:
+            with target_engine.connect() as connection:
+                existing = existing_emails(connection, (account.email for account in accounts))
+            print(f"Would create {len(accounts) - len(existing)} account(s); "
+                  f"{len(existing)} already exist, {len(invalid)} row(s) rejected.")
+            return 1 if invalid else 0
+        print(f"Provisioning {len(accounts)} account(s) from {args.csv}:")
+        report = provision_users(target_engine, accounts, args.workers, args.rounds)
+    finally:
+        target_engine.dispose()
+    print(f"Created {len(report.created)}; {len(report.existing)} already existed, {len(invalid)} row(s) rejected.")
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
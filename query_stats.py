@@ -0,0 +1,187 @@
+"""
+Per-slot query instrumentation.
+
+Every piece of controller work that runs through ``base.db_executor`` is
+tagged with the controller slot that submitted it, e.g.
+``AssignmentController.get_all_assignments_for_user``. Once ``install()`` has
+hooked an engine's ``before_cursor_execute``/``after_cursor_execute`` events,
+each statement is charged to the slot active on its thread.
+
+Usage::
+
+    import query_stats
+    query_stats.install()            # hooks base.engine
+    ...
+    query_stats.stats()              # {slot: SlotStats}
+    print(query_stats.summary_table())
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+UNATTRIBUTED = "(no slot)"
+
+_local = threading.local()
+_lock = threading.Lock()
+_stats = {}
+_installed = set()
+
+
+class SlotStats:
+    """Accumulated counters for a single controller slot."""
+
+    __slots__ = ("calls", "statements", "sql_time", "rows", "wall_time")
+
+    def __init__(self, calls=0, statements=0, sql_time=0.0, rows=0, wall_time=0.0):
+        self.calls = calls
+        self.statements = statements
+        self.sql_time = sql_time
+        self.rows = rows
+        self.wall_time = wall_time
+
+    def copy(self):
+        return SlotStats(self.calls, self.statements, self.sql_time, self.rows, self.wall_time)
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"SlotStats({', '.join(f'{k}={v!r}' for k, v in self.as_dict().items())})"
+
+
+def _entry(slot: str) -> SlotStats:
+    stats = _stats.get(slot)
+    if stats is None:
+        stats = _stats[slot] = SlotStats()
+    return stats
+
+
+def current_slot():
+    """Returns the slot active on the calling thread, or None."""
+    return getattr(_local, "slot", None)
+
+
+def slot_name(work) -> str:
+    """Derives a slot label from a controller's nested ``work`` function."""
+    qualname = getattr(work, "__qualname__", repr(work))
+    return qualname.split(".<locals>")[0]
+
+
+def _count_rows(result) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, tuple):
+        # (primary result, extras...) such as (page, has_more): count the primary result
+        return _count_rows(result[0]) if result else 0
+    if isinstance(result, (list, set)):
+        return len(result)
+    return 1
+
+
+class _SlotTracker:
+    """Collects the result of one slot invocation."""
+
+    __slots__ = ("rows",)
+
+    def __init__(self):
+        self.rows = 0
+
+    def record_result(self, result):
+        self.rows += _count_rows(result)
+
+
+@contextmanager
+def track_slot(slot: str):
+    """Attributes statements run on this thread to ``slot`` for the duration.
+
+    Nested calls keep the outer slot's label so helper work is charged to the
+    slot that triggered it.
+    """
+    outer = current_slot()
+    if outer is not None or not _installed:
+        yield _SlotTracker()
+        return
+
+    _local.slot = slot
+    tracker = _SlotTracker()
+    start = time.perf_counter()
+    try:
+        yield tracker
+    finally:
+        elapsed = time.perf_counter() - start
+        _local.slot = None
+        with _lock:
+            stats = _entry(slot)
+            stats.calls += 1
+            stats.wall_time += elapsed
+            stats.rows += tracker.rows
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_stats_start"].pop()
+    slot = current_slot() or UNATTRIBUTED
+    # Each statement is counted from one source. Statements that return rows
+    # (SELECT, DML with RETURNING) are counted from the slot's return value,
+    # so their rowcount is ignored; other DML reports the rows it touched.
+    returns_rows = cursor.description is not None
+    affected = cursor.rowcount if not returns_rows and cursor.rowcount and cursor.rowcount > 0 else 0
+    with _lock:
+        stats = _entry(slot)
+        stats.statements += 1
+        stats.sql_time += elapsed
+        stats.rows += affected
+
+
+def install(target_engine=None):
+    """Starts recording statements issued through ``target_engine``."""
+    if target_engine is None:
+        from base import engine as target_engine
+    if target_engine in _installed:
+        return
+    event.listen(target_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target_engine, "after_cursor_execute", _after_cursor_execute)
+    _installed.add(target_engine)
+
+
+def uninstall(target_engine=None):
+    """Stops recording statements for ``target_engine``."""
+    if target_engine is None:
+        from base import engine as target_engine
+    if target_engine not in _installed:
+        return
+    event.remove(target_engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(target_engine, "after_cursor_execute", _after_cursor_execute)
+    _installed.discard(target_engine)
+
+
+def stats() -> dict:
+    """Returns a snapshot of the counters, keyed by slot name."""
+    with _lock:
+        return {slot: entry.copy() for slot, entry in _stats.items()}
+
+
+def reset():
+    """Clears all recorded counters."""
+    with _lock:
+        _stats.clear()
+
+
+def summary_table() -> str:
+    """Formats the counters as a plain-text table, slowest slot first."""
+    snapshot = sorted(stats().items(), key=lambda item: item[1].wall_time, reverse=True)
+    header = f"{'Slot':<60} {'Calls':>6} {'Stmts':>6} {'SQL ms':>10} {'Rows':>8} {'Wall ms':>10}"
+    lines = [header, "-" * len(header)]
+    for slot, entry in snapshot:
+        lines.append(
+            f"{slot:<60} {entry.calls:>6} {entry.statements:>6} {entry.sql_time * 1000:>10.2f} "
+            f"{entry.rows:>8} {entry.wall_time * 1000:>10.2f}"
+        )
+    if not snapshot:
+        lines.append("(no queries recorded)")
+    return "\n".join(lines)
@@ -0,0 +1,72 @@
+from PySide6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QCheckBox,
+    QFileDialog,
+    QDialogButtonBox,
+    QMessageBox,
+)
+from PySide6.QtCore import Signal
+
+from people_controller import read_roster_emails
+
+
+class RosterImportDialog(QDialog):
+    """A dialog for enrolling a class roster from a CSV of student emails."""
+
+    # Signal emits the emails read from the file and whether to drop unlisted students
+    import_requested = Signal(list, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Import Roster")
+        self.setFixedSize(420, 200)
+
+        layout = QVBoxLayout(self)
+
+        title_label = QLabel("Import students from a CSV file")
+        title_label.setStyleSheet("font-size: 16px; font-weight: 500;")
+        layout.addWidget(title_label)
+
+        file_layout = QHBoxLayout()
+        self.path_input = QLineEdit()
+        self.path_input.setPlaceholderText("CSV with an email column")
+        browse_button = QPushButton("Browse...")
+        browse_button.clicked.connect(self._on_browse_clicked)
+        file_layout.addWidget(self.path_input)
+        file_layout.addWidget(browse_button)
+        layout.addLayout(file_layout)
+
+        self.remove_missing_checkbox = QCheckBox("Remove students who are not in the file")
+        layout.addWidget(self.remove_missing_checkbox)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def _on_browse_clicked(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Select roster", "", "CSV files (*.csv);;All files (*)")
+        if path:
+            self.path_input.setText(path)
+
+    def accept(self):
+        path = self.path_input.text().strip()
+        if not path:
+            QMessageBox.warning(self, "Validation Error", "Choose a CSV file to import.")
+            return
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                emails = read_roster_emails(f)
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.warning(self, "Import Error", f"Could not read {path}: {e}")
+            return
+        if not emails:
+            QMessageBox.warning(self, "Validation Error", "The file does not list any emails.")
+            return
+        self.import_requested.emit(emails, self.remove_missing_checkbox.isChecked())
+        super().accept()
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from PySide6.QtCore import QObject, Signal, Slot
+from sqlalchemy import delete, func, insert, select, update
+
+from base import db_executor
+from session_token import SessionToken
+from user import User
+
+# Where this device keeps its "remember me" token, and how long a token lasts.
+TOKEN_FILE = Path(os.environ.get("PYCLASS_SESSION_FILE", Path.home() / ".pyclass" / "session"))
+REMEMBER_ME_DAYS = int(os.environ.get("PYCLASS_REMEMBER_DAYS", "30"))
+
+
+def hash_token(token: str) -> str:
+    """SHA-256 of a token. Tokens are 256 random bits, so a fast hash is enough; no bcrypt."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def read_token_file(path: Path):
+    """Returns the saved token, or None when there is no usable file."""
+    try:
+        token = path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return token or None
+
+
+def write_token_file(path: Path, token: str):
+    """Saves ``token`` readable by the current user only."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as token_file:
+        token_file.write(token)
+
+
+def clear_token_file(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class SessionController(QObject):
+    """Creates, restores and revokes remembered logins.
+
+    The token itself only exists in the local token file; the database keeps
+    its hash, so a restore is one lookup on ix_session_tokens_token_hash.
+    """
+
+    session_restored = Signal(User)
+    session_remembered = Signal()
+    session_count_fetched = Signal(int)
+    sessions_revoked = Signal(int)
+    sessions_revoke_failed = Signal(str)
+
+    def __init__(self, token_file: Path = None, parent=None):
+        super().__init__(parent)
+        self._token_file = token_file
+
+    @property
+    def token_file(self) -> Path:
+        return self._token_file or TOKEN_FILE
+
+    @Slot(User)
+    def remember(self, user: User):
+        """Issues a token for ``user`` and saves it on this device, replacing the one saved before."""
+        user_id = user.id
+        token_file = self.token_file
+        token = secrets.token_urlsafe(32)
+        previous_token = read_token_file(token_file)
+
+        def work(db):
+            now = datetime.now(timezone.utc)
+            if previous_token is not None:
+                # Its file is about to be overwritten, so nothing could restore it again
+                db.execute(delete(SessionToken).where(SessionToken.token_hash == hash_token(previous_token)))
+            # Drop this user's expired tokens while we are writing anyway
+            db.execute(delete(SessionToken).where(SessionToken.user_id == user_id, SessionToken.expires_at <= now))
+            db.execute(insert(SessionToken).values(
+                token_hash=hash_token(token), user_id=user_id,
+                created_at=now, expires_at=now + timedelta(days=REMEMBER_ME_DAYS),
+            ))
+            # Written before the commit: a failed write rolls the row back instead of orphaning it
+            write_token_file(token_file, token)
+            db.commit()
+
+        db_executor.submit(work, lambda _: self.session_remembered.emit(),
+                           lambda e: print(f"Warning: could not remember this login: {e}"))
+
+    @Slot()
+    def forget(self):
+        """Drops the token saved on this device, so the next launch shows the login screen."""
+        token_file = self.token_file
+        token = read_token_file(token_file)
+        if token is None:
+            return
+        token_hash = hash_token(token)
+        # The file goes first: without it the row can never be used from here again
+        clear_token_file(token_file)
+
+        def work(db):
+            forgotten = db.execute(delete(SessionToken).where(SessionToken.token_hash == token_hash)).rowcount
+            db.commit()
+            return forgotten
+
+        db_executor.submit(work, None, lambda e: print(f"Warning: could not forget the saved login: {e}"))
+
+    @Slot()
+    def restore_session(self):
+        """Logs the saved user back in; emits session_restored only when the token is still valid."""
+        token_file = self.token_file
+        token = read_token_file(token_file)
+        if token is None:
+            return
+        token_hash = hash_token(token)
+
+        def work(db):
+            now = datetime.now(timezone.utc)
+            user_id = db.execute(
+                update(SessionToken)
+                .where(SessionToken.token_hash == token_hash, SessionToken.expires_at > now)
+                .values(last_used_at=now)
+                .returning(SessionToken.user_id)
+            ).scalar()
+            if user_id is None:
+                # Expired or revoked: forget it here and on disk
+                db.execute(delete(SessionToken).where(SessionToken.token_hash == token_hash))
+            db.commit()
+            return db.get(User, user_id) if user_id is not None else None
+
+        def on_result(user):
+            if user is None:
+                clear_token_file(token_file)
+            else:
+                self.session_restored.emit(user)
+
+        db_executor.submit(work, on_result, lambda e: print(f"Warning: could not restore the saved login: {e}"))
+
+    @Slot(User)
+    def count_sessions(self, user: User):
+        """Counts the devices ``user`` is still remembered on."""
+        user_id = user.id
+
+        def work(db):
+            return db.scalar(
+                select(func.count()).select_from(SessionToken)
+                .where(SessionToken.user_id == user_id, SessionToken.expires_at > datetime.now(timezone.utc))
+            )
+
+        db_executor.submit(work, self.session_count_fetched.emit)
+
+    @Slot(User)
+    def revoke_all_sessions(self, user: User):
+        """Signs ``user`` out of every remembered device, this one included, with one DELETE."""
+        user_id = user.id
+        token_file = self.token_file
+
+        def work(db):
+            revoked = db.execute(delete(SessionToken).where(SessionToken.user_id == user_id)).rowcount
+            db.commit()
+            clear_token_file(token_file)
+            return revoked
+
+        db_executor.submit(work, self.sessions_revoked.emit,
+                           lambda e: self.sessions_revoke_failed.emit(f"Failed to sign out devices: {e}"))
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from base import Base
+
+
+class SessionToken(Base):
+    """A "remember me" login on one device.
+
+    Only the SHA-256 of the random token is stored; the token itself lives in
+    the device's local token file.
+    """
+    __tablename__ = "session_tokens"
+
+    id = Column(Integer, primary_key=True)
+    token_hash = Column(String(64), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_session_tokens_token_hash', 'token_hash', unique=True),
+        Index('ix_session_tokens_user_id', 'user_id'),
+    )
+
+    user = relationship("User")
@@ -1,6 +1,6 @@
 from PySide6.QtCore import QObject, Signal, Slot
 
-from base import SessionLocal
+from base import db_executor
 from user import User
 
 
@@ -21,18 +21,26 @@ class SettingsController(QObject):
             self.settings_update_failed.emit("Full name must be 100 characters or less.")
             return
 
-        db = SessionLocal()
-        try:
-            user_to_update = db.query(User).filter(User.id == user.id).first()
+        user_id = user.id
+
+        def work(db):
+            user_to_update = db.query(User).filter(User.id == user_id).first()
             if not user_to_update:
-                self.settings_update_failed.emit("User not found.")
-                return
+                return None
 
             user_to_update.full_name = full_name
             db.commit()
             db.refresh(user_to_update)
-            self.settings_updated.emit(user_to_update)
-        except Exception as e:
-            self.settings_update_failed.emit(f"Failed to update settings: {e}")
-        finally:
-            db.close()
\ No newline at end of file
+            return user_to_update
+
+        db_executor.submit(
+            work,
+            self._on_settings_saved,
+            lambda e: self.settings_update_failed.emit(f"Failed to update settings: {e}"),
+        )
+
+    def _on_settings_saved(self, updated_user):
+        if updated_user:
+            self.settings_updated.emit(updated_user)
+        else:
+            self.settings_update_failed.emit("User not found.")
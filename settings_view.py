@@ -14,6 +14,7 @@ from user import User
 class SettingsView(QWidget):
     """A view for displaying and editing user settings."""
     save_requested = Signal(str)
+    revoke_sessions_requested = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -47,12 +48,35 @@ class SettingsView(QWidget):
         self.save_button.clicked.connect(self._on_save)
         main_layout.addWidget(self.save_button)
 
+        # --- Remembered devices ---
+        sessions_title = QLabel("Signed-in devices")
+        sessions_title.setStyleSheet("font-size: 18px; font-weight: 500; margin-top: 30px;")
+        main_layout.addWidget(sessions_title)
+
+        self.sessions_label = QLabel()
+        main_layout.addWidget(self.sessions_label)
+
+        self.revoke_sessions_button = QPushButton("Sign out all devices")
+        self.revoke_sessions_button.setFixedWidth(200)
+        self.revoke_sessions_button.clicked.connect(self.revoke_sessions_requested.emit)
+        main_layout.addWidget(self.revoke_sessions_button)
+        self.set_session_count(0)
+
     @Slot(User)
     def load_user_data(self, user: User):
         """Populates the form with the user's current data."""
         self.full_name_input.setText(user.full_name or "")
         self.email_input.setText(user.email)
 
+    @Slot(int)
+    def set_session_count(self, count: int):
+        """Shows how many devices keep this account signed in with "Remember me"."""
+        if count:
+            self.sessions_label.setText(f"Remembered on {count} device{'s' if count != 1 else ''}.")
+        else:
+            self.sessions_label.setText("Not remembered on any device.")
+        self.revoke_sessions_button.setEnabled(count > 0)
+
     def _on_save(self):
         """Emits the signal to save the updated settings."""
         self.save_requested.emit(self.full_name_input.text())
\ No newline at end of file
@@ -9,7 +9,7 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QGraphicsDropShadowEffect,
 )
-from PySide6.QtCore import Qt, Signal, Slot
+from PySide6.QtCore import Qt, QTimer, Signal, Slot
 from user import UserRole
 
 
@@ -31,7 +31,7 @@ class AnnouncementCard(QFrame):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
 
-        author_text = f"{announcement.author.email} • {announcement.timestamp.strftime('%b %d, %Y')}"
+        author_text = f"{announcement.author_email} • {announcement.timestamp.strftime('%b %d, %Y')}"
         author_label = QLabel(author_text)
         author_label.setStyleSheet("font-size: 13px; color: #9AA0A6;")
 
@@ -46,9 +46,16 @@ class AnnouncementCard(QFrame):
 class StreamView(QWidget):
     """The view for the 'Stream' tab, showing announcements."""
     post_announcement_requested = Signal(str)
+    more_announcements_requested = Signal(int)  # id of the oldest announcement shown
+
+    # Distance from the bottom of the list, in pixels, at which the next page is requested.
+    LOAD_MORE_THRESHOLD = 200
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._oldest_announcement_id = None
+        self._has_more = False
+        self._loading_more = False
 
         main_layout = QVBoxLayout(self)
         main_layout.setSpacing(20)
@@ -98,17 +105,20 @@ class StreamView(QWidget):
         main_layout.addWidget(self.post_box)
 
         # --- Announcements List ---
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet("QScrollArea { border: none; }")
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setStyleSheet("QScrollArea { border: none; }")
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._maybe_request_more)
+        scroll_bar.rangeChanged.connect(self._maybe_request_more)
 
         self.announcements_container = QWidget()
         self.announcements_layout = QVBoxLayout(self.announcements_container)
         self.announcements_layout.setAlignment(Qt.AlignTop)
         self.announcements_layout.setSpacing(15)
 
-        scroll_area.setWidget(self.announcements_container)
-        main_layout.addWidget(scroll_area)
+        self.scroll_area.setWidget(self.announcements_container)
+        main_layout.addWidget(self.scroll_area)
 
     def set_user_role(self, role: UserRole):
         """Show or hide the post box based on user role."""
@@ -119,17 +129,29 @@ class StreamView(QWidget):
     def display_class_code(self, code: str):
         self.class_code_value.setText(code)
 
-    @Slot(list)
-    def display_announcements(self, announcements: list):
-        """Clears and populates the view with announcement cards."""
+    @Slot(list, bool)
+    def display_announcements(self, announcements: list, has_more: bool = False):
+        """Clears and populates the view with the first page of announcements, newest first."""
         # Clear existing announcements
         while self.announcements_layout.count():
             child = self.announcements_layout.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
 
+        self._oldest_announcement_id = None
+        self.append_announcements(announcements, has_more)
+
+    @Slot(list, bool)
+    def append_announcements(self, announcements: list, has_more: bool):
+        """Adds an older page of announcements below the ones already shown."""
         for ann in announcements:
-            self.add_announcement_card(ann)
+            self.announcements_layout.addWidget(AnnouncementCard(ann))
+        if announcements:
+            self._oldest_announcement_id = announcements[-1].id
+        self._has_more = has_more and self._oldest_announcement_id is not None
+        self._loading_more = False
+        # New cards only count towards the layout once Qt has shown them.
+        QTimer.singleShot(0, self._maybe_request_more)
 
     @Slot(object)
     def add_announcement_card(self, announcement):
@@ -137,6 +159,26 @@ class StreamView(QWidget):
         card = AnnouncementCard(announcement)
         self.announcements_layout.insertWidget(0, card)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._maybe_request_more()
+
+    def _maybe_request_more(self, *args):
+        """Requests the next page once the list is scrolled near its bottom.
+
+        Also fires when the loaded cards do not fill the viewport, so a tall
+        window keeps loading until it can scroll. Hidden tabs never request.
+        """
+        if not self._has_more or self._loading_more or not self.isVisible():
+            return
+        # Measured from the layout's size hint: the scroll bar's range lags
+        # a few event loop passes behind newly added cards.
+        content_height = self.announcements_container.sizeHint().height()
+        visible_bottom = self.scroll_area.verticalScrollBar().value() + self.scroll_area.viewport().height()
+        if content_height - visible_bottom <= self.LOAD_MORE_THRESHOLD:
+            self._loading_more = True
+            self.more_announcements_requested.emit(self._oldest_announcement_id)
+
     def _on_post_clicked(self):
         content = self.post_input.toPlainText()
         if content:
@@ -1,11 +1,37 @@
 from PySide6.QtCore import QObject, Signal, Slot
+from sqlalchemy import case, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import joinedload
 
-from base import SessionLocal
+from base import db_executor
+from events import GradeChanged, stage_event
 from submission import Submission
 from user import User
 
 
+def upsert_submission(db, assignment_id: int, student_id: int, content: str) -> Submission:
+    """Turns in ``content`` for a student with one INSERT ... ON CONFLICT DO UPDATE ... RETURNING.
+
+    A resubmission replaces the content of the existing row, so two racing
+    turn-ins both succeed and the later one wins. The returned Submission is
+    detached and fully loaded from RETURNING; the caller commits.
+    """
+    statement = sqlite_insert(Submission).values(
+        assignment_id=assignment_id, student_id=student_id, content=content,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[Submission.assignment_id, Submission.student_id],
+        set_={"content": statement.excluded.content},
+    ).returning(Submission)
+    submission = db.scalars(statement, execution_options={"populate_existing": True}).one()
+    db.expunge(submission)  # keep the RETURNING values through commit; no refresh needed
+    return submission
+
+
+# (submission_id, grade) pairs per UPDATE; two bound parameters each plus the IN list.
+GRADE_BATCH_CHUNK = 300
+
+
 class SubmissionController(QObject):
     """Handles business logic for student submissions."""
 
@@ -13,67 +39,113 @@ class SubmissionController(QObject):
     submission_updated = Signal(object)
     all_submissions_fetched = Signal(list)
     submission_failed = Signal(str)
+    grades_committed = Signal(list)  # [(submission_id, grade)] actually written
+    grade_batch_failed = Signal(list, str)  # submission ids, reason
 
     @Slot(int, int)
     def get_submission(self, assignment_id: int, student_id: int):
         """Fetches a student's submission for a specific assignment."""
-        db = SessionLocal()
-        try:
-            submission = (
+        def work(db):
+            return (
                 db.query(Submission)
                 .filter_by(assignment_id=assignment_id, student_id=student_id)
                 .first()
             )
-            self.submission_fetched.emit(submission)
-        finally:
-            db.close()
+
+        db_executor.submit(work, self.submission_fetched.emit)
 
     @Slot(int)
     def get_all_submissions_for_assignment(self, assignment_id: int):
         """Fetches all submissions for a given assignment."""
-        db = SessionLocal()
-        try:
-            submissions = (
+        def work(db):
+            return (
                 db.query(Submission)
                 .options(joinedload(Submission.student))
                 .filter_by(assignment_id=assignment_id)
                 .all()
             )
-            self.all_submissions_fetched.emit(submissions)
-        finally:
-            db.close()
+
+        db_executor.submit(work, self.all_submissions_fetched.emit)
 
     @Slot(int, User, str)
     def create_or_update_submission(self, assignment_id: int, student: User, content: str):
-        """Creates a new submission or updates an existing one."""
-        db = SessionLocal()
-        try:
-            submission = db.query(Submission).filter_by(assignment_id=assignment_id, student_id=student.id).first()
-            if not submission:
-                submission = Submission(assignment_id=assignment_id, student_id=student.id)
-                db.add(submission)
-
-            submission.content = content
+        """Creates a new submission or updates an existing one in a single statement."""
+        student_id = student.id
+
+        def work(db):
+            submission = upsert_submission(db, assignment_id, student_id, content)
             db.commit()
-            db.refresh(submission)
-            self.submission_updated.emit(submission)
-        except Exception as e:
-            self.submission_failed.emit(f"Failed to update submission: {e}")
-        finally:
-            db.close()
+            return submission
+
+        db_executor.submit(
+            work,
+            self.submission_updated.emit,
+            lambda e: self.submission_failed.emit(f"Failed to update submission: {e}"),
+        )
 
     @Slot(int, float)
     def grade_submission(self, submission_id: int, grade: float):
         """Updates the grade for a specific submission."""
-        db = SessionLocal()
-        try:
+        def work(db):
             submission = db.query(Submission).filter_by(id=submission_id).first()
             if submission:
+                stage_event(db, GradeChanged(
+                    submission.id, submission.assignment_id, submission.student_id, submission.grade, grade))
                 submission.grade = grade
                 db.commit()
-                # We can re-emit the updated signal, or a new one if needed
-                self.submission_updated.emit(submission)
-        except Exception as e:
-            self.submission_failed.emit(f"Failed to grade submission: {e}")
-        finally:
-            db.close()
\ No newline at end of file
+                db.refresh(submission)
+            return submission
+
+        db_executor.submit(
+            work,
+            self._on_graded,
+            lambda e: self.submission_failed.emit(f"Failed to grade submission: {e}"),
+        )
+
+    def _on_graded(self, submission):
+        if submission:
+            # We can re-emit the updated signal, or a new one if needed
+            self.submission_updated.emit(submission)
+
+    @Slot(list)
+    def grade_submissions(self, grades: list):
+        """Applies a batch of (submission_id, grade) pairs in one transaction.
+
+        Each chunk is a single ``UPDATE ... SET grade = CASE id ... END`` with
+        RETURNING, so ids that no longer exist are simply left out of
+        ``grades_committed``. The previous grades are read first, in the same
+        transaction, for the ``GradeChanged`` events. A failure rolls the whole
+        batch back.
+        """
+        latest = dict(grades)  # a later edit of the same submission wins
+        if not latest:
+            return
+
+        def work(db):
+            items = list(latest.items())
+            committed = []
+            for start in range(0, len(items), GRADE_BATCH_CHUNK):
+                chunk = dict(items[start:start + GRADE_BATCH_CHUNK])
+                previous = db.execute(
+                    select(Submission.id, Submission.assignment_id, Submission.student_id, Submission.grade)
+                    .where(Submission.id.in_(chunk))
+                ).all()
+                statement = (
+                    update(Submission)
+                    .where(Submission.id.in_(chunk))
+                    .values(grade=case(chunk, value=Submission.id))
+                    .returning(Submission.id, Submission.grade)
+                    .execution_options(synchronize_session=False)
+                )
+                committed.extend(tuple(row) for row in db.execute(statement))
+                for sid, assignment_id, student_id, old in previous:
+                    stage_event(db, GradeChanged(sid, assignment_id, student_id, old, chunk[sid]))
+            db.commit()
+            return committed
+
+        db_executor.submit(
+            work,
+            self.grades_committed.emit,
+            lambda e: self.grade_batch_failed.emit(list(latest), f"Failed to save grades: {e}"),
+        )
+
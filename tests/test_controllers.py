@@ -1,17 +1,38 @@
 """
 Test cases for controller business logic.
 """
+import math
+import random
+import statistics
 import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy import inspect, insert
 
 from auth_controller import AuthController
-from classroom_controller import ClassroomController
-from assignment_controller import AssignmentController
+from classroom_controller import ClassroomController, ClassCodeCache, INVALID_CODE_TTL, class_codes
+from assignment_controller import AssignmentController, EARLIER_ASSIGNMENTS_PAGE_SIZE, UPCOMING_ASSIGNMENTS_PAGE_SIZE
 from submission_controller import SubmissionController
-from announcement_controller import AnnouncementController
+from announcement_controller import AnnouncementController, ANNOUNCEMENT_PAGE_SIZE
 from settings_controller import SettingsController
+from session_controller import SessionController, hash_token
+from session_token import SessionToken
+from gradebook_controller import GradebookController
+from gradebook import Gradebook
+from grade_stats import GradeStats
+from grade_stats_controller import GradeStatsController
+from people_controller import PeopleController, EMAIL_LOOKUP_CHUNK, read_roster_emails
+from class_bundle_controller import ClassBundleController, BUNDLE_PARTS
+from view_cache import ViewCache, fingerprint
+from class_prefetcher import ClassPrefetcher
+from base import CpuExecutor, QueryExecutor, _PoolExecutor, db_executor
+from events import event_bus, stage_event, AssignmentCreated, GradeChanged, StudentJoined, AnnouncementPosted
 from user import User, UserRole
+from classroom import Classroom, student_classroom_association
+from assignment import Assignment
+from submission import Submission
+from announcement import Announcement
 
 
 class TestAuthController:
@@ -34,6 +55,111 @@ class TestAuthController:
             controller.login("nonexistent@example.com", "wrongpassword")
             mock_failed.emit.assert_called_once()
     
+    def test_login_ignores_email_case(self, db_session, sample_teacher):
+        """An email typed with capitals or spaces still finds the account."""
+        controller = AuthController()
+        logged_in = []
+        controller.login_successful.connect(logged_in.append)
+
+        controller.login(" Teacher@Example.COM", "password123")
+
+        assert [user.id for user in logged_in] == [sample_teacher.id]
+
+    def test_signup_rejects_email_differing_in_case(self, db_session, sample_teacher):
+        """An address that only differs by case is the same account."""
+        controller = AuthController()
+        failures = []
+        controller.signup_failed.connect(failures.append)
+
+        controller.signup("TEACHER@example.com", "password123", "password123", UserRole.student.value)
+
+        assert failures == ["An account with this email already exists."]
+        assert db_session.query(User).count() == 1
+
+    def test_login_rehashes_outdated_cost(self, db_session, sample_teacher, monkeypatch):
+        """A hash made at another cost is replaced after a successful login."""
+        import user as user_module
+        from user import hash_rounds
+        monkeypatch.setattr(user_module, "BCRYPT_ROUNDS", 4)
+        controller = AuthController()
+        rehashed = []
+        logged_in = []
+        controller.password_rehashed.connect(rehashed.append)
+        controller.login_successful.connect(logged_in.append)
+
+        controller.login("teacher@example.com", "password123")
+
+        assert rehashed == [sample_teacher.id]
+        assert hash_rounds(logged_in[0].password_hash) == 4
+        db_session.expire_all()
+        stored = db_session.get(User, sample_teacher.id)
+        assert hash_rounds(stored.password_hash) == 4
+        assert stored.check_password("password123")
+
+    def test_login_keeps_current_hash(self, db_session, sample_teacher, query_budget):
+        """A hash at the configured cost is left alone; login is a single read."""
+        controller = AuthController()
+        rehashed = []
+        controller.password_rehashed.connect(rehashed.append)
+        old_hash = sample_teacher.password_hash
+
+        with query_budget(1):
+            controller.login("teacher@example.com", "password123")
+
+        assert rehashed == []
+        db_session.expire_all()
+        assert db_session.get(User, sample_teacher.id).password_hash == old_hash
+
+    def test_wrong_password_not_rehashed(self, db_session, sample_teacher, monkeypatch):
+        """Only a verified password is ever rehashed."""
+        import user as user_module
+        monkeypatch.setattr(user_module, "BCRYPT_ROUNDS", 4)
+        controller = AuthController()
+        rehashed, failures = [], []
+        controller.password_rehashed.connect(rehashed.append)
+        controller.login_failed.connect(failures.append)
+
+        controller.login("teacher@example.com", "wrong-password")
+
+        assert failures == ["Invalid email or password."]
+        assert rehashed == []
+
+    def test_signup_uses_configured_cost(self, db_session, monkeypatch):
+        """New accounts are hashed at BCRYPT_ROUNDS."""
+        import user as user_module
+        from user import hash_rounds
+        monkeypatch.setattr(user_module, "BCRYPT_ROUNDS", 5)
+
+        AuthController().signup("cost@example.com", "password123", "password123", UserRole.student.value)
+
+        stored = db_session.query(User).filter_by(email="cost@example.com").one()
+        assert hash_rounds(stored.password_hash) == 5
+        assert stored.check_password("password123")
+
+    def test_threaded_login_hashes_off_gui_thread(self, db_session, sample_teacher, qtbot):
+        """bcrypt runs on the hash pool, and the result comes back on the GUI thread."""
+        import threading
+        import user as user_module
+        from base import hash_executor
+
+        db_executor.set_max_workers(2)
+        hash_executor.set_max_workers(2)
+        gui_thread = threading.get_ident()
+        hashed_on = []
+        verify = user_module.verify_password
+
+        def tracking_verify(password, password_hash):
+            hashed_on.append(threading.get_ident())
+            return verify(password, password_hash)
+
+        controller = AuthController()
+        with patch("auth_controller.verify_password", tracking_verify):
+            with qtbot.waitSignal(controller.login_successful, timeout=5000) as blocker:
+                controller.login("teacher@example.com", "password123")
+
+        assert blocker.args[0].id == sample_teacher.id
+        assert hashed_on and hashed_on[0] != gui_thread
+
     def test_signup_success(self, db_session):
         """Test successful signup."""
         controller = AuthController()
@@ -92,6 +218,75 @@ class TestClassroomController:
             controller.join_class("INVALID", sample_student)
             mock_failed.emit.assert_called_once()
     
+    def test_join_classroom_already_member(self, db_session, sample_student, sample_classroom, query_budget):
+        """A second join is refused by the membership key without loading the roster."""
+        code, student = sample_classroom.class_code, User(id=sample_student.id)
+        controller = ClassroomController()
+        failures = []
+        controller.join_class_failed.connect(failures.append)
+
+        # Code lookup, INSERT OR IGNORE, then the class with its teacher
+        with query_budget(3):
+            controller.join_class(code, student)
+        # The code is cached; the ignored insert is the only statement
+        with query_budget(1):
+            controller.join_class(code, student)
+
+        assert failures == ["You are already in this class."]
+        assert db_session.query(student_classroom_association).count() == 1
+
+    def test_join_classroom_caches_invalid_code(self, db_session, sample_student, query_budget):
+        """An invalid code is only looked up once."""
+        controller = ClassroomController()
+        failures = []
+        controller.join_class_failed.connect(failures.append)
+        student = User(id=sample_student.id)
+
+        with query_budget(1):
+            controller.join_class("NOSUCHCODE", student)
+        with query_budget(0):
+            controller.join_class("NOSUCHCODE", student)
+
+        assert failures == ["Invalid class code."] * 2
+
+    def test_invalid_code_expires_for_class_created_elsewhere(self, db_session, sample_teacher, sample_student):
+        """A code that missed is looked up again once another client may have created its class."""
+        now = [0.0]
+        controller = ClassroomController()
+        joined, failures = [], []
+        controller.class_joined.connect(joined.append)
+        controller.join_class_failed.connect(failures.append)
+        student = User(id=sample_student.id)
+
+        with patch.object(class_codes, "_clock", lambda: now[0]):
+            controller.join_class("LATECLASS1", student)
+            # Created by another client, so this process never discards the cached miss
+            db_session.add(Classroom(name="Late", class_code="LATECLASS1", teacher_id=sample_teacher.id))
+            db_session.commit()
+            controller.join_class("LATECLASS1", student)
+            now[0] += INVALID_CODE_TTL
+            controller.join_class("LATECLASS1", student)
+
+        assert failures == ["Invalid class code."] * 2
+        assert [classroom.name for classroom in joined] == ["Late"]
+
+    def test_class_code_cache_evicts_least_recent(self):
+        """Valid and invalid codes are kept in separate, bounded LRUs."""
+        cache = ClassCodeCache(maxsize=2, invalid_maxsize=1)
+        cache.put("AAAAAAAAAA", 1)
+        cache.put("BBBBBBBBBB", 2)
+        cache.get("AAAAAAAAAA")
+        cache.put("CCCCCCCCCC", 3)
+        cache.put("XXXXXXXXXX", None)
+        cache.put("YYYYYYYYYY", None)
+
+        assert cache.get("AAAAAAAAAA") == 1
+        assert cache.get("BBBBBBBBBB") is ClassCodeCache.MISSING
+        assert cache.get("XXXXXXXXXX") is ClassCodeCache.MISSING
+        assert cache.get("YYYYYYYYYY") is None
+        cache.discard("YYYYYYYYYY")
+        assert cache.get("YYYYYYYYYY") is ClassCodeCache.MISSING
+
     def test_get_user_classrooms_teacher(self, db_session, sample_teacher, sample_classroom):
         """Test getting classrooms for a teacher."""
         controller = ClassroomController()
@@ -111,6 +306,147 @@ class TestClassroomController:
             controller.get_classes_for_user(sample_student)
             mock_fetched.emit.assert_called_once()
 
+    def test_get_class_by_id_counts_roster(self, db_session, sample_student, sample_classroom):
+        """Opening a class loads the teacher and a roster count, not the students."""
+        sample_classroom.students.append(sample_student)
+        db_session.commit()
+        controller = ClassroomController()
+        fetched = []
+        controller.class_fetched.connect(fetched.append)
+
+        controller.get_class_by_id(sample_classroom.id)
+
+        classroom = fetched[0]
+        assert classroom.roster_size == 1
+        assert classroom.teacher.email == "teacher@example.com"
+        assert "students" not in inspect(classroom).dict
+
+
+class TestClassBundleController:
+    """Test cases for loading every part of a class in one request."""
+
+    def test_delivers_every_part(self, db_session, sample_student, sample_classroom, sample_assignment,
+                                 sample_announcement, query_budget):
+        """Each part is one statement and arrives tagged with its class; timings cover all parts."""
+        classroom_id, student_id = sample_classroom.id, sample_student.id
+        assignment_id, announcement_id = sample_assignment.id, sample_announcement.id
+        sample_classroom.students.append(sample_student)
+        db_session.commit()
+        controller = ClassBundleController()
+        received, bundles = {}, []
+        controller.classroom_loaded.connect(lambda cid, classroom: received.setdefault("classroom", (cid, classroom)))
+        controller.announcements_loaded.connect(lambda cid, page, more: received.setdefault("announcements", (cid, page)))
+        controller.assignments_loaded.connect(lambda cid, rows: received.setdefault("assignments", (cid, rows)))
+        controller.roster_loaded.connect(lambda cid, page, more: received.setdefault("roster", (cid, page)))
+        controller.bundle_loaded.connect(bundles.append)
+
+        with query_budget(4):
+            controller.load_class(classroom_id)
+
+        assert list(received) == list(BUNDLE_PARTS)
+        assert {cid for cid, _ in received.values()} == {classroom_id}
+        classroom = received["classroom"][1]
+        assert (classroom.roster_size, classroom.teacher.email) == (1, "teacher@example.com")
+        assert [a.id for a in received["assignments"][1]] == [assignment_id]
+        assert [a.id for a in received["announcements"][1]] == [announcement_id]
+        assert [s.id for s in received["roster"][1]] == [student_id]
+        timings = bundles[0]
+        assert timings is controller.last_timings and timings.complete
+        assert set(timings.parts) == set(BUNDLE_PARTS)
+        assert timings.total == max(timings.parts.values())
+
+    def test_missing_class(self, db_session):
+        controller = ClassBundleController()
+        classrooms, bundles = [], []
+        controller.classroom_loaded.connect(lambda cid, classroom: classrooms.append((cid, classroom)))
+        controller.bundle_loaded.connect(bundles.append)
+
+        controller.load_class(999)
+
+        assert classrooms == [(999, None)]
+        assert bundles[0].complete
+
+    def test_parts_load_on_separate_workers(self, db_session, sample_classroom, qtbot):
+        """With a thread pool every part runs off the GUI thread, each in its own session."""
+        import threading
+
+        db_executor.set_max_workers(4)
+        gui_thread = threading.get_ident()
+        sessions = []
+        controller = ClassBundleController()
+        with patch("class_bundle_controller.roster_page",
+                   lambda db, classroom_id: sessions.append((threading.get_ident(), id(db))) or ([], False)):
+            with qtbot.waitSignal(controller.bundle_loaded, timeout=5000) as blocker:
+                controller.load_class(sample_classroom.id)
+
+        assert blocker.args[0].complete
+        assert sessions and sessions[0][0] != gui_thread
+
+
+class TestClassPrefetcher:
+    """Test cases for cancellable, bounded class prefetches."""
+
+    @pytest.fixture
+    def gated_executor(self, qtbot):
+        """A one-worker pool held busy until the test releases it."""
+        import threading
+
+        gate = threading.Event()
+        db_executor.set_max_workers(1)
+        db_executor.submit(lambda db: gate.wait(5))
+        yield gate
+        gate.set()
+        db_executor.wait_for_done()
+
+    def _settle(self, qtbot, gate):
+        gate.set()
+        db_executor.wait_for_done()
+        qtbot.wait(50)  # deliver queued results
+
+    def test_cancelled_request_skips_work_and_delivery(self, db_session, sample_classroom, gated_executor, qtbot):
+        controller = ClassBundleController()
+        delivered, ran = [], []
+        controller.classroom_loaded.connect(lambda cid, classroom: delivered.append(cid))
+        with patch("class_bundle_controller.classroom_summary", lambda db, cid: ran.append(cid)):
+            request = controller.load_class(sample_classroom.id, ["classroom"])
+            request.cancel()
+            self._settle(qtbot, gated_executor)
+
+        assert (ran, delivered) == ([], [])
+        assert request.pending == ("classroom",)
+
+    def test_in_flight_cap_cancels_oldest(self, db_session, gated_executor, qtbot):
+        controller = ClassBundleController()
+        delivered = []
+        controller.classroom_loaded.connect(lambda cid, classroom: delivered.append(cid))
+        prefetcher = ClassPrefetcher(controller, ViewCache(), max_in_flight=2)
+
+        for classroom_id in (1, 2, 2, 3):
+            prefetcher.prefetch(classroom_id)
+        assert prefetcher.in_flight == [2, 3]
+        assert prefetcher.pending_parts(3) == ("classroom", "announcements", "assignments")
+
+        prefetcher.cancel_all(keep=3)
+        self._settle(qtbot, gated_executor)
+        assert delivered == [3]
+        assert prefetcher.in_flight == []
+
+    def test_fresh_cache_needs_no_prefetch(self, db_session):
+        cache = ViewCache()
+        for view in ("class", "stream", "classwork"):
+            cache.put(view, 1, [])
+        cache.invalidate("stream", 1)
+        controller = ClassBundleController()
+        prefetcher = ClassPrefetcher(controller, cache)
+
+        prefetcher.prefetch(1)
+        assert controller.last_timings.requested == ("announcements",)
+
+        controller.last_timings = None
+        cache.put("stream", 1, [])
+        prefetcher.prefetch(1)
+        assert controller.last_timings is None
+
 
 class TestAssignmentController:
     """Test cases for AssignmentController."""
@@ -141,6 +477,107 @@ class TestAssignmentController:
         with patch.object(controller, 'global_assignments_fetched') as mock_fetched:
             controller.get_all_assignments_for_user(sample_student)
             mock_fetched.emit.assert_called_once()
+
+    def _enrol_with_assignments(self, db_session, student, classroom, due_dates):
+        classroom.students.append(student)
+        for i, due_date in enumerate(due_dates):
+            db_session.add(Assignment(title=f"A{i}", due_date=due_date, points=10, classroom_id=classroom.id))
+        db_session.commit()
+
+    def test_get_user_assignments_window(self, db_session, sample_student, sample_classroom):
+        """The upcoming window keeps undated work, sorts soonest first and honours the limit."""
+        now = datetime(2026, 6, 1)
+        self._enrol_with_assignments(db_session, sample_student, sample_classroom, [
+            now - timedelta(days=3), now + timedelta(days=5), now + timedelta(days=1), None,
+        ])
+        controller = AssignmentController()
+        fetched = []
+        controller.global_assignments_fetched.connect(fetched.append)
+
+        controller.get_all_assignments_for_user(sample_student, due_after=now)
+        controller.get_all_assignments_for_user(sample_student, due_after=now, limit=2)
+        controller.get_all_assignments_for_user(sample_student, due_before=now)
+
+        assert [a.title for a in fetched[0]] == ["A2", "A1", "A3"]
+        assert [a.title for a in fetched[1]] == ["A2", "A1"]
+        assert [a.title for a in fetched[2]] == ["A0"]
+        assert fetched[0][0].classroom.name == sample_classroom.name
+
+    def test_get_user_assignments_only_joined_classes(self, db_session, sample_student, sample_teacher,
+                                                      sample_classroom, sample_assignment):
+        """Assignments from classes the student has not joined are left out."""
+        other = Classroom(name="Other", class_code="OTHER00001", teacher_id=sample_teacher.id)
+        db_session.add(other)
+        db_session.flush()
+        db_session.add(Assignment(title="Elsewhere", points=10, classroom_id=other.id))
+        sample_classroom.students.append(sample_student)
+        db_session.commit()
+        controller = AssignmentController()
+        fetched = []
+        controller.global_assignments_fetched.connect(fetched.append)
+
+        controller.get_all_assignments_for_user(sample_student)
+
+        assert [a.id for a in fetched[0]] == [sample_assignment.id]
+
+    def test_earlier_assignment_pages(self, db_session, sample_student, sample_classroom):
+        """Paging backwards visits every past assignment once, even across shared due dates."""
+        now = datetime(2026, 6, 1)
+        due_dates = [now - timedelta(days=1 + i // 3) for i in range(EARLIER_ASSIGNMENTS_PAGE_SIZE * 2)]
+        self._enrol_with_assignments(db_session, sample_student, sample_classroom, due_dates)
+        controller = AssignmentController()
+        pages = []
+        controller.earlier_assignments_fetched.connect(lambda page, has_more: pages.append((page, has_more)))
+
+        seen = self._page_backwards(controller, pages, sample_student, now)
+
+        assert len({a.id for a in seen}) == len(seen) == len(due_dates)
+        assert [a.due_date for a in seen] == sorted(due_dates, reverse=True)
+
+    def test_earlier_assignment_pages_within_one_due_date(self, db_session, sample_student, sample_classroom):
+        """More assignments than fit on a page sharing one due date are all visited."""
+        now = datetime(2026, 6, 1)
+        due_dates = [now - timedelta(days=2)] + [now - timedelta(days=1)] * (EARLIER_ASSIGNMENTS_PAGE_SIZE * 2 + 1)
+        self._enrol_with_assignments(db_session, sample_student, sample_classroom, due_dates)
+        controller = AssignmentController()
+        pages = []
+        controller.earlier_assignments_fetched.connect(lambda page, has_more: pages.append((page, has_more)))
+
+        seen = self._page_backwards(controller, pages, sample_student, now)
+
+        assert len(pages) == 3
+        assert len({a.id for a in seen}) == len(seen) == len(due_dates)
+        assert [a.due_date for a in seen] == sorted(due_dates, reverse=True)
+
+    def test_later_assignment_pages(self, db_session, sample_student, sample_classroom):
+        """Paging forwards from the window start visits every upcoming assignment once, undated ones last."""
+        now = datetime(2026, 6, 1)
+        due_dates = ([now - timedelta(days=1)] + [now] * 3 + [now + timedelta(days=1)] * UPCOMING_ASSIGNMENTS_PAGE_SIZE
+                     + [now + timedelta(days=2)] + [None] * 3)
+        self._enrol_with_assignments(db_session, sample_student, sample_classroom, due_dates)
+        controller = AssignmentController()
+        pages = []
+        controller.later_assignments_fetched.connect(lambda page, has_more: pages.append((page, has_more)))
+
+        seen, due_after, after_id, has_more = [], now, None, True
+        while has_more:
+            controller.get_later_assignments_for_user(sample_student, due_after, after_id)
+            page, has_more = pages[-1]
+            seen.extend(page)
+            due_after, after_id = page[-1].due_date, page[-1].id
+
+        assert len(pages) == 2
+        assert len({a.id for a in seen}) == len(seen) == len(due_dates) - 1
+        assert [a.due_date for a in seen] == due_dates[1:]
+
+    def _page_backwards(self, controller, pages, student, window_start):
+        seen, due_before, before_id, has_more = [], window_start, None, True
+        while has_more:
+            controller.get_earlier_assignments_for_user(student, due_before, before_id)
+            page, has_more = pages[-1]
+            seen.extend(page)
+            due_before, before_id = page[-1].due_date, page[-1].id
+        return seen
     
     def test_get_assignment_by_id(self, db_session, sample_assignment):
         """Test getting assignment by ID."""
@@ -177,6 +614,39 @@ class TestSubmissionController:
             controller.create_or_update_submission(sample_submission.assignment_id, sample_submission.student, "Updated submission")
             mock_updated.emit.assert_called_once()
     
+    def test_turn_in_is_one_upsert(self, db_session, sample_assignment, sample_student, query_budget):
+        """Turning in twice writes one row with one statement each time, and the result is usable detached."""
+        controller = SubmissionController()
+        updated = []
+        controller.submission_updated.connect(updated.append)
+        assignment_id, student = sample_assignment.id, User(id=sample_student.id)
+
+        with query_budget(1):
+            controller.create_or_update_submission(assignment_id, student, "first.pdf")
+        with query_budget(1):
+            controller.create_or_update_submission(assignment_id, student, "second.pdf")
+
+        assert updated[0].id == updated[1].id
+        assert updated[1].content == "second.pdf"
+        assert updated[1].grade is None
+        assert db_session.query(Submission).filter_by(assignment_id=sample_assignment.id).count() == 1
+
+    def test_turn_in_keeps_grade(self, db_session, sample_submission):
+        """Re-submitting only replaces the content; the grade and timestamp stay."""
+        sample_submission.grade = 80.0
+        db_session.commit()
+        turned_in_at = sample_submission.timestamp
+        controller = SubmissionController()
+        updated = []
+        controller.submission_updated.connect(updated.append)
+
+        controller.create_or_update_submission(sample_submission.assignment_id, sample_submission.student, "redo.pdf")
+
+        assert updated[0].id == sample_submission.id
+        assert updated[0].grade == 80.0
+        assert updated[0].timestamp == turned_in_at
+        assert updated[0].content == "redo.pdf"
+
     def test_get_assignment_submissions(self, db_session, sample_assignment, sample_submission):
         """Test getting submissions for an assignment."""
         controller = SubmissionController()
@@ -193,6 +663,44 @@ class TestSubmissionController:
             controller.grade_submission(sample_submission.id, 90.0)
             mock_updated.emit.assert_called_once()
     
+    def _submissions(self, db_session, assignment, count):
+        students = [User(email=f"g{i}@example.com", role=UserRole.student, password_hash="x") for i in range(count)]
+        db_session.add_all(students)
+        db_session.flush()
+        submissions = [Submission(assignment_id=assignment.id, student_id=s.id, content="work") for s in students]
+        db_session.add_all(submissions)
+        db_session.commit()
+        return [submission.id for submission in submissions]
+
+    def test_grade_submissions_batch(self, db_session, sample_assignment, query_budget):
+        """A batch of grades is written with one UPDATE (after reading the old grades) and reported back."""
+        ids = self._submissions(db_session, sample_assignment, 20)
+        controller = SubmissionController()
+        committed = []
+        controller.grades_committed.connect(committed.append)
+
+        with query_budget(2):
+            controller.grade_submissions([(sid, float(i)) for i, sid in enumerate(ids)] + [(ids[0], 99.0), (999999, 1.0)])
+
+        assert sorted(committed[0]) == sorted([(ids[0], 99.0)] + [(sid, float(i)) for i, sid in enumerate(ids)][1:])
+        db_session.expire_all()
+        assert db_session.get(Submission, ids[0]).grade == 99.0
+        assert db_session.get(Submission, ids[5]).grade == 5.0
+
+    def test_grade_submissions_rolls_back_batch(self, db_session, sample_assignment):
+        """One invalid grade fails the whole batch and leaves every row untouched."""
+        ids = self._submissions(db_session, sample_assignment, 3)
+        controller = SubmissionController()
+        failures = []
+        controller.grade_batch_failed.connect(lambda failed_ids, reason: failures.append((failed_ids, reason)))
+
+        controller.grade_submissions([(ids[0], 50.0), (ids[1], -1.0), (ids[2], 70.0)])
+
+        assert failures[0][0] == ids
+        assert "Failed to save grades" in failures[0][1]
+        db_session.expire_all()
+        assert all(db_session.get(Submission, sid).grade is None for sid in ids)
+
     def test_grade_submission_invalid_range(self, db_session, sample_submission):
         """Test grading submission with invalid grade range."""
         controller = SubmissionController()
@@ -227,6 +735,251 @@ class TestAnnouncementController:
             controller.get_announcements_for_class(sample_classroom.id)
             mock_fetched.emit.assert_called_once()
 
+    def _post_announcements(self, db_session, classroom, author, count, timestamp_of):
+        for i in range(count):
+            db_session.add(Announcement(content=f"Post {i}", classroom_id=classroom.id,
+                                        author_id=author.id, timestamp=timestamp_of(i)))
+        db_session.commit()
+
+    def test_first_page_only(self, db_session, sample_classroom, sample_teacher):
+        """Opening a stream loads a single page, newest first."""
+        start = datetime(2026, 1, 1)
+        self._post_announcements(db_session, sample_classroom, sample_teacher, ANNOUNCEMENT_PAGE_SIZE + 5,
+                                 lambda i: start + timedelta(minutes=i))
+        controller = AnnouncementController()
+        pages = []
+        controller.announcements_fetched.connect(lambda page, has_more: pages.append((page, has_more)))
+
+        controller.get_announcements_for_class(sample_classroom.id)
+
+        page, has_more = pages[0]
+        assert len(page) == ANNOUNCEMENT_PAGE_SIZE
+        assert has_more
+        assert page[0].content == f"Post {ANNOUNCEMENT_PAGE_SIZE + 4}"
+        assert page[0].author.email == sample_teacher.email
+
+    def test_keyset_pages_cover_stream_once(self, db_session, sample_classroom, sample_teacher):
+        """Following the cursor visits every announcement once, even with equal timestamps."""
+        same_minute = datetime(2026, 1, 1, 9, 0)
+        total = ANNOUNCEMENT_PAGE_SIZE * 2 + 3
+        self._post_announcements(db_session, sample_classroom, sample_teacher, total,
+                                 lambda i: same_minute + timedelta(minutes=i // 7))
+        controller = AnnouncementController()
+        first, more = [], []
+        controller.announcements_fetched.connect(lambda page, has_more: first.append((page, has_more)))
+        controller.more_announcements_fetched.connect(lambda class_id, page, has_more: more.append((page, has_more)))
+
+        controller.get_announcements_for_class(sample_classroom.id)
+        seen, has_more = list(first[0][0]), first[0][1]
+        while has_more:
+            controller.get_more_announcements(sample_classroom.id, seen[-1].id)
+            page, has_more = more[-1]
+            seen.extend(page)
+
+        assert len(more) == 2
+        assert len(seen) == total
+        assert len({a.id for a in seen}) == total
+        keys = [(a.timestamp, a.id) for a in seen]
+        assert keys == sorted(keys, reverse=True)
+
+
+class TestPeopleController:
+    """Test cases for PeopleController roster loading and import."""
+
+    def _students(self, db_session, count):
+        students = [User(email=f"s{i}@example.com", role=UserRole.student, password_hash="x") for i in range(count)]
+        db_session.add_all(students)
+        db_session.commit()
+        return students
+
+    def test_read_roster_emails(self):
+        """The email column is found by header and duplicates and blanks are dropped."""
+        lines = ["Name,Email", "Ann, ann@example.com", "Bob,", "Ann again,ann@example.com", "Cy,cy@example.com"]
+        assert read_roster_emails(lines) == ["ann@example.com", "cy@example.com"]
+        assert read_roster_emails(["a@example.com", "b@example.com"]) == ["a@example.com", "b@example.com"]
+
+    def test_sync_roster_diff(self, db_session, sample_classroom, sample_teacher):
+        """Listed students are added, unlisted ones removed and unknown emails reported."""
+        students = self._students(db_session, 4)
+        sample_classroom.students.extend(students[:2])
+        db_session.commit()
+        controller = PeopleController()
+        reports = []
+        controller.roster_synced.connect(reports.append)
+
+        controller.sync_roster(sample_classroom.id, [
+            "s1@example.com", "s2@example.com", "s3@example.com", "ghost@example.com", sample_teacher.email,
+        ])
+
+        report = reports[0]
+        assert report.added == ["s2@example.com", "s3@example.com"]
+        assert report.removed == ["s0@example.com"]
+        assert report.unknown == ["ghost@example.com", sample_teacher.email]
+        assert report.roster_size == 3
+        db_session.expire_all()
+        assert sorted(s.email for s in sample_classroom.students) == ["s1@example.com", "s2@example.com", "s3@example.com"]
+
+    def test_sync_roster_keeps_unlisted(self, db_session, sample_classroom):
+        """Without remove_missing the import only adds."""
+        students = self._students(db_session, 2)
+        sample_classroom.students.append(students[0])
+        db_session.commit()
+        controller = PeopleController()
+        reports = []
+        controller.roster_synced.connect(reports.append)
+
+        controller.sync_roster(sample_classroom.id, ["s1@example.com"], False)
+
+        assert reports[0].added == ["s1@example.com"]
+        assert reports[0].removed == []
+        assert reports[0].roster_size == 2
+
+    def test_sync_roster_matches_email_case(self, db_session, sample_classroom):
+        """Roster emails are matched without regard to case or padding."""
+        self._students(db_session, 1)
+        controller = PeopleController()
+        reports = []
+        controller.roster_synced.connect(reports.append)
+
+        controller.sync_roster(sample_classroom.id, [" S0@Example.com", "s0@example.com"])
+
+        assert reports[0].added == ["s0@example.com"]
+        assert reports[0].unknown == []
+
+    def test_sync_roster_large_file(self, db_session, sample_classroom, query_budget):
+        """A file longer than one lookup chunk still costs a handful of statements."""
+        count = EMAIL_LOOKUP_CHUNK * 2 + 10
+        db_session.execute(insert(User.__table__), [
+            {"email": f"bulk{i}@example.com", "role": UserRole.student.name, "password_hash": "x"} for i in range(count)
+        ])
+        db_session.commit()
+        classroom_id = sample_classroom.id
+        controller = PeopleController()
+        reports = []
+        controller.roster_synced.connect(reports.append)
+
+        with query_budget(5):
+            controller.sync_roster(classroom_id, [f"bulk{i}@example.com" for i in range(count)])
+
+        assert len(reports[0].added) == count
+        assert reports[0].roster_size == count
+
+
+class TestGradebookController:
+    """Test cases for the classroom gradebook."""
+
+    def test_gradebook_matrix(self, db_session, sample_classroom, sample_assignment, query_budget):
+        """Grades land in (student, assignment) cells and missing ones are NaN."""
+        students = [User(email=f"b{i}@example.com", role=UserRole.student, password_hash="x") for i in range(3)]
+        sample_classroom.students.extend(students)
+        second = Assignment(title="Quiz", points=10, classroom_id=sample_classroom.id)
+        db_session.add(second)
+        db_session.flush()
+        db_session.add_all([
+            Submission(assignment_id=sample_assignment.id, student_id=students[0].id, grade=90.0),
+            Submission(assignment_id=second.id, student_id=students[2].id, grade=7.5),
+            Submission(assignment_id=second.id, student_id=students[1].id),  # turned in, not graded
+        ])
+        db_session.commit()
+        classroom_id = sample_classroom.id
+        controller = GradebookController()
+        fetched = []
+        controller.gradebook_fetched.connect(fetched.append)
+
+        with query_budget(3):
+            controller.get_gradebook(classroom_id)
+
+        gradebook = fetched[0]
+        assert [email for _, email in gradebook.students] == ["b0@example.com", "b1@example.com", "b2@example.com"]
+        assert (gradebook.row_count, gradebook.column_count) == (3, 2)
+        first, quiz = gradebook.column_of(sample_assignment.id), gradebook.column_of(second.id)
+        assert gradebook.grade(0, first) == 90.0
+        assert gradebook.grade(2, quiz) == 7.5
+        assert math.isnan(gradebook.grade(1, quiz))
+        assert sum(not math.isnan(grade) for grade in gradebook.column(quiz)) == 1
+
+    def test_gradebook_set_grade(self):
+        """Grades are stored by ids; unknown ids are ignored."""
+        gradebook = Gradebook(1, [(10, "a@example.com")], [(20, "A", 100), (21, "B", 100)])
+
+        assert gradebook.set_grade(10, 21, 55.0)
+        assert not gradebook.set_grade(99, 21, 1.0)
+        assert gradebook.grade(0, 1) == 55.0
+        assert gradebook.set_grade(10, 21, None)
+        assert math.isnan(gradebook.grade(0, 1))
+
+
+class TestGradeStats:
+    """Test cases for incremental grade statistics."""
+
+    def test_matches_full_recompute(self):
+        """Replacing grades one at a time agrees with statistics over the final column."""
+        rng = random.Random(7)
+        grades = [round(rng.uniform(0, 100), 1) for _ in range(200)]
+        stats = GradeStats(1, 100, grades)
+        for _ in range(300):
+            index = rng.randrange(len(grades))
+            new = round(rng.uniform(0, 100), 1)
+            stats.replace(grades[index], new)
+            grades[index] = new
+
+        assert stats.count == len(grades)
+        assert stats.mean == pytest.approx(statistics.fmean(grades))
+        assert stats.std == pytest.approx(statistics.pstdev(grades))
+        assert stats.median == pytest.approx(statistics.median(grades))
+        assert stats.percentile(25) == pytest.approx(statistics.quantiles(grades, n=4, method="inclusive")[0])
+        assert sum(stats.histogram) == len(grades)
+
+    def test_ungraded_transitions_and_empty(self):
+        """None on either side adds or removes a grade; an empty column reports NaN."""
+        stats = GradeStats(1, 10)
+        assert math.isnan(stats.median) and math.isnan(stats.std)
+
+        stats.replace(None, 10.0)  # extra credit at the top edge
+        stats.replace(None, 4.0)
+        assert stats.histogram[4] == 1 and stats.histogram[9] == 1
+        stats.replace(10.0, None)
+        assert (stats.count, stats.mean, stats.std) == (1, 4.0, 0.0)
+        with pytest.raises(ValueError):
+            stats.remove(3.0)
+
+
+class TestGradeStatsController:
+    """Test cases for GradeStatsController caching."""
+
+    def test_cached_stats_follow_grade_changes_without_queries(
+            self, db_session, sample_assignment, sample_submission, query_budget):
+        """The column is read once; later grade changes are folded in without SQL."""
+        sample_submission.grade = 60.0
+        db_session.commit()
+        assignment_id, submission_id = sample_assignment.id, sample_submission.id
+        stats_controller = GradeStatsController()
+        submission_controller = SubmissionController()
+        stats_controller.subscribe(event_bus)
+        updates = []
+        stats_controller.stats_updated.connect(lambda stats: updates.append((stats.count, stats.mean)))
+
+        stats_controller.get_stats(assignment_id)
+        with query_budget(0):
+            stats_controller.get_stats(assignment_id)
+        submission_controller.grade_submissions([(submission_id, 80.0)])
+
+        assert updates == [(1, 60.0), (1, 60.0), (1, 80.0)]
+
+    def test_out_of_step_cache_is_reloaded(self, db_session, sample_assignment, sample_submission):
+        """A change that does not match the cached column triggers a fresh read."""
+        sample_submission.grade = 50.0
+        db_session.commit()
+        controller = GradeStatsController()
+        controller.get_stats(sample_assignment.id)
+        updates = []
+        controller.stats_updated.connect(lambda stats: updates.append(stats.mean))
+
+        controller.apply_grade_change(GradeChanged(
+            sample_submission.id, sample_assignment.id, sample_submission.student_id, 99.0, 70.0))
+
+        assert updates == [50.0]
+
 
 class TestSettingsController:
     """Test cases for SettingsController."""
@@ -262,6 +1015,287 @@ class TestSettingsController:
             mock_failed.emit.assert_called_once()
 
 
+class TestSessionController:
+    """Test cases for "remember me" session tokens."""
+
+    def _remember(self, user, token_file=None):
+        controller = SessionController(token_file)
+        remembered = []
+        controller.session_remembered.connect(lambda: remembered.append(True))
+        controller.remember(user)
+        assert remembered == [True]
+        return controller
+
+    def test_remember_stores_only_the_hash(self, db_session, sample_student, session_token_file):
+        """The token goes to the local file; the database only sees its hash."""
+        self._remember(sample_student)
+
+        token = session_token_file.read_text()
+        stored = db_session.query(SessionToken).one()
+        assert stored.token_hash == hash_token(token) != token
+        assert stored.user_id == sample_student.id
+        assert session_token_file.stat().st_mode & 0o077 == 0
+
+    def test_restore_logs_back_in(self, db_session, sample_student, query_budget):
+        """A valid token restores the user with one keyed update and one primary-key read."""
+        user = User(id=sample_student.id)
+        controller = self._remember(user)
+        restored = []
+        controller.session_restored.connect(restored.append)
+
+        with query_budget(2):
+            controller.restore_session()
+
+        assert restored[0].id == sample_student.id
+        assert restored[0].email == sample_student.email
+        db_session.expire_all()
+        assert db_session.query(SessionToken).one().last_used_at is not None
+
+    def test_expired_token_is_forgotten(self, db_session, sample_student, session_token_file):
+        """An expired token logs nobody in and is removed from the database and the disk."""
+        controller = self._remember(sample_student)
+        db_session.query(SessionToken).update({"expires_at": datetime.now() - timedelta(days=1)})
+        db_session.commit()
+        restored = []
+        controller.session_restored.connect(restored.append)
+
+        controller.restore_session()
+
+        assert restored == []
+        assert not session_token_file.exists()
+        assert db_session.query(SessionToken).count() == 0
+
+    def test_restore_without_token_file_is_silent(self, db_session, query_budget):
+        """No token file means no query at all."""
+        with query_budget(0):
+            SessionController().restore_session()
+
+    def test_remember_again_replaces_this_devices_token(self, db_session, sample_student, sample_teacher):
+        """Logging in with "remember me" twice on one device leaves one token, whoever logs in."""
+        self._remember(sample_student)
+        self._remember(sample_student)
+        controller = SessionController()
+        counts = []
+        controller.session_count_fetched.connect(counts.append)
+
+        controller.count_sessions(sample_student)
+
+        assert counts == [1]
+        self._remember(sample_teacher)
+        assert db_session.query(SessionToken).one().user_id == sample_teacher.id
+
+    def test_forget_drops_this_devices_token(self, db_session, sample_student, sample_teacher, session_token_file,
+                                             tmp_path):
+        """Forgetting removes this device's file and row; other devices keep theirs."""
+        self._remember(sample_teacher, tmp_path / "staffroom")
+        self._remember(sample_student)
+
+        SessionController().forget()
+
+        assert not session_token_file.exists()
+        assert db_session.query(SessionToken).one().user_id == sample_teacher.id
+
+    def test_failed_token_write_stores_nothing(self, db_session, sample_student, session_token_file):
+        """A token whose file cannot be written is not left behind in the database."""
+        errors = []
+        with patch('session_controller.write_token_file', side_effect=OSError("disk full")), \
+                patch('builtins.print', side_effect=errors.append):
+            SessionController().remember(sample_student)
+
+        assert "disk full" in errors[0]
+        assert db_session.query(SessionToken).count() == 0
+
+    def test_revoke_all_sessions(self, db_session, sample_student, sample_teacher, session_token_file, tmp_path,
+                                 query_budget):
+        """Every token of the user goes in one DELETE; other users keep theirs."""
+        self._remember(sample_student, tmp_path / "laptop")
+        self._remember(sample_student, tmp_path / "tablet")
+        self._remember(sample_student)
+        self._remember(sample_teacher, tmp_path / "staffroom")
+        controller = SessionController()
+        counts, revoked = [], []
+        controller.session_count_fetched.connect(counts.append)
+        controller.sessions_revoked.connect(revoked.append)
+
+        controller.count_sessions(sample_student)
+        with query_budget(1):
+            controller.revoke_all_sessions(User(id=sample_student.id))
+
+        assert counts == [3]
+        assert revoked == [3]
+        assert not session_token_file.exists()
+        assert db_session.query(SessionToken).filter_by(user_id=sample_teacher.id).count() == 1
+
+
+class TestDomainEvents:
+    """Test cases for events published by controller writes."""
+
+    def _received(self, *event_types):
+        received = []
+        for event_type in event_types:
+            event_bus.subscribe(event_type, received.append)
+        return received
+
+    def test_published_after_commit_only(self, db_session, sample_classroom):
+        """Staged events reach subscribers when the session commits and are dropped on rollback."""
+        received = self._received(StudentJoined)
+
+        stage_event(db_session, StudentJoined(sample_classroom.id, 1, "a@example.com"))
+        assert received == []
+        db_session.commit()
+        assert received == [StudentJoined(sample_classroom.id, 1, "a@example.com")]
+
+        stage_event(db_session, StudentJoined(sample_classroom.id, 2, "b@example.com"))
+        db_session.rollback()
+        db_session.commit()
+        assert len(received) == 1
+
+    def test_failing_subscriber_does_not_stop_delivery(self, db_session, capsys):
+        def broken(event):
+            raise ValueError("boom")
+        event_bus.subscribe(StudentJoined, broken)
+        received = self._received(StudentJoined)
+
+        stage_event(db_session, StudentJoined(1, 1, "a@example.com"))
+        db_session.commit()
+
+        assert len(received) == 1
+        assert "StudentJoined subscriber failed" in capsys.readouterr().out
+
+    def test_create_assignment_publishes(self, db_session, sample_classroom):
+        received = self._received(AssignmentCreated)
+        due = datetime(2030, 1, 1, 9, 0)
+
+        AssignmentController().create_assignment("Essay", "Write", due, 50, sample_classroom.id)
+
+        event = received[0]
+        assert (event.classroom_id, event.title, event.due_date, event.points) == (sample_classroom.id, "Essay", due, 50)
+        assert db_session.get(Assignment, event.id).title == "Essay"
+
+    def test_create_announcement_publishes(self, db_session, sample_classroom, sample_teacher):
+        received = self._received(AnnouncementPosted)
+
+        AnnouncementController().create_announcement("Hello", sample_classroom.id, sample_teacher)
+
+        event = received[0]
+        assert (event.classroom_id, event.content, event.author_email) == (sample_classroom.id, "Hello", sample_teacher.email)
+        assert db_session.get(Announcement, event.id).content == "Hello"
+
+    def test_join_class_publishes(self, db_session, sample_student, sample_classroom):
+        received = self._received(StudentJoined)
+        controller = ClassroomController()
+
+        controller.join_class(sample_classroom.class_code, sample_student)
+        controller.join_class(sample_classroom.class_code, sample_student)
+
+        assert received == [StudentJoined(sample_classroom.id, sample_student.id, sample_student.email)]
+
+    def test_sync_roster_publishes_added_students(self, db_session, sample_classroom):
+        students = [User(email=f"s{i}@example.com", role=UserRole.student, password_hash="x") for i in range(3)]
+        db_session.add_all(students)
+        db_session.commit()
+        expected = [StudentJoined(sample_classroom.id, s.id, s.email) for s in students]
+        received = self._received(StudentJoined)
+
+        PeopleController().sync_roster(sample_classroom.id, ["s2@example.com", "s0@example.com", "s1@example.com"])
+
+        assert received == expected
+
+    def test_grading_publishes_grade_changes(self, db_session, sample_submission):
+        submission_id, assignment_id, student_id, grade = (
+            sample_submission.id, sample_submission.assignment_id, sample_submission.student_id,
+            sample_submission.grade)
+        received = self._received(GradeChanged)
+        controller = SubmissionController()
+
+        controller.grade_submission(submission_id, 80.0)
+        controller.grade_submissions([(submission_id, 90.0)])
+        controller.grade_submissions([(submission_id, -5.0)])
+
+        assert received == [
+            GradeChanged(submission_id, assignment_id, student_id, grade, 80.0),
+            GradeChanged(submission_id, assignment_id, student_id, 80.0, 90.0),
+        ]
+
+
+class TestViewCache:
+    """Test cases for the stale-while-revalidate view cache."""
+
+    class Clock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    def test_fresh_then_stale_then_dropped(self):
+        clock = self.Clock()
+        cache = ViewCache(ttls={"classwork": 10}, max_stale=100, clock=clock)
+        cache.put("classwork", 1, ["a"])
+
+        assert cache.is_fresh("classwork", cache.get("classwork", 1))
+        clock.now = 50
+        entry = cache.get("classwork", 1)
+        assert entry.value == ["a"] and not cache.is_fresh("classwork", entry)
+        clock.now = 101
+        assert cache.get("classwork", 1) is None
+        assert (len(cache), cache.rows) == (0, 0)
+
+    def test_put_reports_changes_only(self, db_session, sample_assignment):
+        """Reloading identical rows is not a change and renews the entry; an edit is a change."""
+        clock = self.Clock()
+        cache = ViewCache(ttls={"classwork": 10}, clock=clock)
+        classroom_id = sample_assignment.classroom_id
+        assert cache.put("classwork", classroom_id, [sample_assignment])
+
+        db_session.expire_all()
+        reloaded = db_session.get(Assignment, sample_assignment.id)
+        clock.now = 20
+        assert not cache.put("classwork", classroom_id, [reloaded])
+        assert cache.is_fresh("classwork", cache.get("classwork", classroom_id))
+
+        reloaded.title = "Renamed"
+        assert cache.put("classwork", classroom_id, [reloaded])
+        assert cache.get("classwork", classroom_id).value[0].title == "Renamed"
+
+    def test_fingerprint_includes_loaded_relations(self, db_session, sample_announcement):
+        before = fingerprint(sample_announcement)
+        sample_announcement.author.email = "renamed@example.com"
+        assert fingerprint(sample_announcement) != before
+        assert fingerprint(([sample_announcement], True)) == ((fingerprint(sample_announcement),), True)
+
+    def test_row_budget_evicts_least_recent(self, db_session):
+        users = [User(email=f"u{i}@example.com", role=UserRole.student, password_hash="x") for i in range(6)]
+        cache = ViewCache(max_rows=4)
+        cache.put("classwork", 1, users[:2])
+        cache.put("classwork", 2, users[2:4])
+        cache.get("classwork", 1)
+        cache.put("classwork", 3, users[4:5])
+
+        assert cache.get("classwork", 2) is None
+        assert cache.get("classwork", 1) is not None and cache.rows == 3
+        assert cache.put("classwork", 4, users)  # Larger than the whole budget: shown, not kept
+        assert cache.get("classwork", 4) is None
+
+    def test_writes_invalidate_entries(self, db_session):
+        cache = ViewCache()
+        cache.subscribe(event_bus)
+        for view, entity_id in (("classwork", 1), ("stream", 1), ("class", 1), ("class", 2),
+                                ("assignments", 10), ("assignments", 11)):
+            cache.put(view, entity_id, [])
+
+        stage_event(db_session, AnnouncementPosted(1, 1, "Hi", datetime.now(), "t@example.com"))
+        stage_event(db_session, StudentJoined(1, 10, "s@example.com"))
+        db_session.commit()
+        assert [cache.get(*key) is None for key in (("stream", 1), ("class", 1), ("assignments", 10))] == [True] * 3
+        assert cache.get("class", 2) is not None and cache.get("assignments", 11) is not None
+
+        stage_event(db_session, AssignmentCreated(5, 1, "Lab", None, 10))
+        db_session.commit()
+        assert cache.get("classwork", 1) is None and cache.get("assignments", 11) is None
+        assert cache.get("class", 2) is not None
+
+
 class TestControllerErrorHandling:
     """Test cases for controller error handling."""
     
@@ -301,4 +1335,163 @@ class TestControllerErrorHandling:
         for controller in controllers:
             assert controller is not None
             # Test that each controller has the expected signals
-            assert hasattr(controller, '__class__')
\ No newline at end of file
+            assert hasattr(controller, '__class__')
+
+
+class TestQueryExecutor:
+    """Test cases for the background query executor."""
+
+    def test_inline_mode_runs_synchronously(self, db_session):
+        """Test that a zero-worker executor runs work on the calling thread."""
+        executor = QueryExecutor(max_workers=0)
+        results = []
+
+        executor.submit(lambda db: db.query(User).count(), results.append)
+        assert results == [0]
+
+    def test_cpu_executor_runs_without_session(self):
+        """Test that the CPU executor calls work() and never opens a session."""
+        executor = CpuExecutor(max_workers=0)
+        results = []
+
+        executor.submit(lambda: 6 * 7, results.append)
+        assert results == [42]
+        assert not hasattr(executor, "session")
+
+    def test_executor_without_run_task_fails_at_construction(self):
+        """Test that a pool executor subclass must say how tasks run."""
+        class Incomplete(_PoolExecutor):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete(max_workers=0)
+
+    def test_inline_mode_reports_errors(self, db_session):
+        """Test that errors are routed to on_error, or raised without one."""
+        executor = QueryExecutor(max_workers=0)
+        errors = []
+
+        def failing(db):
+            raise RuntimeError("boom")
+
+        executor.submit(failing, on_error=errors.append)
+        assert isinstance(errors[0], RuntimeError)
+        with pytest.raises(RuntimeError):
+            executor.submit(failing)
+
+    def test_shutdown_runs_queued_work(self, db_session, sample_teacher):
+        """Test that writes still queued at quit are committed, not dropped."""
+        import threading
+
+        executor = QueryExecutor(max_workers=1)
+        gate = threading.Event()
+        teacher_id = sample_teacher.id
+        executor.submit(lambda db: gate.wait(5))
+
+        def rename(db):
+            db.get(User, teacher_id).full_name = "Renamed"
+            db.commit()
+
+        executor.submit(rename)
+        threading.Timer(0.2, gate.set).start()  # rename is still queued when shutdown starts
+        executor.shutdown()
+
+        db_session.expire_all()
+        assert db_session.get(User, teacher_id).full_name == "Renamed"
+
+    def test_negative_worker_count_rejected(self):
+        """Test that the worker count is validated."""
+        with pytest.raises(ValueError):
+            QueryExecutor(max_workers=-1)
+
+    def test_threaded_results_arrive_on_gui_thread(self, db_session, sample_teacher, sample_classroom, qtbot):
+        """Test that worker results are delivered through the controller signal."""
+        import threading
+
+        db_executor.set_max_workers(2)
+        controller = ClassroomController()
+        delivered_on = []
+        controller.classes_fetched.connect(lambda classes: delivered_on.append(threading.get_ident()))
+
+        with qtbot.waitSignal(controller.classes_fetched, timeout=5000) as blocker:
+            controller.get_classes_for_user(sample_teacher)
+
+        assert [c.id for c in blocker.args[0]] == [sample_classroom.id]
+        assert blocker.args[0][0].teacher.email == sample_teacher.email
+        assert delivered_on == [threading.get_ident()]
+
+    def test_threaded_errors_reach_failure_signal(self, db_session, sample_submission, qtbot):
+        """Test that a failing background write emits the controller's failure signal."""
+        db_executor.set_max_workers(2)
+        controller = SubmissionController()
+
+        with qtbot.waitSignal(controller.submission_failed, timeout=5000):
+            controller.grade_submission(sample_submission.id, -1.0)
+
+
+class TestQueryStats:
+    """Test cases for per-slot query instrumentation."""
+
+    @pytest.fixture
+    def recorder(self, db_session):
+        import query_stats
+        engine = db_session.get_bind()
+        query_stats.reset()
+        query_stats.install(engine)
+        yield query_stats
+        query_stats.uninstall(engine)
+        query_stats.reset()
+
+    def test_statements_attributed_to_slot(self, recorder, sample_student, sample_classroom, sample_assignment):
+        """Test that a slot's statements, rows and timings are recorded under its name."""
+        controller = AssignmentController()
+        with patch.object(controller, 'class_assignments_fetched'):
+            controller.get_assignments_for_class(sample_classroom.id)
+
+        stats = recorder.stats()["AssignmentController.get_assignments_for_class"]
+        assert stats.calls == 1
+        assert stats.statements == 1
+        assert stats.rows == 1
+        assert stats.sql_time > 0
+        assert stats.wall_time >= stats.sql_time
+
+    def test_write_rows_counted(self, recorder, sample_submission):
+        """Test that rows touched by DML are counted for write slots."""
+        controller = SubmissionController()
+        with patch.object(controller, 'submission_updated'):
+            controller.grade_submission(sample_submission.id, 75.0)
+
+        stats = recorder.stats()["SubmissionController.grade_submission"]
+        assert stats.statements == 3  # SELECT, UPDATE, refresh SELECT
+        assert stats.rows == 2  # one updated row plus the returned submission
+
+    def test_returning_rows_counted_once(self, recorder, db_session, sample_submission, sample_assignment):
+        """Test that UPDATE ... RETURNING rows are counted from the result, not again from the rowcount."""
+        other = Submission(assignment_id=sample_assignment.id, student_id=sample_submission.student_id + 100)
+        db_session.add(other)
+        db_session.commit()
+        controller = SubmissionController()
+        controller.grade_submissions([(sample_submission.id, 70.0), (other.id, 60.0)])
+
+        stats = recorder.stats()["SubmissionController.grade_submissions"]
+        assert stats.statements == 2  # SELECT of the old grades, UPDATE ... RETURNING
+        assert stats.rows == 2
+
+        # Drivers that already know the rowcount of a RETURNING statement are not double counted
+        with recorder.track_slot("Probe"):
+            for cursor in (SimpleNamespace(rowcount=2, description=(("id",),)),
+                           SimpleNamespace(rowcount=3, description=None)):
+                conn = SimpleNamespace(info={"query_stats_start": [0.0]})
+                recorder._after_cursor_execute(conn, cursor, "", (), None, False)
+        assert recorder.stats()["Probe"].rows == 3
+
+    def test_summary_table_lists_slots(self, recorder, sample_classroom):
+        """Test that the end-of-session summary includes each slot."""
+        controller = AnnouncementController()
+        with patch.object(controller, 'announcements_fetched'):
+            controller.get_announcements_for_class(sample_classroom.id)
+
+        table = recorder.summary_table()
+        assert "AnnouncementController.get_announcements_for_class" in table
+        recorder.reset()
+        assert "(no queries recorded)" in recorder.summary_table()
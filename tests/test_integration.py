@@ -6,6 +6,7 @@ from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 
 from main import MainWindow, setup_database
+from class_bundle_controller import BUNDLE_PARTS
 from auth_controller import AuthController
 from classroom_controller import ClassroomController
 from assignment_controller import AssignmentController
@@ -306,6 +307,248 @@ class TestMainWindowIntegration:
             assert hasattr(window.announcement_controller, 'announcement_created')
 
 
+    def test_remembered_session_skips_login(self, db_session, sample_student, qtbot):
+        """Test that a saved "remember me" token opens the dashboard at startup."""
+        from session_controller import SessionController
+
+        SessionController().remember(sample_student)
+        with patch('main.setup_database'):
+            window = MainWindow()
+            qtbot.addWidget(window)
+
+            window.restore_session()
+
+            assert window.current_user.id == sample_student.id
+            assert window.view_stack.currentWidget() is window.main_layout
+
+    def test_login_with_remember_me_saves_token(self, db_session, sample_student, qtbot, session_token_file):
+        """Test that ticking "Remember me" stores a token after login."""
+        with patch('main.setup_database'):
+            window = MainWindow()
+            qtbot.addWidget(window)
+            window.login_view.email_input.setText("student@example.com")
+            window.login_view.password_input.setText("password123")
+            window.login_view.remember_me_checkbox.setChecked(True)
+
+            window.login_view.login_button.click()
+
+            assert window.current_user.id == sample_student.id
+            assert session_token_file.exists()
+
+    def test_login_without_remember_me_forgets_saved_token(self, db_session, sample_teacher, sample_student, qtbot,
+                                                           session_token_file):
+        """Test that logging in without "Remember me" drops the token an earlier user left on this device."""
+        from session_controller import SessionController
+        from session_token import SessionToken
+
+        SessionController().remember(sample_teacher)
+        with patch('main.setup_database'):
+            window = MainWindow()
+            qtbot.addWidget(window)
+            window.login_view.email_input.setText("student@example.com")
+            window.login_view.password_input.setText("password123")
+
+            window.login_view.login_button.click()
+
+            assert window.current_user.id == sample_student.id
+            assert not session_token_file.exists()
+            assert db_session.query(SessionToken).count() == 0
+
+
+    def test_open_class_loads_bundle(self, db_session, sample_teacher, sample_student, sample_assignment,
+                                     sample_announcement, qtbot):
+        """Test that opening a class shows the view at once and fills every tab from one bundle request."""
+        classroom = sample_assignment.classroom
+        classroom_id, class_name = classroom.id, classroom.name
+        classroom.students.append(sample_student)
+        db_session.commit()
+        with patch('main.setup_database'):
+            window = MainWindow()
+            qtbot.addWidget(window)
+            window.on_login_successful(sample_teacher)
+
+            window.navigate_to_class(classroom_id)
+
+            class_view = window.class_view
+            assert window.main_layout.content_stack.currentWidget() is class_view
+            assert class_view.header.title_label.text() == class_name
+            assert class_view.stream_tab.announcements_layout.count() == 1
+            assert class_view.classwork_tab.assignments_layout.count() == 1
+            assert [s.email for s in class_view.roster] == [sample_student.email]
+            assert class_view.roster_complete
+            assert window.class_bundle_controller.last_timings.complete
+
+            window.navigate_to_class(999)
+            assert window.main_layout.content_stack.currentWidget() is window.dashboard_view
+
+    def test_student_never_requests_gradebook(self, db_session, sample_teacher, sample_student, sample_assignment, qtbot):
+        """Test that a student opening a class left on the Grades tab does not load the gradebook."""
+        classroom_id = sample_assignment.classroom_id
+        with patch('main.setup_database'):
+            window = MainWindow()
+            qtbot.addWidget(window)
+            window.on_login_successful(sample_teacher)
+            window.navigate_to_class(classroom_id)
+            class_view = window.class_view
+            class_view.tab_widget.setCurrentWidget(class_view.grades_tab)
+            requests = []
+            class_view.gradebook_requested.connect(requests.append)
+
+            window.on_login_successful(sample_student)
+            window.navigate_to_class(classroom_id)
+
+            assert requests == []
+            assert class_view.tab_widget.currentWidget() is not class_view.grades_tab
+
+    def test_reopened_class_served_from_cache(self, db_session, sample_teacher, sample_assignment,
+                                              sample_announcement, qtbot, query_budget):
+        """Test that reopening a class shows cached parts and only re-renders what changed on revalidation."""
+        classroom_id = sample_assignment.classroom_id
+        with patch('main.setup_database'):
+            window = MainWindow()
+            qtbot.addWidget(window)
+            window.on_login_successful(sample_teacher)
+            window.navigate_to_class(classroom_id)
+            window.navigate("Classes")
+
+            with query_budget(1):  # the roster; everything else is fresh in the cache
+                window.navigate_to_class(classroom_id)
+            classwork = window.class_view.classwork_tab.assignments_layout
+            stream = window.class_view.stream_tab.announcements_layout
+            assert (classwork.count(), stream.count()) == (1, 1)
+
+            # Stale entries are shown at once, then reloaded; only changed parts are rendered again
+            window.view_cache.ttls = {"class": 0, "stream": 0, "classwork": 0}
+            db_session.get(Assignment, sample_assignment.id).points = 50
+            db_session.commit()
+            class_view = window.class_view
+            with patch.object(class_view.stream_tab, 'display_announcements',
+                              wraps=class_view.stream_tab.display_announcements) as stream_render, \
+                    patch.object(class_view.classwork_tab, 'display_assignments',
+                                 wraps=class_view.classwork_tab.display_assignments) as classwork_render:
+                window.navigate_to_class(classroom_id)
+
+            assert window.class_bundle_controller.last_timings.requested == BUNDLE_PARTS
+            assert stream_render.call_count == 2  # begin_class clears, cache renders; reload unchanged
+            assert classwork_render.call_count == 3  # cleared, cached, then re-rendered with new points
+            assert window.view_cache.get("classwork", classroom_id).value[0].points == 50
+
+    def test_assignments_view_revalidates_in_background(self, db_session, sample_student, sample_assignment, qtbot):
+        """Test that the Assignments view reuses its cached list and rebuilds it only when it changed."""
+        sample_assignment.classroom.students.append(sample_student)
+        sample_assignment.due_date = datetime.now() + timedelta(days=3)
+        db_session.commit()
+        with patch('main.setup_database'):
+            window = MainWindow()
+            qtbot.addWidget(window)
+            window.on_login_successful(sample_student)
+            view = window.global_assignments_view
+            window.navigate("Assignments")
+            first_item = view.assignments_layout.itemAt(0).widget()
+
+            with patch.object(window.assignment_controller, 'get_all_assignments_for_user') as reload:
+                window.navigate("Classes")
+                window.navigate("Assignments")
+            reload.assert_not_called()
+
+            window.view_cache.ttls = {"assignments": 0}
+            window.navigate("Assignments")
+            assert view.assignments_layout.itemAt(0).widget() is first_item
+
+            db_session.get(Assignment, sample_assignment.id).title = "Renamed"
+            db_session.commit()
+            window.navigate("Assignments")
+            assert view.assignments_layout.count() == 1
+            assert view.assignments_layout.itemAt(0).widget() is not first_item
+
+    def test_assignments_view_opens_on_one_page(self, db_session, sample_student, sample_classroom, qtbot):
+        """Test that the Assignments view loads one page of upcoming work and the rest from "Show later"."""
+        sample_classroom.students.append(sample_student)
+        for day in range(1, 4):
+            db_session.add(Assignment(title=f"Day {day}", due_date=datetime.now() + timedelta(days=day), points=10,
+                                      classroom_id=sample_classroom.id))
+        db_session.commit()
+        with patch('main.setup_database'), patch('main.UPCOMING_ASSIGNMENTS_PAGE_SIZE', 2):
+            window = MainWindow()
+            qtbot.addWidget(window)
+            window.on_login_successful(sample_student)
+            view = window.global_assignments_view
+
+            window.navigate("Assignments")
+            assert view.assignments_layout.count() == 2
+            assert not view.show_later_button.isHidden()
+
+            view.show_later_button.click()
+            assert view.assignments_layout.count() == 3
+            assert view.show_later_button.isHidden()
+
+    def test_click_after_hover_uses_prefetch(self, db_session, sample_teacher, sample_assignment,
+                                             sample_announcement, qtbot, query_budget):
+        """Test that a class prefetched on hover opens from the cache, querying only the roster."""
+        classroom_id, class_name = sample_assignment.classroom_id, sample_assignment.classroom.name
+        with patch('main.setup_database'):
+            window = MainWindow()
+            qtbot.addWidget(window)
+            window.on_login_successful(sample_teacher)
+
+            window.dashboard_view.class_prefetch_requested.emit(classroom_id)
+            with query_budget(1):
+                window.navigate_to_class(classroom_id)
+
+            class_view = window.class_view
+            assert class_view.header.title_label.text() == class_name
+            assert class_view.stream_tab.announcements_layout.count() == 1
+            assert class_view.classwork_tab.assignments_layout.count() == 1
+
+    def test_click_during_prefetch_waits_for_it(self, db_session, sample_teacher, sample_assignment, qtbot):
+        """Test that clicking a class whose prefetch is still running does not load its parts twice."""
+        import threading
+        from base import db_executor
+
+        classroom_id, class_name = sample_assignment.classroom_id, sample_assignment.classroom.name
+        with patch('main.setup_database'):
+            window = MainWindow()
+            qtbot.addWidget(window)
+            window.on_login_successful(sample_teacher)
+            gate = threading.Event()
+            db_executor.set_max_workers(1)
+            db_executor.submit(lambda db: gate.wait(5))
+            try:
+                window.dashboard_view.class_prefetch_requested.emit(classroom_id)
+                window.navigate_to_class(classroom_id)
+                assert window.class_bundle_controller.last_timings.requested == ("roster",)
+            finally:
+                gate.set()
+                db_executor.wait_for_done()
+
+            qtbot.waitUntil(lambda: window.class_view.header.title_label.text() == class_name)
+            qtbot.waitUntil(lambda: window.class_view.classwork_tab.assignments_layout.count() == 1)
+            assert window.class_prefetcher.in_flight == []
+
+    def test_open_class_updates_in_place(self, db_session, sample_teacher, sample_student, sample_classroom, qtbot):
+        """Test that committed changes show up in the open class without refetching its lists."""
+        classroom_id, class_code = sample_classroom.id, sample_classroom.class_code
+        with patch('main.setup_database'):
+            window = MainWindow()
+            qtbot.addWidget(window)
+            window.on_login_successful(sample_teacher)
+            window.navigate_to_class(classroom_id)
+            class_view = window.class_view
+
+            with patch.object(window.assignment_controller, 'get_assignments_for_class') as assignments_refetch, \
+                    patch.object(window.people_controller, 'get_roster_page') as roster_refetch:
+                window.assignment_controller.create_assignment("Lab", "Do it", None, 10, classroom_id)
+                window.announcement_controller.create_announcement("Hi all", classroom_id, sample_teacher)
+                ClassroomController().join_class(class_code, sample_student)
+
+            assignments_refetch.assert_not_called()
+            roster_refetch.assert_not_called()
+            assert class_view.classwork_tab.assignments_layout.count() == 1
+            assert class_view.stream_tab.announcements_layout.count() == 1
+            assert [s.email for s in class_view.roster] == [sample_student.email]
+            assert class_view.people_tab.students_title.text() == "Classmates (1)"
+
+
 class TestDataConsistency:
     """Test data consistency across operations."""
     
@@ -363,4 +606,210 @@ class TestDataConsistency:
         assert db_session.query(Classroom).count() == 0
         assert db_session.query(Assignment).count() == 0
         assert db_session.query(Submission).count() == 0
-        assert db_session.query(Announcement).count() == 0
\ No newline at end of file
+        assert db_session.query(Announcement).count() == 0
+
+class TestScaleBenchmark:
+    """Smoke tests for the scale benchmark harness."""
+
+    def test_percentile_nearest_rank(self):
+        """Test the nearest-rank percentile helper."""
+        from benchmark import percentile
+
+        samples = list(range(1, 101))
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 95) == 95
+        assert percentile(samples, 99) == 99
+        assert percentile([7.0], 99) == 7.0
+
+    def test_seed_and_run_tiny_database(self, tmp_path):
+        """Test seeding a tiny database and timing a subset of slots."""
+        from benchmark import seed_database, run_benchmarks, compare_results
+
+        db_path = str(tmp_path / "bench.db")
+        counts = seed_database(db_path, scale=0.002)
+        assert counts["users"] == 40
+        assert counts["classrooms"] == 2
+        assert counts["submissions"] > 0
+
+        results = run_benchmarks(db_path, iterations=3, only=["get_class", "grade_submission"])
+        slots = results["slots"]
+        assert "ClassroomController.get_class_by_id" in slots
+        assert "SubmissionController.grade_submission" in slots
+        assert "AuthController.login" not in slots
+        for entry in slots.values():
+            assert entry["samples"] == 3
+            assert entry["p50_ms"] <= entry["p95_ms"] <= entry["p99_ms"]
+            assert entry["statements_per_call"] >= 1
+        assert "+0.0%" in compare_results(results, results)
+
+    def test_concurrent_turn_ins(self, tmp_path):
+        """Test that concurrent upserts on a shared set of pairs all succeed without duplicates."""
+        from sqlalchemy import create_engine, func, select
+        from benchmark import seed_database, run_submission_throughput
+
+        db_path = str(tmp_path / "submit.db")
+        seed_database(db_path, scale=0.002)
+        engine = create_engine(f"sqlite:///{db_path}")
+        with engine.connect() as connection:
+            before = connection.execute(select(func.count()).select_from(Submission)).scalar()
+
+        result = run_submission_throughput(db_path, submitters=4, turn_ins=10, pairs=6)
+
+        assert result["attempted"] == 40
+        assert result["succeeded"] == 40
+        assert result["failed"] == {}
+        assert result["p50_ms"] <= result["p95_ms"]
+        with engine.connect() as connection:
+            after = connection.execute(select(func.count()).select_from(Submission)).scalar()
+        engine.dispose()
+        assert before < after <= before + 3
+
+
+class TestDataGenerator:
+    """Test cases for the bulk synthetic data generator."""
+
+    def _generate(self, path, seed=7):
+        from sqlalchemy import create_engine
+        from data_generator import GeneratorConfig, generate
+
+        engine = create_engine(f"sqlite:///{path}")
+        config = GeneratorConfig(
+            teachers=2, students=30, classrooms=3, classes_per_student=2,
+            assignments=6, submissions=60, announcements=9, seed=seed,
+        )
+        counts = generate(engine, config, log=lambda message: None)
+        return engine, counts
+
+    def test_generates_requested_counts(self, tmp_path):
+        """Test that every table receives the configured number of rows."""
+        from sqlalchemy.orm import Session
+
+        engine, counts = self._generate(tmp_path / "gen.db")
+        assert counts == {
+            "users": 32, "classrooms": 3, "memberships": 60,
+            "assignments": 6, "submissions": 60, "announcements": 9,
+        }
+        with Session(engine) as db:
+            students = db.query(User).filter(User.role == UserRole.student).all()
+            assert len(students) == 30
+            # Every account shares the single precomputed hash
+            assert len({s.password_hash for s in students}) == 1
+            assert students[0].check_password("password")
+            for submission in db.query(Submission).all():
+                classroom = db.get(Classroom, db.get(Assignment, submission.assignment_id).classroom_id)
+                assert submission.student_id in {s.id for s in classroom.students}
+        engine.dispose()
+
+    def test_due_dates_are_local_times(self, tmp_path, monkeypatch):
+        """Test that due dates are naive local times, like those the create-assignment dialog saves."""
+        import time
+        from sqlalchemy.orm import Session
+
+        monkeypatch.setenv("TZ", "Asia/Kolkata")  # UTC+05:30, so a UTC base would be off by hours
+        time.tzset()
+        try:
+            engine, _ = self._generate(tmp_path / "gen.db")
+            now = datetime.now()
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+        with Session(engine) as db:
+            for assignment in db.query(Assignment).all():
+                offset = (assignment.due_date - now) / timedelta(days=1)
+                assert abs(offset - round(offset)) < 0.01  # whole days from local now
+        engine.dispose()
+
+    def test_fixed_seed_is_deterministic(self, tmp_path):
+        """Test that the same seed produces the same class codes and memberships."""
+        from sqlalchemy import select
+        from classroom import student_classroom_association
+
+        snapshots = []
+        for name in ("a.db", "b.db"):
+            engine, _ = self._generate(tmp_path / name)
+            with engine.connect() as connection:
+                snapshots.append((
+                    connection.execute(select(Classroom.class_code).order_by(Classroom.id)).scalars().all(),
+                    connection.execute(select(student_classroom_association)).all(),
+                ))
+            engine.dispose()
+        assert snapshots[0] == snapshots[1]
+
+
+class TestBulkProvisioning:
+    """Tests for provisioning a cohort of accounts from a CSV."""
+
+    def _engine(self, path):
+        from sqlalchemy import create_engine
+        from migrate import upgrade_database
+
+        engine = create_engine(f"sqlite:///{path}")
+        upgrade_database(engine)
+        return engine
+
+    def test_read_accounts(self):
+        """Test that columns are found by header and bad or repeated rows are reported."""
+        from provision_users import read_accounts
+
+        accounts, invalid = read_accounts([
+            "Role,Password,Email,Full Name",
+            "student,pw1, Ann@School.test ,Ann",
+            "teacher,pw2,bob@school.test,",
+            "admin,pw3,cy@school.test,Cy",
+            "student,,dee@school.test,Dee",
+            "student,pw4,ANN@school.test,Ann again",
+            "student,pw5,not-an-email,X",
+        ])
+
+        assert [(a.email, a.full_name, a.role, a.password) for a in accounts] == [
+            ("ann@school.test", "Ann", UserRole.student, "pw1"),
+            ("bob@school.test", None, UserRole.teacher, "pw2"),
+        ]
+        assert [line for line, reason in invalid] == [4, 5, 6, 7]
+        assert "unknown role 'admin'" in invalid[0][1]
+
+    def test_provision_skips_existing_accounts(self, tmp_path):
+        """Test that existing emails are found with one lookup and new users are created in chunks."""
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+        from provision_users import read_accounts, provision_users
+
+        engine = self._engine(tmp_path / "cohort.db")
+        with Session(engine) as db:
+            db.add(User(email="Existing@School.test", role=UserRole.student, password_hash="x"))
+            db.commit()
+        rows = [f"new{i}@school.test,New {i},student,secret{i}" for i in range(10)]
+        accounts, invalid = read_accounts(["EXISTING@school.test,Old,student,pw"] + rows)
+        selects = []
+        event.listen(engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: selects.append(statement)
+                     if statement.lstrip().upper().startswith("SELECT") else None)
+
+        report = provision_users(engine, accounts, workers=2, rounds=4, chunk_size=4, log=lambda message: None)
+
+        assert invalid == []
+        assert report.existing == ["existing@school.test"]
+        assert report.created == [f"new{i}@school.test" for i in range(10)]
+        assert len(selects) == 1
+        with Session(engine) as db:
+            assert db.query(User).count() == 11
+            created = db.query(User).filter(User.email_matches("new7@school.test")).one()
+            assert created.full_name == "New 7"
+            assert created.check_password("secret7")
+        engine.dispose()
+
+    def test_cli(self, tmp_path, capsys):
+        """Test the command line: rejected rows are listed and the exit status reflects them."""
+        from provision_users import main
+
+        csv_path = tmp_path / "cohort.csv"
+        csv_path.write_text("email,full_name,role,password\nann@school.test,Ann,student,pw\nbad,,student,pw\n")
+        db_path = tmp_path / "cli.db"
+
+        assert main([str(csv_path), "--db", str(db_path), "--rounds", "4", "--dry-run"]) == 1
+        assert "Would create 1 account(s)" in capsys.readouterr().out
+        assert main([str(csv_path), "--db", str(db_path), "--rounds", "4"]) == 1
+        output = capsys.readouterr().out
+        assert "line 3: invalid email 'bad'" in output
+        assert "Created 1; 0 already existed, 1 row(s) rejected." in output
+
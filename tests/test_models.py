@@ -10,6 +10,7 @@ from classroom import Classroom, generate_class_code
 from assignment import Assignment
 from announcement import Announcement
 from submission import Submission
+from base import Base
 
 
 class TestUserModel:
@@ -407,4 +408,175 @@ class TestModelRelationships:
     def test_user_submission_relationship(self, db_session, sample_student, sample_submission):
         """Test user-submission relationship."""
         assert sample_submission in sample_student.submissions
-        assert sample_submission.student == sample_student
\ No newline at end of file
+        assert sample_submission.student == sample_student
+
+class TestDatabaseProfiles:
+    """Test cases for the SQLite connection profiles."""
+
+    @pytest.fixture
+    def profiled_engine(self, tmp_path):
+        from sqlalchemy import create_engine
+        engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+        yield engine
+        engine.dispose()
+
+    def test_balanced_profile_enables_wal(self, profiled_engine):
+        """Test that the balanced profile is applied to new connections."""
+        from base import use_sqlite_profile, active_sqlite_profile, active_pragmas
+
+        use_sqlite_profile("balanced", profiled_engine)
+        pragmas = active_pragmas(profiled_engine)
+
+        assert active_sqlite_profile(profiled_engine) == "balanced"
+        assert pragmas["journal_mode"] == "wal"
+        assert pragmas["synchronous"] == 1  # NORMAL
+        assert pragmas["cache_size"] == -64000
+        assert pragmas["temp_store"] == 2  # MEMORY
+        assert pragmas["busy_timeout"] == 5000
+
+    def test_switching_profile_replaces_previous(self, profiled_engine):
+        """Test that switching profiles affects the next connection."""
+        from base import use_sqlite_profile, active_pragmas
+
+        use_sqlite_profile("balanced", profiled_engine)
+        active_pragmas(profiled_engine)
+        use_sqlite_profile("safe", profiled_engine)
+        pragmas = active_pragmas(profiled_engine)
+
+        assert pragmas["journal_mode"] == "delete"
+        assert pragmas["synchronous"] == 2  # FULL
+
+    def test_unknown_profile_rejected(self, profiled_engine):
+        """Test that an unknown profile name raises an error."""
+        from base import use_sqlite_profile
+
+        with pytest.raises(ValueError):
+            use_sqlite_profile("turbo", profiled_engine)
+
+
+    def test_unknown_env_profile_falls_back(self, monkeypatch, capsys):
+        """Test that a mistyped PYCLASS_DB_PROFILE warns instead of failing the import."""
+        from base import profile_from_env
+
+        monkeypatch.setenv("PYCLASS_DB_PROFILE", "turbo")
+
+        assert profile_from_env() == "balanced"
+        assert "unknown PYCLASS_DB_PROFILE 'turbo'" in capsys.readouterr().out
+        monkeypatch.setenv("PYCLASS_DB_PROFILE", "safe")
+        assert profile_from_env() == "safe"
+
+class TestMigrations:
+    """Test cases for the Alembic migrations and the startup upgrade path."""
+
+    def _indexes(self, engine):
+        from sqlalchemy import text
+        # Read from sqlite_master: the inspector skips expression indexes
+        with engine.connect() as connection:
+            rows = connection.execute(text(
+                "SELECT tbl_name, name FROM sqlite_master WHERE type = 'index' "
+                "AND name NOT LIKE 'sqlite_autoindex%' AND tbl_name != 'alembic_version'"
+            )).all()
+        indexes = {}
+        for table, name in rows:
+            indexes.setdefault(table, []).append(name)
+        return {table: sorted(names) for table, names in indexes.items()}
+
+    def _database_at(self, path, revision):
+        from alembic import command
+        from sqlalchemy import create_engine
+        from migrate import alembic_config
+
+        engine = create_engine(f"sqlite:///{path}")
+        with engine.begin() as connection:
+            command.upgrade(alembic_config(connection), revision)
+        return engine
+
+    def test_new_database_created_and_stamped(self, tmp_path):
+        """Test that a new database is built from the models and stamped at head."""
+        from sqlalchemy import create_engine
+        from migrate import upgrade_database, current_revision, head_revision
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+        assert upgrade_database(engine) == "created"
+        with engine.connect() as connection:
+            assert current_revision(connection) == head_revision()
+        assert upgrade_database(engine) == "current"
+        engine.dispose()
+
+    def test_legacy_database_upgraded_to_model_schema(self, tmp_path):
+        """Test that an unversioned pre-migration database gets the composite indexes."""
+        from alembic import command
+        from sqlalchemy import create_engine, text
+        from migrate import upgrade_database, alembic_config
+
+        legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with legacy.begin() as connection:
+            command.upgrade(alembic_config(connection), "0001")
+            connection.execute(text("DROP TABLE alembic_version"))
+        assert "ix_announcements_classroom_id" in self._indexes(legacy)["announcements"]
+
+        assert upgrade_database(legacy) == "upgraded"
+
+        fresh = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+        Base.metadata.create_all(fresh)
+        assert self._indexes(legacy) == self._indexes(fresh)
+        assert "ix_announcements_classroom_timestamp" in self._indexes(legacy)["announcements"]
+        legacy.dispose()
+        fresh.dispose()
+
+    def test_emails_normalized_on_upgrade(self, tmp_path):
+        """Test that existing emails are lower-cased and indexed by lower(email)."""
+        from sqlalchemy import text
+        from migrate import upgrade_database
+
+        engine = self._database_at(tmp_path / "emails.db", "0002")
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO users (email, password_hash, role) VALUES "
+                "(' Ann@School.TEST', 'x', 'student'), ('bob@school.test', 'x', 'student')"
+            ))
+
+        assert upgrade_database(engine) == "upgraded"
+
+        with engine.connect() as connection:
+            emails = connection.execute(text("SELECT email FROM users ORDER BY id")).scalars().all()
+            index_sql = connection.execute(text(
+                "SELECT sql FROM sqlite_master WHERE name = 'ix_users_email_lower'")).scalar()
+        assert emails == ["ann@school.test", "bob@school.test"]
+        assert "UNIQUE" in index_sql and "lower(email)" in index_sql
+        engine.dispose()
+
+    def test_email_collisions_stop_upgrade(self, tmp_path):
+        """Test that every case-only duplicate is reported and nothing is changed."""
+        from sqlalchemy import text
+        from migrate import upgrade_database, current_revision
+
+        engine = self._database_at(tmp_path / "clash.db", "0002")
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO users (id, email, password_hash, role) VALUES "
+                "(1, 'ann@school.test', 'x', 'student'), (2, 'ANN@school.test', 'x', 'student'), "
+                "(3, 'Cy@school.test', 'x', 'student'), (4, 'cy@school.test ', 'x', 'student'), "
+                "(5, 'Dee@school.test', 'x', 'student')"
+            ))
+
+        with pytest.raises(RuntimeError) as excinfo:
+            upgrade_database(engine)
+
+        message = str(excinfo.value)
+        assert "2 email address(es)" in message
+        assert "ann@school.test: users 1, 2" in message
+        assert "cy@school.test: users 3, 4" in message
+        with engine.connect() as connection:
+            assert current_revision(connection) == "0002"
+            assert connection.execute(text("SELECT email FROM users WHERE id = 5")).scalar() == "Dee@school.test"
+        engine.dispose()
+
+    def test_user_email_stored_normalized(self, db_session):
+        """Test that emails are normalized on assignment and matched without regard to case."""
+        user = User(email="  Mixed.Case@Example.COM ", role=UserRole.student, password_hash="x")
+        db_session.add(user)
+        db_session.commit()
+
+        assert user.email == "mixed.case@example.com"
+        assert db_session.query(User).filter(User.email_matches("MIXED.case@example.com")).one() is user
@@ -0,0 +1,167 @@
+"""
+Query-plan regression tests.
+
+Each controller slot is run against a seeded database while its SQL is
+captured; every captured statement is then fed to ``EXPLAIN QUERY PLAN``. A
+hot query that falls back to a full ``SCAN`` of one of the large tables fails
+the test, so a model or query change that silently stops using an index is
+caught here rather than in production.
+"""
+import re
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, select
+
+from base import SessionLocal
+from data_generator import GeneratorConfig, generate
+from auth_controller import AuthController
+from classroom_controller import ClassroomController
+from people_controller import PeopleController
+from class_bundle_controller import ClassBundleController
+from gradebook_controller import GradebookController
+from grade_stats_controller import GradeStatsController
+from assignment_controller import AssignmentController
+from announcement_controller import AnnouncementController
+from submission_controller import SubmissionController
+from settings_controller import SettingsController
+import session_controller
+from session_controller import SessionController
+from user import User, UserRole
+from classroom import Classroom
+from submission import Submission
+from announcement import Announcement
+
+LARGE_TABLES = ("users", "submissions", "announcements", "assignments", "student_classroom", "session_tokens")
+# "SCAN users", "SCAN users_1" or "SCAN users USING INDEX ..." – but not SEARCH.
+FULL_SCAN = re.compile(r"^SCAN (?P<table>%s)(_\d+)?\b" % "|".join(LARGE_TABLES))
+
+
+@pytest.fixture(scope="module")
+def seeded_engine(tmp_path_factory):
+    """A small database generated with the bulk data generator."""
+    path = tmp_path_factory.mktemp("plans") / "plans.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    generate(engine, GeneratorConfig(
+        teachers=5, students=200, classrooms=10, classes_per_student=3,
+        assignments=100, submissions=2000, announcements=300,
+    ), log=lambda message: None)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sample(seeded_engine):
+    """Binds the app session to the seeded database and returns sample rows."""
+    SessionLocal.configure(bind=seeded_engine)
+    with SessionLocal() as db:
+        rows = {
+            "teacher": db.scalars(select(User).where(User.role == UserRole.teacher)).first(),
+            "student": db.scalars(select(User).where(User.role == UserRole.student)).first(),
+            "classroom": db.scalars(select(Classroom)).first(),
+            "submission": db.scalars(select(Submission)).first(),
+            "announcement": db.scalars(select(Announcement).order_by(Announcement.id.desc())).first(),
+        }
+        db.expunge_all()
+    return rows
+
+
+SLOTS = {
+    "AuthController.login": lambda s: AuthController().login(s["student"].email, "password"),
+    "ClassroomController.get_classes_for_user[teacher]": lambda s: ClassroomController().get_classes_for_user(s["teacher"]),
+    "ClassroomController.get_classes_for_user[student]": lambda s: ClassroomController().get_classes_for_user(s["student"]),
+    "ClassroomController.get_class_by_id": lambda s: ClassroomController().get_class_by_id(s["classroom"].id),
+    "ClassroomController.join_class": lambda s: ClassroomController().join_class(s["classroom"].class_code, s["student"]),
+    "ClassBundleController.load_class": lambda s: ClassBundleController().load_class(s["classroom"].id),
+    "PeopleController.get_roster_page": lambda s: PeopleController().get_roster_page(s["classroom"].id),
+    "PeopleController.get_roster_page[next]": lambda s: PeopleController().get_roster_page(
+        s["classroom"].id, s["student"].email),
+    "PeopleController.sync_roster": lambda s: PeopleController().sync_roster(
+        s["classroom"].id, [s["student"].email, "unknown@school.test"], False),
+    "GradebookController.get_gradebook": lambda s: GradebookController().get_gradebook(s["classroom"].id),
+    "AnnouncementController.get_announcements_for_class": lambda s: AnnouncementController().get_announcements_for_class(
+        s["classroom"].id),
+    "AnnouncementController.get_more_announcements": lambda s: AnnouncementController().get_more_announcements(
+        s["announcement"].classroom_id, s["announcement"].id),
+    "AssignmentController.get_assignments_for_class": lambda s: AssignmentController().get_assignments_for_class(
+        s["classroom"].id),
+    "AssignmentController.get_all_assignments_for_user": lambda s: AssignmentController().get_all_assignments_for_user(
+        s["student"]),
+    "AssignmentController.get_all_assignments_for_user[upcoming]": lambda s: AssignmentController().get_all_assignments_for_user(
+        s["student"], due_after=datetime.now(), limit=50),
+    "AssignmentController.get_earlier_assignments_for_user": lambda s: AssignmentController().get_earlier_assignments_for_user(
+        s["student"], datetime.now()),
+    "AssignmentController.get_earlier_assignments_for_user[cursor]": lambda s: AssignmentController().get_earlier_assignments_for_user(
+        s["student"], datetime.now(), 1),
+    "AssignmentController.get_later_assignments_for_user": lambda s: AssignmentController().get_later_assignments_for_user(
+        s["student"], datetime.now(), 1),
+    "AssignmentController.get_assignment_by_id": lambda s: AssignmentController().get_assignment_by_id(
+        s["submission"].assignment_id),
+    "SubmissionController.get_submission": lambda s: SubmissionController().get_submission(
+        s["submission"].assignment_id, s["submission"].student_id),
+    "SubmissionController.get_all_submissions_for_assignment": lambda s: SubmissionController().get_all_submissions_for_assignment(
+        s["submission"].assignment_id),
+    "SubmissionController.create_or_update_submission": lambda s: SubmissionController().create_or_update_submission(
+        s["submission"].assignment_id, User(id=s["submission"].student_id), "/uploads/plan.pdf"),
+    "SubmissionController.grade_submission": lambda s: SubmissionController().grade_submission(s["submission"].id, 88.0),
+    "SubmissionController.grade_submissions": lambda s: SubmissionController().grade_submissions(
+        [(s["submission"].id, 77.0), (s["submission"].id + 1, 66.0)]),
+    "GradeStatsController.get_stats": lambda s: GradeStatsController().get_stats(s["submission"].assignment_id),
+    "SessionController.restore_session": lambda s: (
+        session_controller.write_token_file(session_controller.TOKEN_FILE, "not-a-real-token"),
+        SessionController().restore_session()),
+    "SessionController.forget": lambda s: (
+        session_controller.write_token_file(session_controller.TOKEN_FILE, "not-a-real-token"),
+        SessionController().forget()),
+    "SessionController.count_sessions": lambda s: SessionController().count_sessions(s["student"]),
+    "SessionController.revoke_all_sessions": lambda s: SessionController().revoke_all_sessions(s["student"]),
+    "SettingsController.update_user_settings": lambda s: SettingsController().update_user_settings(s["student"], "Plan Student"),
+}
+
+
+def capture_statements(engine, call):
+    """Runs ``call`` and returns the (statement, parameters) pairs it issued."""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # INSERTs matter once they carry an ON CONFLICT lookup; executemany batches can't be EXPLAINed
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return captured
+
+
+def full_scans(engine, statements):
+    """Returns (statement, plan line) for every full scan of a large table."""
+    offenders = []
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            for row in plan:
+                if FULL_SCAN.match(row[-1]):
+                    offenders.append((" ".join(statement.split()), row[-1]))
+    return offenders
+
+
+@pytest.mark.parametrize("slot", sorted(SLOTS))
+def test_slot_avoids_full_table_scans(slot, seeded_engine, sample):
+    statements = capture_statements(seeded_engine, lambda: SLOTS[slot](sample))
+    assert statements, f"{slot} issued no statements"
+
+    offenders = full_scans(seeded_engine, statements)
+    assert not offenders, f"{slot} scans a large table:\n" + "\n".join(
+        f"  {plan}\n    {statement}" for statement, plan in offenders
+    )
+
+
+def test_detects_full_scan(seeded_engine):
+    """The checker itself flags an unindexed filter."""
+    statements = [("SELECT id FROM submissions WHERE content = ?", ("x",))]
+    assert full_scans(seeded_engine, statements) == [
+        ("SELECT id FROM submissions WHERE content = ?", "SCAN submissions")
+    ]
@@ -3,23 +3,38 @@ Test cases for UI components and dialogs.
 """
 import pytest
 from unittest.mock import patch, MagicMock
-from PySide6.QtWidgets import QApplication, QMessageBox
+from datetime import datetime
+from types import SimpleNamespace
+from PySide6.QtWidgets import QApplication, QMessageBox, QLabel
 from PySide6.QtCore import Qt
 
 from login_window import LoginWindow
 from signup_window import SignupWindow
-from dashboard_window import DashboardWindow, ClassCard
+from dashboard_window import DashboardWindow, ClassCard, HOVER_INTENT_DELAY_MS
 from create_class_dialog import CreateClassDialog
 from create_assignment_dialog import CreateAssignmentDialog
 from join_class_dialog import JoinClassDialog
+from roster_import_dialog import RosterImportDialog
 from settings_view import SettingsView
 from stream_view import StreamView, AnnouncementCard
 from classwork_view import ClassworkView, AssignmentItem
 from people_view import PeopleView, UserItem
 from submission_panel import SubmissionPanel
-from grading_panel import GradingPanel, StudentSubmissionItem
+from grading_panel import GradingPanel, StudentSubmissionItem, GRADE_FLUSH_DELAY_MS
 from view_header import ViewHeader
+from gradebook_view import GradebookView
+from class_window import ClassWindow
+from gradebook import Gradebook
+from grade_stats import GradeStats
+from grade_stats_panel import GradeStatsPanel
 from sidebar import Sidebar
+from global_assignments_view import GlobalAssignmentsView
+from classroom_controller import ClassroomController
+from people_controller import PeopleController
+from submission_controller import SubmissionController
+from announcement_controller import AnnouncementController
+from classroom import Classroom
+from user import User, UserRole
 
 
 class TestLoginWindow:
@@ -56,6 +71,38 @@ class TestLoginWindow:
                 qtbot.mouseClick(login_button, Qt.LeftButton)
                 mock_signal.emit.assert_called_once()
     
+    def test_login_busy_state(self, qtbot):
+        """Submitting shows the spinner and ignores further clicks until the result is in."""
+        window = LoginWindow()
+        qtbot.addWidget(window)
+        window.show()
+        attempts = []
+        window.login_attempt.connect(lambda email, password: attempts.append(email))
+        window.email_input.setText("teacher@example.com")
+        window.password_input.setText("password123")
+
+        window.password_input.returnPressed.emit()
+        window.password_input.returnPressed.emit()
+
+        assert attempts == ["teacher@example.com"]
+        assert window.is_busy()
+        assert window.spinner.isVisible()
+        assert not window.email_input.isEnabled()
+
+        window.set_busy(False)
+        assert not window.spinner.isVisible()
+        assert window.login_button.isEnabled()
+        assert window.login_button.text() == "Log In"
+
+    def test_remember_me_is_opt_in(self, qtbot):
+        """"Remember me" starts unchecked and is locked with the rest of the form."""
+        window = LoginWindow()
+        qtbot.addWidget(window)
+        assert not window.remember_me_checkbox.isChecked()
+
+        window.set_busy(True)
+        assert not window.remember_me_checkbox.isEnabled()
+
     def test_signup_link_click(self, qtbot):
         """Test signup link click."""
         window = LoginWindow()
@@ -303,6 +350,32 @@ class TestJoinClassDialog:
             mock_signal.emit.assert_called_once_with("ABC123DEF4")
 
 
+class TestRosterImportDialog:
+    """Test cases for RosterImportDialog."""
+
+    def test_requires_file(self, qtbot):
+        """Accepting without a file warns instead of importing."""
+        dialog = RosterImportDialog()
+        qtbot.addWidget(dialog)
+
+        with patch('PySide6.QtWidgets.QMessageBox.warning') as mock_warning:
+            dialog.accept()
+            mock_warning.assert_called_once()
+
+    def test_emits_emails_from_csv(self, qtbot, tmp_path):
+        """The emails read from the file are emitted with the remove option."""
+        roster = tmp_path / "roster.csv"
+        roster.write_text("name,email\nAnn,ann@example.com\nCy,cy@example.com\n")
+        dialog = RosterImportDialog()
+        qtbot.addWidget(dialog)
+        dialog.path_input.setText(str(roster))
+        dialog.remove_missing_checkbox.setChecked(True)
+
+        with patch.object(dialog, 'import_requested') as mock_signal:
+            dialog.accept()
+            mock_signal.emit.assert_called_once_with(["ann@example.com", "cy@example.com"], True)
+
+
 class TestClassCard:
     """Test cases for ClassCard widget."""
     
@@ -323,6 +396,39 @@ class TestClassCard:
             mock_signal.emit.assert_called_once_with(sample_classroom.id)
 
 
+class TestHoverPrefetch:
+    """Test cases for hover-intent prefetch requests on the dashboard."""
+
+    def _dashboard(self, qtbot, *ids):
+        dashboard = DashboardWindow()
+        qtbot.addWidget(dashboard)
+        teacher = SimpleNamespace(email="t@example.com")
+        cards = [dashboard.add_class_card(SimpleNamespace(id=i, name=f"Class {i}", teacher=teacher)) for i in ids]
+        return dashboard, cards
+
+    def test_resting_pointer_requests_prefetch(self, qtbot):
+        dashboard, (card,) = self._dashboard(qtbot, 4)
+        with qtbot.waitSignal(dashboard.class_prefetch_requested, timeout=HOVER_INTENT_DELAY_MS * 10) as blocker:
+            card.hover_started.emit(card.classroom_id)
+        assert blocker.args == [4]
+
+    def test_passing_pointer_does_not(self, qtbot):
+        """Crossing a card on the way to another only prefetches the card the pointer stops on."""
+        dashboard, (first, second) = self._dashboard(qtbot, 4, 5)
+        requests = []
+        dashboard.class_prefetch_requested.connect(requests.append)
+
+        first.hover_started.emit(4)
+        first.hover_ended.emit(4)
+        second.hover_started.emit(5)
+        qtbot.wait(HOVER_INTENT_DELAY_MS * 3)
+        second.hover_ended.emit(5)
+        qtbot.wait(HOVER_INTENT_DELAY_MS * 2)
+
+        assert requests == [5]
+        assert dashboard.grid_layout.count() == 2
+
+
 class TestSidebar:
     """Test cases for Sidebar widget."""
     
@@ -409,6 +515,473 @@ class TestGradingPanel:
             assert mock_signal.emit.call_count == 2
 
 
+class TestGradingPanelBatching:
+    """Test cases for debounced, batched grade saving in GradingPanel."""
+
+    def _panel(self, qtbot, count):
+        panel = GradingPanel()
+        qtbot.addWidget(panel)
+        students = [SimpleNamespace(id=i, email=f"s{i}@example.com") for i in range(count)]
+        submissions = [SimpleNamespace(id=100 + i, student_id=i, grade=None) for i in range(count)]
+        panel.display_submissions(students, submissions)
+        return panel
+
+    def _item(self, panel, index):
+        return panel.submissions_layout.itemAt(index).widget()
+
+    def test_edits_flush_as_one_batch(self, qtbot):
+        """Edits inside the debounce window are sent together, latest value winning."""
+        panel = self._panel(qtbot, 3)
+        batches = []
+        panel.grade_batch_requested.connect(batches.append)
+
+        panel._handle_grade_entered(100, "80")
+        panel._handle_grade_entered(101, "70")
+        panel._handle_grade_entered(100, "85")
+        assert batches == []
+        assert self._item(panel, 0).save_state_label.text() == "Saving…"
+
+        qtbot.waitUntil(lambda: len(batches) == 1, timeout=GRADE_FLUSH_DELAY_MS * 5)
+        assert batches == [[(100, 85.0), (101, 70.0)]]
+
+    def test_row_states_follow_results(self, qtbot):
+        """Rows turn saved or failed when the batch result arrives."""
+        panel = self._panel(qtbot, 2)
+        panel._handle_grade_entered(100, "80")
+        panel._handle_grade_entered(101, "90")
+        panel.flush_grades()
+
+        panel.mark_grades_saved([(100, 80.0)])
+        panel.mark_grades_failed([101], "disk full")
+
+        assert self._item(panel, 0).save_state_label.text() == "Saved"
+        assert self._item(panel, 1).save_state_label.text() == "Not saved"
+
+    def test_reloading_flushes_pending_edits(self, qtbot):
+        """Switching assignment sends queued grades instead of dropping them."""
+        panel = self._panel(qtbot, 1)
+        batches = []
+        panel.grade_batch_requested.connect(batches.append)
+        panel._handle_grade_entered(100, "60")
+
+        panel.display_submissions([], [])
+
+        assert batches == [[(100, 60.0)]]
+
+
+class TestGradebookView:
+    """Test cases for the gradebook table."""
+
+    def test_model_reads_matrix(self, qtbot):
+        """Cells show grades, blanks for missing ones, with students and assignments as headers."""
+        gradebook = Gradebook(1, [(1, "a@example.com"), (2, "b@example.com")], [(5, "Essay", 100), (6, "Quiz", None)])
+        gradebook.set_grade(2, 5, 88.5)
+        view = GradebookView()
+        qtbot.addWidget(view)
+
+        view.display_gradebook(gradebook)
+
+        model = view.model
+        assert (model.rowCount(), model.columnCount()) == (2, 2)
+        assert model.data(model.index(1, 0)) == "88.5"
+        assert model.data(model.index(0, 0)) == ""
+        assert model.headerData(0, Qt.Horizontal) == "Essay\n/100"
+        assert model.headerData(1, Qt.Horizontal) == "Quiz"
+        assert model.headerData(1, Qt.Vertical) == "b@example.com"
+        assert view.summary_label.text() == "2 students × 2 assignments"
+
+    def test_grades_tab_requests_gradebook(self, qtbot):
+        """Only teachers get the Grades tab, and opening it asks for a fresh gradebook."""
+        window = ClassWindow()
+        qtbot.addWidget(window)
+        teacher = SimpleNamespace(email="t@example.com")
+        window.load_class(SimpleNamespace(id=7, name="Bio", class_code="ABCDEFGHIJ", teacher=teacher, roster_size=0))
+        grades_index = window.tab_widget.indexOf(window.grades_tab)
+        requests = []
+        window.gradebook_requested.connect(requests.append)
+
+        window.set_user_role(UserRole.student)
+        assert not window.tab_widget.isTabVisible(grades_index)
+
+        window.set_user_role(UserRole.teacher)
+        window.tab_widget.setCurrentIndex(grades_index)
+        assert window.tab_widget.isTabVisible(grades_index)
+        assert requests == [7]
+
+        window.set_user_role(UserRole.student)
+        window.tab_widget.blockSignals(True)
+        window.tab_widget.setCurrentIndex(grades_index)  # hidden, but still the current index
+        window.tab_widget.blockSignals(False)
+        window.begin_class(8)
+        assert requests == [7]
+
+
+class TestInPlaceUpdates:
+    """Test cases for views applying committed changes without reloading."""
+
+    def _class_window(self, qtbot, roster_size=2):
+        window = ClassWindow()
+        qtbot.addWidget(window)
+        teacher = SimpleNamespace(email="t@example.com")
+        window.load_class(SimpleNamespace(id=7, name="Bio", class_code="ABCDEFGHIJ", teacher=teacher,
+                                          roster_size=roster_size))
+        return window
+
+    def test_insert_assignment_keeps_list_order(self, qtbot):
+        """New assignments land where the class query would have put them."""
+        view = ClassworkView()
+        qtbot.addWidget(view)
+        view.display_assignments([
+            SimpleNamespace(id=3, title="Late", due_date=datetime(2030, 3, 1)),
+            SimpleNamespace(id=1, title="Early", due_date=datetime(2030, 1, 1)),
+            SimpleNamespace(id=2, title="Open", due_date=None),
+        ])
+
+        view.insert_assignment(SimpleNamespace(id=4, title="Middle", due_date=datetime(2030, 2, 1)))
+        view.insert_assignment(SimpleNamespace(id=5, title="Open too", due_date=None))
+        view.insert_assignment(SimpleNamespace(id=5, title="Open too", due_date=None))
+
+        ids = [view.assignments_layout.itemAt(i).widget().assignment_id for i in range(view.assignments_layout.count())]
+        assert ids == [3, 4, 1, 5, 2]
+
+    def test_add_student_inserts_in_email_order(self, qtbot):
+        window = self._class_window(qtbot)
+        window.roster = [SimpleNamespace(id=1, email="a@example.com"), SimpleNamespace(id=2, email="c@example.com")]
+        window.people_tab.append_students(window.roster)
+        window.roster_complete = True
+
+        window.add_student(SimpleNamespace(id=3, email="b@example.com"))
+        window.add_student(SimpleNamespace(id=3, email="b@example.com"))
+
+        assert [s.email for s in window.roster] == ["a@example.com", "b@example.com", "c@example.com"]
+        assert window.people_tab.students_layout.count() == 3
+        assert window.people_tab.students_title.text() == "Classmates (3)"
+
+    def test_student_joined_before_class_header(self, qtbot):
+        """A student can be inserted before the class size is known; the count stays unset."""
+        view = PeopleView()
+        qtbot.addWidget(view)
+
+        view.insert_student(0, SimpleNamespace(id=3, email="b@example.com", full_name="B"))
+
+        assert view.students_layout.count() == 1
+        assert view.students_title.text() == "Classmates"
+
+    def test_add_student_past_loaded_pages_waits_for_page(self, qtbot):
+        """A student sorting after the pages loaded so far comes in with a later page instead."""
+        window = self._class_window(qtbot)
+        window.roster = [SimpleNamespace(id=1, email="a@example.com")]
+
+        window.add_student(SimpleNamespace(id=3, email="z@example.com"))
+
+        assert [s.email for s in window.roster] == ["a@example.com"]
+
+    def test_class_parts_arrive_in_any_order(self, qtbot):
+        """The header arriving after the roster fills in the teacher without dropping students."""
+        window = ClassWindow()
+        qtbot.addWidget(window)
+        window.begin_class(7)
+        window.people_tab.append_students([SimpleNamespace(email="a@example.com")])
+
+        window.show_classroom(SimpleNamespace(id=7, name="Bio", class_code="ABCDEFGHIJ",
+                                              teacher=SimpleNamespace(email="t@example.com"), roster_size=1))
+
+        assert window.header.title_label.text() == "Bio"
+        assert window.people_tab.teacher_layout.count() == 1
+        assert window.people_tab.students_layout.count() == 1
+        assert window.people_tab.students_title.text() == "Classmates (1)"
+
+    def test_gradebook_reloads_only_when_stale(self, qtbot):
+        """Revisiting the Grades tab reuses the gradebook until a student or assignment is added."""
+        window = self._class_window(qtbot)
+        window.set_user_role(UserRole.teacher)
+        requests = []
+        window.gradebook_requested.connect(requests.append)
+        grades_index = window.tab_widget.indexOf(window.grades_tab)
+
+        window.tab_widget.setCurrentIndex(grades_index)
+        window.tab_widget.setCurrentIndex(0)
+        window.tab_widget.setCurrentIndex(grades_index)
+        assert requests == [7]
+
+        window.invalidate_gradebook()
+        assert requests == [7, 7]
+
+    def test_apply_grade_updates_one_cell(self, qtbot):
+        view = GradebookView()
+        qtbot.addWidget(view)
+        view.display_gradebook(Gradebook(1, [(1, "a@example.com"), (2, "b@example.com")], [(5, "Essay", 100)]))
+        changed = []
+        view.model.dataChanged.connect(lambda top_left, bottom_right, roles: changed.append((top_left.row(), top_left.column())))
+
+        view.apply_grade(2, 5, 77.0)
+        view.apply_grade(3, 5, 10.0)
+
+        assert changed == [(1, 0)]
+        assert view.model.data(view.model.index(1, 0)) == "77"
+
+
+class TestGradeStatsPanel:
+    """Test cases for the grade statistics panel."""
+
+    def test_display_stats(self, qtbot):
+        """Values and histogram come from the stats object; an empty one shows dashes."""
+        panel = GradeStatsPanel()
+        qtbot.addWidget(panel)
+
+        panel.display_stats(GradeStats(3, 10, [2.0, 4.0, 9.0]))
+
+        assert panel.assignment_id == 3
+        assert panel.value_labels["count"].text() == "3"
+        assert panel.value_labels["mean"].text() == "5.0"
+        assert panel.value_labels["median"].text() == "4.0"
+        assert panel.histogram.counts[9] == 1
+
+        panel.display_stats(GradeStats(4, 10))
+        assert panel.value_labels["mean"].text() == "–"
+
+
+class TestStreamView:
+    """Test cases for the paginated announcement stream."""
+
+    def _announcements(self, ids):
+        author = MagicMock(email="teacher@example.com")
+        return [MagicMock(id=i, content=f"Post {i}", author=author, timestamp=datetime(2026, 1, 1)) for i in ids]
+
+    def test_requests_next_page_near_bottom(self, qtbot):
+        """Scrolling to the bottom asks for the page after the oldest card, once."""
+        stream = StreamView()
+        qtbot.addWidget(stream)
+        stream.resize(600, 400)
+        stream.show()
+        qtbot.waitExposed(stream)
+        requests = []
+        stream.more_announcements_requested.connect(requests.append)
+
+        stream.display_announcements(self._announcements(range(40, 20, -1)), True)
+        scroll_bar = stream.scroll_area.verticalScrollBar()
+        qtbot.waitUntil(lambda: scroll_bar.maximum() > 0)
+        assert requests == []
+
+        scroll_bar.setValue(scroll_bar.maximum())
+        scroll_bar.setValue(scroll_bar.maximum() - 1)  # still loading: no duplicate request
+        assert requests == [21]
+
+        stream.append_announcements(self._announcements(range(20, 10, -1)), False)
+        qtbot.waitUntil(lambda: stream.announcements_container.height() > 2000)
+        scroll_bar.setValue(scroll_bar.maximum())
+        assert requests == [21]
+        assert stream.announcements_layout.count() == 30
+        assert stream.announcements_layout.itemAt(0).widget().findChildren(QLabel)[1].text() == "Post 40"
+
+    def test_short_stream_fills_viewport(self, qtbot):
+        """A page too short to scroll immediately asks for the next one."""
+        stream = StreamView()
+        qtbot.addWidget(stream)
+        stream.resize(600, 800)
+        stream.show()
+        qtbot.waitExposed(stream)
+        requests = []
+        stream.more_announcements_requested.connect(requests.append)
+
+        stream.display_announcements(self._announcements([2, 1]), True)
+
+        qtbot.waitUntil(lambda: requests == [1])
+
+    def test_hidden_stream_does_not_request(self, qtbot):
+        """A stream that is not on screen never pulls further pages."""
+        stream = StreamView()
+        qtbot.addWidget(stream)
+        requests = []
+        stream.more_announcements_requested.connect(requests.append)
+
+        stream.display_announcements(self._announcements([2, 1]), True)
+        QApplication.processEvents()
+
+        assert requests == []
+
+
+class TestGlobalAssignmentsView:
+    """Test cases for the windowed global assignments view."""
+
+    def _assignment(self, title, due_date):
+        return SimpleNamespace(id=len(title), title=title, due_date=due_date, classroom=SimpleNamespace(name="Class"))
+
+    def test_show_earlier_pages_backwards(self, qtbot):
+        """Earlier pages start at the window and are inserted above it, oldest on top."""
+        view = GlobalAssignmentsView()
+        qtbot.addWidget(view)
+        start = datetime(2026, 6, 1)
+        view.set_window_start(start)
+        view.display_assignments([self._assignment("Upcoming", datetime(2026, 6, 2))])
+        assert not view.show_earlier_button.isHidden()
+
+        requests = []
+        view.earlier_assignments_requested.connect(lambda *cursor: requests.append(cursor))
+        view.show_earlier_button.click()
+        assert requests == [(start, None)]
+
+        last_week = self._assignment("Last week", datetime(2026, 5, 25))
+        view.prepend_assignments([self._assignment("Yesterday", datetime(2026, 5, 31)), last_week], True)
+        view.show_earlier_button.click()
+        assert requests[-1] == (last_week.due_date, last_week.id)
+        view.prepend_assignments([], False)
+
+        titles = [view.assignments_layout.itemAt(i).widget().findChildren(QLabel)[0].text() for i in range(3)]
+        assert titles == ["Last week", "Yesterday", "Upcoming"]
+        assert view.show_earlier_button.isHidden()
+
+
+    def test_show_later_appends_below(self, qtbot):
+        """The first page offers later pages, which continue after its last assignment."""
+        view = GlobalAssignmentsView()
+        qtbot.addWidget(view)
+        view.set_window_start(datetime(2026, 6, 1))
+        tomorrow = self._assignment("Tomorrow", datetime(2026, 6, 2))
+        view.display_assignments([tomorrow], True)
+        assert not view.show_later_button.isHidden()
+
+        requests = []
+        view.later_assignments_requested.connect(lambda *cursor: requests.append(cursor))
+        view.show_later_button.click()
+        assert requests == [(tomorrow.due_date, tomorrow.id)]
+
+        view.append_assignments([self._assignment("Next week", datetime(2026, 6, 8))], False)
+
+        titles = [view.assignments_layout.itemAt(i).widget().findChildren(QLabel)[0].text() for i in range(2)]
+        assert titles == ["Tomorrow", "Next week"]
+        assert view.show_later_button.isHidden()
+
+class TestSettingsView:
+    """Test cases for the remembered-devices section of SettingsView."""
+
+    def test_session_count(self, qtbot):
+        """The revoke button is only enabled while some device is remembered."""
+        view = SettingsView()
+        qtbot.addWidget(view)
+        assert not view.revoke_sessions_button.isEnabled()
+
+        view.set_session_count(2)
+        assert view.sessions_label.text() == "Remembered on 2 devices."
+        assert view.revoke_sessions_button.isEnabled()
+
+        requests = []
+        view.revoke_sessions_requested.connect(lambda: requests.append(True))
+        qtbot.mouseClick(view.revoke_sessions_button, Qt.LeftButton)
+        assert requests == [True]
+
+
+class TestQueryBudgets:
+    """Guards against lazy loads (N+1 queries) between a slot and the view rendering its result."""
+
+    def _add_students(self, db_session, classroom, count):
+        students = [
+            User(email=f"s{i}@example.com", role=UserRole.student, password_hash="x")
+            for i in range(count)
+        ]
+        classroom.students.extend(students)
+        db_session.commit()
+        return students
+
+    @pytest.mark.query_budget(2)
+    def test_dashboard_cards(self, qtbot, query_budget, db_session, sample_teacher, sample_student):
+        """Fetching a student's classes and drawing their cards is a fixed number of queries."""
+        for i in range(5):
+            classroom = Classroom(name=f"Class {i}", teacher_id=sample_teacher.id)
+            classroom.students.append(sample_student)
+            db_session.add(classroom)
+        db_session.commit()
+
+        controller = ClassroomController()
+        dashboard = DashboardWindow()
+        qtbot.addWidget(dashboard)
+        fetched = []
+        controller.classes_fetched.connect(fetched.append)
+
+        with query_budget():
+            controller.get_classes_for_user(sample_student)
+            for classroom in fetched[0]:
+                dashboard.grid_layout.addWidget(ClassCard(classroom))
+
+        assert dashboard.grid_layout.count() == 5
+
+    @pytest.mark.query_budget(3)
+    def test_grading_panel(self, qtbot, query_budget, db_session, sample_classroom, sample_assignment):
+        """Opening a class and rendering the grading panel does not query per student."""
+        self._add_students(db_session, sample_classroom, 10)
+        classroom_id, assignment_id = sample_classroom.id, sample_assignment.id
+
+        classroom_controller = ClassroomController()
+        people_controller = PeopleController()
+        submission_controller = SubmissionController()
+        panel = GradingPanel()
+        qtbot.addWidget(panel)
+        classes, pages, submissions = [], [], []
+        classroom_controller.class_fetched.connect(classes.append)
+        people_controller.roster_page_fetched.connect(lambda class_id, page, has_more: pages.append(page))
+        submission_controller.all_submissions_fetched.connect(submissions.append)
+
+        with query_budget():
+            classroom_controller.get_class_by_id(classroom_id)
+            people_controller.get_roster_page(classroom_id)
+            submission_controller.get_all_submissions_for_assignment(assignment_id)
+            panel.display_submissions(pages[0], submissions[0])
+
+        assert classes[0].roster_size == 10
+        assert panel.submissions_layout.count() == 10
+
+    def test_people_view_pages(self, qtbot, query_budget, db_session, sample_classroom):
+        """The roster streams into the people tab a page per query, sorted by email."""
+        students = self._add_students(db_session, sample_classroom, 10)
+        expected = sorted(student.email for student in students)
+        classroom_id = sample_classroom.id
+
+        controller = PeopleController()
+        view = PeopleView()
+        qtbot.addWidget(view)
+        requests = []
+
+        def on_page(class_id, page, has_more):
+            view.append_students(page)
+            requests.append(len(page))
+            if has_more:
+                controller.get_roster_page(class_id, page[-1].email, limit=4)
+
+        controller.roster_page_fetched.connect(on_page)
+        with query_budget(3):
+            controller.get_roster_page(classroom_id, limit=4)
+
+        assert requests == [4, 4, 2]
+        shown = [view.students_layout.itemAt(i).widget().findChild(QLabel).text().strip()
+                 for i in range(view.students_layout.count())]
+        assert shown == expected
+
+    def test_stream(self, qtbot, query_budget, sample_classroom, sample_announcement):
+        """Rendering the stream loads authors with the announcements."""
+        classroom_id = sample_classroom.id
+        controller = AnnouncementController()
+        stream = StreamView()
+        qtbot.addWidget(stream)
+        controller.announcements_fetched.connect(stream.display_announcements)
+
+        with query_budget(1):
+            controller.get_announcements_for_class(classroom_id)
+
+        assert stream.announcements_layout.count() == 1
+
+    def test_budget_failure_lists_statements(self, query_budget, sample_teacher):
+        """Exceeding the budget fails the test and reports each statement."""
+        controller = ClassroomController()
+
+        with pytest.raises(pytest.fail.Exception) as excinfo:
+            with query_budget(0):
+                controller.get_classes_for_user(sample_teacher)
+
+        message = str(excinfo.value)
+        assert "budget is 0" in message
+        assert "FROM classrooms" in message
+
+
 class TestUIComponentIntegration:
     """Test cases for UI component integration."""
     
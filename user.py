@@ -1,10 +1,37 @@
 import enum
+import os
+
 import bcrypt
-from sqlalchemy import Column, Integer, String, Enum as SQLAlchemyEnum, Index, CheckConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Enum as SQLAlchemyEnum, Index, CheckConstraint, func
+from sqlalchemy.orm import relationship, validates
 from classroom import student_classroom_association
 from base import Base
 
+# bcrypt cost factor (2**rounds iterations) for new hashes. Stored hashes with a
+# different cost are rehashed on the next successful login.
+BCRYPT_ROUNDS = int(os.environ.get("PYCLASS_BCRYPT_ROUNDS", "12"))
+
+
+def hash_password(password: str, rounds: int = None) -> str:
+    """Returns a bcrypt hash of ``password`` at ``rounds`` (default BCRYPT_ROUNDS)."""
+    salt = bcrypt.gensalt(rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Checks ``password`` against a stored bcrypt hash."""
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+def normalize_email(email: str) -> str:
+    """The stored form of an email address: trimmed and lower-cased."""
+    return email.strip().lower()
+
+
+def hash_rounds(password_hash: str) -> int:
+    """Reads the cost factor out of a "$2b$12$..." hash."""
+    return int(password_hash.split('$')[2])
+
 
 class UserRole(enum.Enum):
     student = "student"
@@ -22,7 +49,8 @@ class User(Base):
     
     # Add indexes for common queries
     __table_args__ = (
-        Index('ix_users_email_lower', 'email'),  # Case-insensitive email lookups
+        # Case-insensitive lookups and uniqueness; see User.email_matches
+        Index('ix_users_email_lower', func.lower(email), unique=True),
         CheckConstraint('length(full_name) <= 100', name='ck_users_full_name_len'),
         CheckConstraint('length(email) <= 255', name='ck_users_email_len'),
         CheckConstraint('length(password_hash) <= 255', name='ck_users_password_hash_len'),
@@ -33,11 +61,23 @@ class User(Base):
     announcements_made = relationship("Announcement", back_populates="author")
     submissions = relationship("Submission", back_populates="student")
 
+    @validates('email')
+    def _normalize_email(self, key, email):
+        return normalize_email(email) if email is not None else None
+
+    @classmethod
+    def email_matches(cls, email: str):
+        """Case-insensitive email criterion, served by ix_users_email_lower."""
+        return func.lower(cls.email) == normalize_email(email)
+
     def set_password(self, password: str):
         """Hashes and sets the user's password."""
-        pwd_bytes = password.encode('utf-8')
-        self.password_hash = bcrypt.hashpw(pwd_bytes, bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
         """Checks if the provided password matches the stored hash."""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
\ No newline at end of file
+        return verify_password(password, self.password_hash)
+
+    def password_needs_rehash(self) -> bool:
+        """True when the stored hash was made with a cost other than BCRYPT_ROUNDS."""
+        return hash_rounds(self.password_hash) != BCRYPT_ROUNDS
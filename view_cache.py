@@ -0,0 +1,171 @@
+"""
+Stale-while-revalidate cache for what the main views show.
+
+Entries are keyed by (view, entity id), e.g. ("classwork", classroom_id) or
+("assignments", user_id). A view that has an entry renders it at once. If
+the entry is older than its view's TTL, the view also asks for fresh data
+in the background, and ``put`` tells it whether that data differs from what
+is already on screen. Entries older than ``max_stale`` are not served at all.
+
+Size is bounded by the number of rows held across all entries, evicting the
+least recently used. Writes drop the entries they affect through the domain
+events in ``events.py`` (see ``ViewCache.subscribe``).
+
+The cache is only touched on the GUI thread, so it has no lock.
+"""
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+
+from events import AnnouncementPosted, AssignmentCreated, StudentJoined
+
+# Seconds an entry is served without revalidating, per view.
+VIEW_TTLS = {
+    "class": 300.0,
+    "stream": 30.0,
+    "classwork": 60.0,
+    "assignments": 60.0,
+}
+DEFAULT_TTL = 60.0
+# Older entries are discarded instead of being shown while revalidating.
+MAX_STALE = 30 * 60.0
+# Rows kept across all entries before the least recently used are evicted.
+MAX_ROWS = 5000
+
+
+def fingerprint(value):
+    """A comparable summary of query results.
+
+    Mapped objects contribute their loaded column values and the column
+    values of loaded related objects, so two loads of the same data compare
+    equal and any edit that a view would render does not.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(fingerprint(item) for item in value)
+    state = inspect(value, raiseerr=False)
+    if state is None or not hasattr(state, "mapper"):
+        return value
+    columns = tuple(state.dict.get(attr.key) for attr in state.mapper.column_attrs)
+    related = tuple(
+        _columns(state.dict[rel.key]) for rel in state.mapper.relationships
+        if rel.key in state.dict and not rel.uselist
+    )
+    return (type(value).__name__, columns, related)
+
+
+def _columns(obj):
+    if obj is None:
+        return None
+    state = inspect(obj)
+    return tuple(state.dict.get(attr.key) for attr in state.mapper.column_attrs)
+
+
+def _row_count(value) -> int:
+    if isinstance(value, (list, tuple)):
+        return sum(_row_count(item) for item in value)
+    return 1 if inspect(value, raiseerr=False) is not None else 0
+
+
+class CacheEntry:
+    """One cached value with the fingerprint it was rendered from."""
+
+    __slots__ = ("value", "fingerprint", "rows", "stored_at")
+
+    def __init__(self, value, fingerprint, rows, stored_at):
+        self.value = value
+        self.fingerprint = fingerprint
+        self.rows = rows
+        self.stored_at = stored_at
+
+
+class ViewCache:
+    """LRU of (view, entity id) -> CacheEntry with per-view TTLs and a row budget."""
+
+    def __init__(self, ttls: dict = None, max_stale: float = MAX_STALE, max_rows: int = MAX_ROWS,
+                 clock=time.monotonic):
+        self.ttls = dict(VIEW_TTLS if ttls is None else ttls)
+        self.max_stale = max_stale
+        self.max_rows = max_rows
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._rows = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    def get(self, view: str, entity_id):
+        """Returns the entry to show, or None when there is none or it is too old to show."""
+        entry = self._entries.get((view, entity_id))
+        if entry is None:
+            return None
+        if self._clock() - entry.stored_at > self.max_stale:
+            self._remove((view, entity_id))
+            return None
+        self._entries.move_to_end((view, entity_id))
+        return entry
+
+    def is_fresh(self, view: str, entry: CacheEntry) -> bool:
+        """True while ``entry`` is young enough to show without revalidating."""
+        return self._clock() - entry.stored_at < self.ttls.get(view, DEFAULT_TTL)
+
+    def put(self, view: str, entity_id, value, value_fingerprint=None) -> bool:
+        """Stores freshly loaded data; returns True when it differs from the cached entry.
+
+        ``value_fingerprint`` overrides the computed one, for values that carry
+        more than the rows a view renders. Unchanged data keeps the cached
+        value, only marking it fresh again.
+        """
+        key = (view, entity_id)
+        if value_fingerprint is None:
+            value_fingerprint = fingerprint(value)
+        entry = self._entries.get(key)
+        if entry is not None and entry.fingerprint == value_fingerprint:
+            entry.stored_at = self._clock()
+            self._entries.move_to_end(key)
+            return False
+
+        self._remove(key)
+        rows = _row_count(value)
+        if rows <= self.max_rows:
+            self._entries[key] = CacheEntry(value, value_fingerprint, rows, self._clock())
+            self._rows += rows
+            while self._rows > self.max_rows:
+                self._remove(next(iter(self._entries)))
+        return True
+
+    def invalidate(self, view: str, entity_id=None):
+        """Drops the entry for ``entity_id``, or every entry of ``view`` when it is None."""
+        if entity_id is not None:
+            self._remove((view, entity_id))
+            return
+        for key in [key for key in self._entries if key[0] == view]:
+            self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._rows = 0
+
+    def subscribe(self, bus):
+        """Drops the entries a committed write makes out of date."""
+        bus.subscribe(AssignmentCreated, self._on_assignment_created)
+        bus.subscribe(AnnouncementPosted, lambda event: self.invalidate("stream", event.classroom_id))
+        bus.subscribe(StudentJoined, self._on_student_joined)
+
+    def _on_assignment_created(self, event):
+        self.invalidate("classwork", event.classroom_id)
+        # Whose lists include the class is not known here
+        self.invalidate("assignments")
+
+    def _on_student_joined(self, event):
+        self.invalidate("class", event.classroom_id)  # roster size
+        self.invalidate("assignments", event.id)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._rows -= entry.rows